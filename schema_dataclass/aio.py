@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+异步校验支持
+
+``@validate`` 可以装饰 ``async def`` 函数，用于需要 I/O 的校验（如唯一性查询）。
+同步构建（``Model(**data)``、属性赋值）不会执行 async 校验函数，
+需通过 ``await Model.acreate(**data)`` 或 ``await instance.avalidate()`` 触发，
+嵌套 dataclass 字段与 ListField 元素上的 async 校验函数同样会执行。
+"""
+import asyncio
+
+from schema_dataclass.exceptions import ValidationError
+
+
+async def _run_validator(validator, instance, field_name, value, path):
+    try:
+        await validator(instance, value)
+    except ValidationError as e:
+        if field_name not in str(e):
+            e.path = [field_name] + getattr(e, "path", [])
+        e.path = path + getattr(e, "path", [])
+        raise
+
+
+def _nested_models(field):
+    """字段中可能包含的 dataclass 类（嵌套字段或 ListField 元素）"""
+    if isinstance(field, type) and hasattr(field, "__dataclass_fields__"):
+        return [field]
+    item_type = getattr(field, "item_type", None)
+    if isinstance(item_type, type) and hasattr(item_type, "__dataclass_fields__"):
+        return [item_type]
+    return []
+
+
+def has_async_validators(cls, _seen=None):
+    """类本身或其嵌套 dataclass 字段（包括 ListField 元素）是否有 async 校验函数"""
+    derived = cls.__dataclass_derived__
+    if ("async",) in derived:
+        return derived[("async",)]
+    seen = _seen if _seen is not None else set()
+    seen.add(cls)
+    result = bool(cls._dataclass_async_validators) or any(
+        model not in seen and has_async_validators(model, seen)
+        for field in cls.__dataclass_fields__.values()
+        for model in _nested_models(field)
+    )
+    derived[("async",)] = result
+    return result
+
+
+def _collect_calls(instance, field_names, path, calls):
+    cls = type(instance)
+    for field_name, funcs in cls._dataclass_async_validators.items():
+        if field_names is not None and field_name not in field_names:
+            continue
+        value = instance.get(field_name)
+        for validator in funcs:
+            calls.append(_run_validator(validator, instance, field_name, value, path))
+
+    # 嵌套实例与列表元素上的 async 校验函数
+    for field_name, field in cls.__dataclass_fields__.items():
+        if field_names is not None and field_name not in field_names:
+            continue
+        models = _nested_models(field)
+        if not models or not has_async_validators(models[0]):
+            continue
+        value = instance.get(field_name)
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                if hasattr(item, "__dataclass_fields__"):
+                    _collect_calls(item, None, path + [field_name, str(index)], calls)
+        elif hasattr(value, "__dataclass_fields__"):
+            _collect_calls(value, None, path + [field_name], calls)
+
+
+async def run_async_validators(instance, field_names=None):
+    """
+    并发执行实例上的 async 校验函数，包括嵌套 dataclass 字段与 ListField 元素上的
+
+    所有校验函数都会执行完毕，之后按声明顺序抛出第一个异常。
+
+    :param instance: dataclass 实例
+    :param field_names: 只校验这些字段（及其中的嵌套实例），None 表示全部
+    :return: instance
+    """
+    calls = []
+    _collect_calls(instance, field_names, [], calls)
+
+    if calls:
+        for result in await asyncio.gather(*calls, return_exceptions=True):
+            if isinstance(result, BaseException):
+                raise result
+    return instance
+
+
+async def acreate(cls, **kwargs):
+    """构建实例并执行 async 校验函数"""
+    instance = cls(**kwargs)
+    if has_async_validators(cls):
+        await run_async_validators(instance)
+    return instance
+
+
+async def acreate_many(cls, records, concurrency=10, return_exceptions=False):
+    """
+    批量异步构建实例
+
+    :param cls: dataclass 类
+    :param records: 字典序列
+    :param concurrency: 同时执行的最大数量
+    :param return_exceptions: 为 True 时失败的记录以异常对象返回，否则抛出第一个异常
+    :return: 与 records 顺序一致的实例列表
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create(record):
+        async with semaphore:
+            return await acreate(cls, **record)
+
+    results = await asyncio.gather(
+        *[create(record) for record in records], return_exceptions=True
+    )
+    if not return_exceptions:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+    return results
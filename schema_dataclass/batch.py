@@ -0,0 +1,584 @@
+# -*- coding: utf-8 -*-
+"""
+批量（按列）校验与列式数据
+
+``validate_batch(Model, records)`` 先把每个字段的值按列收集起来，一次性检查
+NumberField 的范围与枚举、StringField 的长度、正则与枚举约束；安装了 NumPy 时
+数值列使用向量化比较，否则使用纯 Python 实现。
+
+没有 @validate 函数与 setter、也没有自定义验证策略的 NumberField / StringField
+在列上完成全部校验（必填、默认值、类型与约束），逐行构建实例时直接写入；
+其它字段仍逐行校验，只跳过已经按列检查过的约束。按列完成校验的字段不会出现在
+profiling 统计中。
+
+示例::
+
+    from schema_dataclass.batch import validate_batch
+
+    instances, errors = validate_batch(User, rows)
+    for index, error in errors.items():
+        print(index, error)
+
+列式数据（``{字段名: [值, ...]}``）可以直接校验而不构建逐行实例，
+一批实例也可以一次性输出为列式数据::
+
+    columns, errors = User.validate_columns({"name": names, "age": ages})
+    data = User.to_columns(instances)
+"""
+import copy
+import re
+import sys
+
+try:
+    from collections.abc import Mapping
+except ImportError:  # Python 2
+    from collections import Mapping
+
+from schema_dataclass import metrics as _metrics
+from schema_dataclass import profiling as _profiling
+from schema_dataclass.dataclass import (
+    _add_error_path,
+    _apply_setter,
+    _convert_value,
+    _make_assign,
+    _make_init,
+    _run_validators,
+    _serialize_value,
+    _unset_value,
+)
+from schema_dataclass.exceptions import ValidationError
+from schema_dataclass.fields import (
+    ChoicesValidationStrategy,
+    Field,
+    LengthValidationStrategy,
+    NumberField,
+    RangeValidationStrategy,
+    RegexValidationStrategy,
+    RequiredValidationStrategy,
+    StringField,
+    _import_numpy,
+    string_types,
+)
+
+if sys.version_info[0] >= 3:
+    _number_types = (int, float)
+else:
+    _number_types = (int, long, float)  # noqa: F821
+
+# 可以按列检查、逐行构建时可跳过的验证策略
+_COLUMN_STRATEGIES = (
+    RangeValidationStrategy,
+    LengthValidationStrategy,
+    RegexValidationStrategy,
+    ChoicesValidationStrategy,
+)
+
+# 缺失的字段值
+_MISSING = object()
+
+
+def _is_number(value):
+    return isinstance(value, _number_types)
+
+
+def _resolve_numpy(use_numpy):
+    if use_numpy is False:
+        return None
+    numpy = _import_numpy()
+    if numpy is None and use_numpy:
+        raise ImportError("use_numpy=True requires numpy")
+    return numpy
+
+
+def _numeric_array(numpy, values):
+    """
+    数值列转换为 NumPy 数组，非数值（None、字符串等）位置为 NaN
+
+    :return: (array, present)；present 标记输入中是数值的位置（输入本身的 NaN 也算），
+             全部是数值时为 None
+    """
+    try:
+        array = numpy.asarray(values)
+    except ValueError:
+        # 含长度不一的列表/元组时无法构成数组
+        array = None
+    if array is not None and array.ndim == 1 and array.dtype.kind in "biuf":
+        return array, None
+    present = numpy.array([_is_number(v) for v in values], dtype=bool)
+    return numpy.array([v if _is_number(v) else numpy.nan for v in values], dtype=float), present
+
+
+def _number_failures(field, values, numpy):
+    """按策略顺序返回 [(error_key, 格式化参数, 失败下标)]"""
+    failures = []
+    if numpy is not None:
+        array, present = _numeric_array(numpy, values)
+
+    for strategy in field.validation_strategies:
+        if isinstance(strategy, RangeValidationStrategy):
+            bounds = [("minvalue", field.minvalue), ("maxvalue", field.maxvalue)]
+            for error_key, bound in bounds:
+                if bound is None:
+                    continue
+                if numpy is not None:
+                    mask = array < bound if error_key == "minvalue" else array > bound
+                    indices = numpy.flatnonzero(mask).tolist()
+                elif error_key == "minvalue":
+                    indices = [i for i, v in enumerate(values) if _is_number(v) and v < bound]
+                else:
+                    indices = [i for i, v in enumerate(values) if _is_number(v) and v > bound]
+                failures.append((error_key, {error_key: bound}, indices))
+        elif isinstance(strategy, ChoicesValidationStrategy) and field.choices is not None:
+            choices = field.choices
+            if numpy is not None:
+                numeric = [c for c in choices if _is_number(c)]
+                mask = ~numpy.isin(array, numeric)
+                if present is not None:
+                    mask &= present
+                indices = numpy.flatnonzero(mask).tolist()
+            else:
+                indices = [i for i, v in enumerate(values) if _is_number(v) and v not in choices]
+            failures.append(("choices", {"choices": choices}, indices))
+    return failures
+
+
+def _string_failures(field, values):
+    """字符串列的长度、正则与枚举检查（纯 Python，len 与集合查找本身已是 C 实现）"""
+    failures = []
+    for strategy in field.validation_strategies:
+        if isinstance(strategy, LengthValidationStrategy):
+            if field.min_length is not None:
+                bound = field.min_length
+                indices = [i for i, v in enumerate(values)
+                           if isinstance(v, string_types) and len(v) < bound]
+                failures.append(("min_length", {"min_length": bound}, indices))
+            if field.max_length is not None:
+                bound = field.max_length
+                indices = [i for i, v in enumerate(values)
+                           if isinstance(v, string_types) and len(v) > bound]
+                failures.append(("max_length", {"max_length": bound}, indices))
+        elif isinstance(strategy, RegexValidationStrategy) and field.regex is not None:
+            match = re.compile(field.regex).match
+            indices = [i for i, v in enumerate(values)
+                       if isinstance(v, string_types) and not match(v)]
+            failures.append(("regex", {"regex": field.regex}, indices))
+        elif isinstance(strategy, ChoicesValidationStrategy) and field.choices is not None:
+            try:
+                choices = frozenset(field.choices)
+            except TypeError:
+                choices = field.choices
+            indices = [i for i, v in enumerate(values)
+                       if isinstance(v, string_types) and v not in choices]
+            failures.append(("choices", {"choices": field.choices}, indices))
+    return failures
+
+
+def check_column(field, values, use_numpy=None):
+    """
+    按列检查字段的范围、枚举、长度与正则约束
+
+    类型不符或为 None 的值不在此检查，由调用方处理。
+
+    :param field: NumberField 或 StringField
+    :param values: 该字段在整批记录中的值
+    :param use_numpy: None 表示 NumPy 可用时使用，False 强制纯 Python，True 要求 NumPy
+    :return: {下标: ValidationError}，每个下标只保留第一个失败的约束
+    """
+    if isinstance(field, NumberField):
+        failures = _number_failures(field, values, _resolve_numpy(use_numpy))
+    elif isinstance(field, StringField):
+        failures = _string_failures(field, values)
+    else:
+        return {}
+
+    errors = {}
+    for error_key, kwargs, indices in failures:
+        if not indices:
+            continue
+        message = field.get_error_message(error_key, **kwargs)
+        for i in indices:
+            if i not in errors:
+                errors[i] = ValidationError(message, error_key=error_key)
+    return errors
+
+
+def _columnar_field(field):
+    """字段的验证策略都可以按列完成"""
+    if type(field) not in (NumberField, StringField) or callable(field.default):
+        return False
+    allowed = (RequiredValidationStrategy,) + _COLUMN_STRATEGIES
+    return all(type(s) in allowed for s in field.validation_strategies)
+
+
+def _is_columnar(cls, name, field):
+    """字段的全部校验（包括 @validate 与 setter）都可以按列完成"""
+    if name in cls._dataclass_validators or name in cls.__setters__:
+        return False
+    return _columnar_field(field)
+
+
+def _batch_plan(cls):
+    """按类缓存 (按列检查的字段, 按列完成校验的字段名, 逐行构建用的 __init__)"""
+    derived = cls.__dict__['__dataclass_derived__']
+    plan = derived.get(('batch',))
+    if plan is not None:
+        return plan
+
+    columns = {}
+    for name, field in cls.__dataclass_fields__.items():
+        if not isinstance(field, (NumberField, StringField)) or callable(field.default):
+            continue
+        if any(isinstance(s, _COLUMN_STRATEGIES) for s in field.validation_strategies) or \
+                _is_columnar(cls, name, field):
+            columns[name] = field
+    if cls.__dataclass_lazy__:
+        # 延迟校验模式：按列检查只用于提前发现错误，实例仍由类自身的 __init__ 构建
+        return derived.setdefault(('batch',), (columns, (), cls.__init__))
+
+    full = tuple(name for name, field in columns.items() if _is_columnar(cls, name, field))
+    fields = {}
+    for name, field in cls.__dataclass_fields__.items():
+        if name in full:
+            continue
+        if name in columns:
+            field = copy.copy(field)
+            field.validation_strategies = [
+                s for s in field.validation_strategies if not isinstance(s, _COLUMN_STRATEGIES)
+            ]
+        fields[name] = field
+    ignore_extra = cls.__dataclass_options__['ignore_extra']
+    assign = _make_assign(fields, frozen=cls.__dataclass_frozen__)
+    init = _make_init(fields, assign, False, ignore_extra, prefilled=True)
+    return derived.setdefault(('batch',), (columns, full, init))
+
+
+def _required_error(field, name):
+    error = ValidationError(field.get_error_message("required"), error_key="required")
+    error.path = [name]
+    return error
+
+
+def _prepare_column(name, field, raw_values, columnar, errors):
+    """
+    收集列值
+
+    可选字段缺失或为 None 时取默认值（与逐行校验一致）；columnar 为 True 时同时完成
+    必填与类型检查，错误写入 errors。缺失且没有默认值的位置为 _MISSING。
+
+    显式传入的 None 与逐行校验一样要经过 choices 检查：替换后的默认值仍为 None 且
+    None 不在 choices 中时记为 choices 错误（非 None 的默认值由按列检查覆盖）。
+    """
+    is_string = isinstance(field, StringField)
+    types = string_types if is_string else _number_types
+    required = field.required
+    default = field.default
+    missing = _MISSING if default is None else default
+    none_rejected = default is None and field.choices is not None and None not in field.choices and \
+        any(isinstance(s, ChoicesValidationStrategy) for s in field.validation_strategies)
+    values = []
+    for i, value in enumerate(raw_values):
+        if value is _MISSING:
+            value = missing
+            if required and columnar and i not in errors:
+                errors[i] = ValidationError(
+                    "Missing required field: '{}'".format(name), error_key="required"
+                )
+        elif value is None or (required and is_string and value == ""):
+            if required:
+                if columnar and i not in errors:
+                    errors[i] = _required_error(field, name)
+            elif none_rejected and i not in errors:
+                error = ValidationError(
+                    field.get_error_message("choices", choices=field.choices), error_key="choices"
+                )
+                error.path = [name]
+                errors[i] = error
+            value = default
+        elif columnar and not isinstance(value, types) and i not in errors:
+            expected = "string" if is_string else "number"
+            error = ValidationError(
+                field.get_error_message("invalid_type", expected_type=expected),
+                error_key="invalid_type",
+            )
+            error.path = [name]
+            errors[i] = error
+        values.append(value)
+    return values
+
+
+def _validate_column(name, field, raw_values, columnar, use_numpy):
+    """收集列值并按列检查约束，返回 (values, {下标: ValidationError})"""
+    failed = {}
+    values = _prepare_column(name, field, raw_values, columnar, failed)
+    checked = [None if v is _MISSING else v for v in values] if columnar else values
+    for i, error in check_column(field, checked, use_numpy).items():
+        if i not in failed:
+            error.path = [name]
+            failed[i] = error
+    return values, failed
+
+
+def validate_batch(cls, records, use_numpy=None):
+    """
+    按列校验一批记录并构建实例
+
+    :param cls: dataclass 类
+    :param records: 字典序列
+    :param use_numpy: None 表示 NumPy 可用时使用，False 强制纯 Python，True 要求 NumPy
+    :return: (instances, errors)；instances 与 records 一一对应，失败的位置为 None，
+             errors 为 {下标: ValidationError}，每条记录只报告一个错误
+    """
+    if not hasattr(cls, '__dataclass_fields__'):
+        raise TypeError("validate_batch() requires a dataclass, got {!r}".format(cls))
+    if not isinstance(records, (list, tuple)):
+        records = list(records)
+
+    columns, full, init = _batch_plan(cls)
+    metrics = _metrics.active
+    model = cls.__name__
+    errors = {}
+    prepared = []
+    for name, field in columns.items():
+        raw = (record.get(name, _MISSING) for record in records)
+        values, failed = _validate_column(name, field, raw, name in full, use_numpy)
+        for i, error in failed.items():
+            if i in errors:
+                continue
+            errors[i] = error
+            if metrics is not None:
+                metrics.record_instance(model, failed=True)
+                metrics.record_field(model, name, error.error_key, failed=True)
+        if name in full:
+            prepared.append(values)
+
+    instances = [None] * len(records)
+    new = cls.__new__
+    rows = zip(*prepared) if prepared else [()] * len(records)
+    for i, (record, row) in enumerate(zip(records, rows)):
+        if i in errors:
+            continue
+        instance = new(cls)
+        object.__setattr__(instance, '__dataclass_values__', dict(
+            (name, value) for name, value in zip(full, row) if value is not _MISSING
+        ))
+        if full:
+            record = dict((k, v) for k, v in record.items() if k not in full)
+        try:
+            init(instance, **record)
+        except ValidationError as e:
+            errors[i] = e
+            continue
+        instances[i] = instance
+        if metrics is not None:
+            for name in full:
+                metrics.record_field(model, name)
+    return instances, errors
+
+
+class _ColumnRow(Mapping):
+    """列式数据中一行的只读映射，不复制字段值"""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns, index):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key):
+        return self._columns[key][self._index]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self):
+        return len(self._columns)
+
+
+def _column_length(columns):
+    lengths = set(len(values) for values in columns.values())
+    if len(lengths) > 1:
+        raise ValueError("all columns must have the same length")
+    return lengths.pop() if lengths else 0
+
+
+def _convert_column(name, field, raw_values, errors):
+    """逐个值校验不能按列完成的字段（嵌套 dataclass、ListField、DateField 等）"""
+    values = []
+    for i, value in enumerate(raw_values):
+        if i in errors:
+            values.append(None)
+            continue
+        try:
+            if value is _MISSING:
+                # 与逐行构建一致：缺失的可选字段使用默认值，嵌套 dataclass 使用默认实例
+                if isinstance(field, Field):
+                    if field.required:
+                        raise ValidationError(
+                            "Missing required field: '{}'".format(name), error_key="required"
+                        )
+                    value = field.get_default()
+                    if value is not None:
+                        value = _convert_value(None, field, name, value, {})
+                elif hasattr(field, '__dataclass_fields__'):
+                    value = field()
+                else:
+                    value = None
+            else:
+                value = _convert_value(None, field, name, value, {})
+        except ValidationError as e:
+            errors[i] = e
+            value = None
+        values.append(value)
+    return values
+
+
+def _run_row_hooks(cls, result, errors):
+    """以行视图为 self 执行 @validate 函数与 setter"""
+    validators = cls._dataclass_validators
+    setters = cls.__setters__
+    names = [k for k in cls.__dataclass_fields__ if k in validators or k in setters]
+    if not names:
+        return
+    for i in range(_column_length(result)):
+        if i in errors:
+            continue
+        row = cls.view(_ColumnRow(result, i), trusted=True)
+        try:
+            for name in names:
+                value = result[name][i]
+                if name in validators:
+                    try:
+                        _run_validators(row, name, value, validators[name])
+                    except ValidationError as e:
+                        _add_error_path(e, name)
+                        raise
+                if name in setters:
+                    result[name][i] = _apply_setter(row, name, value, setters[name])
+        except ValidationError as e:
+            errors[i] = e
+
+
+def validate_columns(cls, columns, use_numpy=None):
+    """
+    按列校验列式数据（{字段名: [值, ...]}），不构建逐行实例
+
+    字段的约束按列检查（见 validate_batch）；不能按列完成的字段逐个值校验，
+    @validate 函数与 setter 以该行的只读视图为 self 执行。
+
+    :param cls: dataclass 类
+    :param columns: {字段名: 值列表}，各列长度必须相同；缺少的列视为所有行都未提供该字段
+    :param use_numpy: None 表示 NumPy 可用时使用，False 强制纯 Python，True 要求 NumPy
+    :return: (columns, errors)；返回的列包含全部字段与原样保留的额外列，
+             失败行在各字段列中的值为 None，errors 为 {行下标: ValidationError}
+    """
+    if not hasattr(cls, '__dataclass_fields__'):
+        raise TypeError("validate_columns() requires a dataclass, got {!r}".format(cls))
+    count = _column_length(columns)
+    metrics = _metrics.active
+    model = cls.__name__
+    errors = {}
+    result = {}
+    previous = _profiling.set_current_model(model)
+    try:
+        for name, field in cls.__dataclass_fields__.items():
+            raw = columns.get(name)
+            if raw is None:
+                raw = [_MISSING] * count
+            if _columnar_field(field):
+                values, failed = _validate_column(name, field, raw, True, use_numpy)
+                values = [None if v is _MISSING else v for v in values]
+            else:
+                failed = {}
+                values = _convert_column(name, field, raw, failed)
+            for i, error in failed.items():
+                if i not in errors:
+                    errors[i] = error
+                    if metrics is not None:
+                        metrics.record_field(model, name, error.error_key, failed=True)
+            result[name] = values
+        _run_row_hooks(cls, result, errors)
+    finally:
+        _profiling.set_current_model(previous)
+
+    for values in result.values():
+        for i in errors:
+            values[i] = None
+    if not cls.__dataclass_options__['ignore_extra']:
+        for name, values in columns.items():
+            if name not in result:
+                result[name] = values
+    if metrics is not None:
+        # 与逐行构建一致：成功的行中每个已赋值（提供或有默认值）的字段记一次校验
+        for i in range(count):
+            if i in errors:
+                metrics.record_instance(model, failed=True)
+                continue
+            metrics.record_instance(model)
+            for name in cls.__dataclass_fields__:
+                if result[name][i] is not None:
+                    metrics.record_field(model, name)
+    return result, errors
+
+
+def iter_rows(cls, instances, names=None):
+    """
+    逐个实例按字段顺序生成值元组，不构建中间字典
+
+    与 to_dict() 使用相同的序列化规则；未赋值且没有默认值的字段为 None。
+
+    :param cls: dataclass 类
+    :param instances: cls 的实例（或视图）序列
+    :param names: 输出的字段名及顺序，默认全部字段
+    """
+    fields = cls.__dataclass_fields__
+    serializers = cls.__dataclass_serializers__
+    if names is None:
+        names = list(fields)
+    else:
+        names = list(names)
+        for name in names:
+            if name not in fields:
+                raise ValueError("{} has no field '{}'".format(cls.__name__, name))
+    columns = [(k, fields[k], serializers.get(k)) for k in names]
+    lazy = cls.__dataclass_lazy__
+    for instance in instances:
+        if not isinstance(instance, cls):
+            raise TypeError("expected {} instance, got {!r}".format(cls.__name__, instance))
+        instance_dict = object.__getattribute__(instance, '__dict__')
+        if lazy or '__dataclass_source__' in instance_dict:
+            data = instance.to_dict()
+            yield tuple(data.get(k) for k in names)
+            continue
+        values = instance_dict['__dataclass_values__']
+        row = []
+        for k, field, serialize in columns:
+            if k in values:
+                value = values[k]
+            else:
+                value = _unset_value(instance, k, field, values)
+                if value is None:
+                    row.append(None)
+                    continue
+            if serialize is not None:
+                value = serialize(value)
+            row.append(_serialize_value(value))
+        yield tuple(row)
+
+
+def to_columns(cls, instances):
+    """
+    将一批实例序列化为列式数据 {字段名: [值, ...]}
+
+    与 to_dict() 使用相同的序列化规则；未赋值且没有默认值的字段为 None。
+    额外属性（非字段）不会输出。
+
+    :param cls: dataclass 类
+    :param instances: cls 的实例（或视图）序列
+    """
+    names = list(cls.__dataclass_fields__)
+    columns = [[] for _ in names]
+    appends = [column.append for column in columns]
+    for row in iter_rows(cls, instances):
+        for append, value in zip(appends, row):
+            append(value)
+    return dict(zip(names, columns))
@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""
+定长二进制记录编解码
+
+根据模型字段生成 struct 布局，每条记录长度固定：
+
+- NumberField：默认 ``d``（float64，整数解码后为 float），可通过字段参数
+  ``struct_format`` 指定其它数值格式，如 ``NumberField(struct_format="q")``
+- StringField：必须指定 max_length，按 ``<宽度>s`` 存储编码后的字节，宽度为
+  max_length 乘以编码中单个字符的最大字节数（UTF-8 为 4，ASCII/Latin-1 为 1）；
+  其它编码或需要更紧凑的布局时通过字段参数 ``struct_size`` 指定字节宽度。
+  不足宽度的部分以 ``\\0`` 填充，解码时去除末尾的 ``\\0``，因此字符串末尾的
+  ``\\0`` 不会保留，编码后含 ``\\0`` 字节的编码（如 UTF-16）也不支持
+- DateField：存储 ``date.toordinal()``（``i``）
+- DateTimeField：存储距 1970-01-01 的微秒数（``q``），只支持不带时区的 datetime
+
+记录以 null 位图开头，为 None 的字段对应位为 1。其它字段类型（嵌套 dataclass、
+ListField、未限制长度的 StringField、带 output_format/return_timestamp 的日期字段等）
+在创建编解码器时抛出 TypeError。
+
+解码直接通过 ``Model.from_trusted`` 构建实例，不重新校验，只应解码本编解码器写出的数据。
+``RecordCodec.view`` 与 ``RecordSequence`` 返回按需解码字段的只读视图。
+
+示例::
+
+    from schema_dataclass.codec import RecordCodec
+
+    codec = RecordCodec(Reading)
+    data = codec.encode_many(readings)
+    readings = codec.decode_many(data)
+"""
+import codecs
+import datetime
+import struct
+
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:  # Python 2
+    from collections import Mapping, Sequence
+
+from schema_dataclass.batch import iter_rows
+from schema_dataclass.fields import DateField, DateTimeField, NumberField, StringField
+
+# 可用于 NumberField 的 struct 格式
+NUMBER_FORMATS = "bBhHiIlLqQefd?"
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+# 编码中单个字符的最大字节数（codecs.lookup 规范化后的名称）
+_CHAR_WIDTHS = {"utf-8": 4, "ascii": 1, "iso8859-1": 1}
+
+
+def _identity(value):
+    return value
+
+
+def _datetime_to_micros(value):
+    if value.tzinfo is not None:
+        raise ValueError("timezone-aware datetimes are not supported")
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _micros_to_datetime(value):
+    return _EPOCH + datetime.timedelta(microseconds=value)
+
+
+def _string_codec(width, encoding):
+    def encode(value):
+        data = value.encode(encoding)
+        if len(data) > width:
+            raise ValueError("encoded string is longer than {} bytes".format(width))
+        return data
+
+    def decode(value):
+        return value.rstrip(b"\0").decode(encoding)
+
+    return encode, decode
+
+
+def _field_layout(model, name, field, encoding):
+    """返回字段的 (struct 格式, 编码函数, 解码函数, 空值占位)"""
+    if isinstance(field, NumberField):
+        fmt = field.params.get("struct_format", "d")
+        if len(fmt) != 1 or fmt not in NUMBER_FORMATS:
+            raise ValueError("invalid struct_format for field '{}': {!r}".format(name, fmt))
+        return fmt, _identity, _identity, False if fmt == "?" else 0
+    if isinstance(field, StringField):
+        width = field.params.get("struct_size")
+        if width is None:
+            if field.max_length is None:
+                raise TypeError(
+                    "StringField '{}' of {} needs max_length to be stored in a fixed-width record".format(
+                        name, model.__name__)
+                )
+            char_width = _CHAR_WIDTHS.get(codecs.lookup(encoding).name)
+            if char_width is None:
+                raise TypeError(
+                    "StringField '{}' of {} needs struct_size with encoding {!r}".format(
+                        name, model.__name__, encoding)
+                )
+            width = field.max_length * char_width
+        encode, decode = _string_codec(width, encoding)
+        return "{}s".format(width), encode, decode, b""
+    if isinstance(field, (DateField, DateTimeField)):
+        if field.output_format or field.return_timestamp:
+            raise TypeError(
+                "field '{}' of {}: output_format/return_timestamp are not supported".format(
+                    name, model.__name__)
+            )
+        if isinstance(field, DateTimeField):
+            return "q", _datetime_to_micros, _micros_to_datetime, 0
+        return "i", datetime.date.toordinal, datetime.date.fromordinal, 0
+    raise TypeError("field '{}' of {} ({}) cannot be stored in a fixed-width record".format(
+        name, model.__name__, type(field).__name__))
+
+
+class RecordCodec(object):
+    """模型的定长二进制编解码器"""
+
+    def __init__(self, model, byteorder="<", encoding="utf-8"):
+        """
+        :param model: dataclass 类
+        :param byteorder: struct 字节序前缀，默认 "<"（小端、无对齐填充）
+        :param encoding: 字符串编码
+        """
+        if byteorder not in ("<", ">", "!", "="):
+            raise ValueError("byteorder must be one of '<', '>', '!', '='")
+        if b"\0" in u"a".encode(encoding):
+            raise ValueError("encoding {!r} produces NUL bytes and is not supported".format(encoding))
+        self.model = model
+        self.byteorder = byteorder
+        self.encoding = encoding
+        self.names = list(model.__dataclass_fields__)
+        self.bitmap_size = (len(self.names) + 7) // 8
+
+        formats = []
+        self._encoders = []
+        self._decoders = []
+        self._nulls = []
+        for name, field in model.__dataclass_fields__.items():
+            fmt, encode, decode, null = _field_layout(model, name, field, encoding)
+            formats.append(fmt)
+            self._encoders.append(encode)
+            self._decoders.append(decode)
+            self._nulls.append(null)
+
+        self._struct = struct.Struct(byteorder + "{}s".format(self.bitmap_size) + "".join(formats))
+        self.size = self._struct.size
+
+        # 各字段在记录中的偏移与单字段 struct，用于只解码一个字段
+        self._fields = {}
+        offset = self.bitmap_size
+        for i, (name, fmt) in enumerate(zip(self.names, formats)):
+            field_struct = struct.Struct(byteorder + fmt)
+            self._fields[name] = (i, offset, field_struct, self._decoders[i])
+            offset += field_struct.size
+
+    def _pack_values(self, row):
+        bits = 0
+        values = [None]
+        for i, (value, encode) in enumerate(zip(row, self._encoders)):
+            if value is None:
+                bits |= 1 << i
+                values.append(self._nulls[i])
+            else:
+                values.append(encode(value))
+        values[0] = bytes(bytearray((bits >> (8 * j)) & 0xFF for j in range(self.bitmap_size)))
+        return values
+
+    def _pack_into(self, buffer, offset, row):
+        try:
+            self._struct.pack_into(buffer, offset, *self._pack_values(row))
+        except struct.error as e:
+            raise ValueError("cannot encode {} record: {}".format(self.model.__name__, e))
+
+    def encode(self, instance):
+        """编码一个实例"""
+        buffer = bytearray(self.size)
+        for row in iter_rows(self.model, [instance]):
+            self._pack_into(buffer, 0, row)
+        return bytes(buffer)
+
+    def encode_many(self, instances):
+        """编码多个实例，返回首尾相接的记录"""
+        buffer = bytearray()
+        size = self.size
+        for row in iter_rows(self.model, instances):
+            offset = len(buffer)
+            buffer.extend(b"\0" * size)
+            self._pack_into(buffer, offset, row)
+        return bytes(buffer)
+
+    def encode_into(self, buffer, instances, offset=0):
+        """
+        把多个实例直接编码写入可写缓冲区（bytearray、memoryview、mmap 等）
+
+        :return: 写入的记录数
+        """
+        size = self.size
+        count = 0
+        for row in iter_rows(self.model, instances):
+            self._pack_into(buffer, offset + count * size, row)
+            count += 1
+        return count
+
+    @staticmethod
+    def _null_bits(bitmap):
+        bits = 0
+        for j, byte in enumerate(bytearray(bitmap)):
+            bits |= byte << (8 * j)
+        return bits
+
+    def unpack(self, data, offset=0):
+        """解码一条记录为 {字段名: 值}（为 None 的字段不包含在内）"""
+        raw = self._struct.unpack_from(data, offset)
+        bits = self._null_bits(raw[0])
+        values = {}
+        for i, (name, value, decode) in enumerate(zip(self.names, raw[1:], self._decoders)):
+            if not bits >> i & 1:
+                values[name] = decode(value)
+        return values
+
+    def is_null(self, data, name, offset=0):
+        """记录中的字段是否为 None"""
+        i = self._fields[name][0]
+        byte = bytearray(data[offset + i // 8:offset + i // 8 + 1])[0]
+        return bool(byte >> (i % 8) & 1)
+
+    def _decode_field(self, data, name, offset):
+        _, field_offset, field_struct, decode = self._fields[name]
+        return decode(field_struct.unpack_from(data, offset + field_offset)[0])
+
+    def unpack_field(self, data, name, offset=0):
+        """只解码记录中的一个字段；字段为 None 时返回 None"""
+        if self.is_null(data, name, offset):
+            return None
+        return self._decode_field(data, name, offset)
+
+    def decode(self, data, offset=0):
+        """解码一条记录为实例（不重新校验）"""
+        return self.model.from_trusted(self.unpack(data, offset))
+
+    def view(self, data, offset=0, owner=None):
+        """
+        返回记录的只读视图（Model.view），字段在首次读取时才解码
+
+        data 可以是 bytes、bytearray、memoryview 或 mmap，视图不复制记录。
+
+        :param owner: 管理 data 生命周期的对象，视图存在期间保持其存活
+        """
+        return self.model.view(_RecordMapping(self, data, offset, owner), trusted=True)
+
+    def count(self, data):
+        """数据中的记录条数"""
+        if len(data) % self.size:
+            raise ValueError("data length {} is not a multiple of the record size {}".format(
+                len(data), self.size))
+        return len(data) // self.size
+
+    def iter_decode(self, data):
+        """逐条解码首尾相接的记录"""
+        size = self.size
+        for i in range(self.count(data)):
+            yield self.decode(data, i * size)
+
+    def decode_many(self, data):
+        """解码首尾相接的记录为实例列表"""
+        return list(self.iter_decode(data))
+
+
+class _RecordMapping(Mapping):
+    """一条二进制记录的只读映射，字段在首次读取时解码并缓存"""
+
+    __slots__ = ("_codec", "_data", "_offset", "_cache", "_owner")
+
+    def __init__(self, codec, data, offset, owner=None):
+        self._codec = codec
+        self._data = data
+        self._offset = offset
+        self._cache = {}
+        self._owner = owner
+
+    def __contains__(self, name):
+        if name in self._cache:
+            return True
+        return name in self._codec._fields and not self._codec.is_null(self._data, name, self._offset)
+
+    def __getitem__(self, name):
+        cache = self._cache
+        if name in cache:
+            return cache[name]
+        if name not in self:
+            raise KeyError(name)
+        value = cache[name] = self._codec._decode_field(self._data, name, self._offset)
+        return value
+
+    def __iter__(self):
+        return (name for name in self._codec.names if name in self)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+class RecordSequence(Sequence):
+    """
+    首尾相接的定长记录组成的只读序列
+
+    下标访问返回记录视图（见 RecordCodec.view），切片返回共享同一数据的子序列，
+    都不会复制或解码其它记录。
+    """
+
+    def __init__(self, codec, data, indexes=None, owner=None):
+        """
+        :param codec: RecordCodec
+        :param data: 记录数据（bytes、bytearray、memoryview 或 mmap）
+        :param indexes: 序列包含的记录下标（range），默认全部记录
+        :param owner: 管理 data 生命周期的对象，序列、切片与视图存在期间保持其存活
+        """
+        self.codec = codec
+        self._data = data
+        self._owner = owner
+        self._indexes = range(codec.count(data)) if indexes is None else indexes
+
+    @property
+    def model(self):
+        return self.codec.model
+
+    def __len__(self):
+        return len(self._indexes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RecordSequence(self.codec, self._data, self._indexes[index], self._owner)
+        return self.codec.view(self._data, self._indexes[index] * self.codec.size, self._owner)
+
+    def __iter__(self):
+        codec, data, size, owner = self.codec, self._data, self.codec.size, self._owner
+        for i in self._indexes:
+            yield codec.view(data, i * size, owner)
+
+    def __repr__(self):
+        return "<{} of {} ({} records)>".format(type(self).__name__, self.model.__name__, len(self))
+
+    def decode(self, index):
+        """解码一条记录为普通实例"""
+        return self.codec.decode(self._data, self._indexes[index] * self.codec.size)
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+按模型读写 CSV
+
+``ModelReader`` 根据字段类型为每一列预先生成转换函数（NumberField 转为数字、
+DateField/DateTimeField 按字段的 output_format/return_timestamp 设置或 ISO 格式解析、
+ListField 按分隔符拆分并转换元素），逐行转换后构建实例，
+只持有当前行，内存占用与文件大小无关。
+``ModelWriter`` 按字段声明顺序写出实例。
+
+嵌套 dataclass 字段不能表示为单个 CSV 单元格，不支持读写。
+
+示例::
+
+    from schema_dataclass.csvio import ModelReader, ModelWriter
+
+    with open("users.csv") as f:
+        for user in ModelReader(f, User):
+            ...
+
+    with open("out.csv", "w") as f:
+        ModelWriter(f, User).writerows(users)
+"""
+import csv
+import datetime
+
+from schema_dataclass.batch import iter_rows
+from schema_dataclass.exceptions import ValidationError
+from schema_dataclass.fields import (
+    DateField,
+    DateTimeField,
+    Field,
+    ListField,
+    NumberArrayField,
+    NumberField,
+    string_types,
+)
+
+# ListField 单元格内元素的默认分隔符，可通过字段参数 csv_delimiter 覆盖
+DEFAULT_LIST_DELIMITER = "|"
+
+
+def _to_number(value):
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        # 原样交给字段校验，产生标准的类型错误
+        return value
+
+
+def _to_date(value):
+    try:
+        if len(value) == 10 and value[4] == "-" and value[7] == "-":
+            return datetime.date(int(value[:4]), int(value[5:7]), int(value[8:]))
+    except ValueError:
+        pass
+    # 其它格式交给 DateField 解析
+    return value
+
+
+_fromisoformat = getattr(datetime.datetime, "fromisoformat", None)
+
+
+def _to_datetime(value):
+    if _fromisoformat is not None:
+        try:
+            return _fromisoformat(value)
+        except ValueError:
+            pass
+    # 其它格式交给 DateTimeField 解析
+    return value
+
+
+def _date_converter(field):
+    """
+    DateField/DateTimeField 的转换函数，与 ModelWriter 写出的形式对应
+
+    return_timestamp 的字段写出为时间戳，output_format 的字段写出为格式化字符串，
+    读取时按同样的设置解析为 date/datetime，再由字段转换回输出形式。
+    """
+    is_datetime = isinstance(field, DateTimeField)
+    if field.return_timestamp:
+        from_timestamp = datetime.datetime.fromtimestamp if is_datetime else datetime.date.fromtimestamp
+
+        def convert(value):
+            number = _to_number(value)
+            if isinstance(number, string_types):
+                return value
+            try:
+                return from_timestamp(number)
+            except (ValueError, OverflowError, OSError):
+                return value
+        return convert
+    if field.output_format:
+        output_format = field.output_format
+
+        def convert(value):
+            try:
+                parsed = datetime.datetime.strptime(value, output_format)
+            except ValueError:
+                return value
+            return parsed if is_datetime else parsed.date()
+        return convert
+    return _to_datetime if is_datetime else _to_date
+
+
+def _item_converter(item_type):
+    """ListField 元素的转换函数"""
+    if isinstance(item_type, Field):
+        return _cell_converter(item_type)
+    if item_type in (int, float):
+        def convert(value):
+            try:
+                return item_type(value)
+            except ValueError:
+                return value
+        return convert
+    return None
+
+
+def _cell_converter(field):
+    """
+    为字段生成单元格转换函数；不需要转换时返回 None
+
+    转换失败时返回原字符串，由字段校验给出错误。
+    """
+    if isinstance(field, (NumberField, NumberArrayField)):
+        if isinstance(field, NumberArrayField):
+            delimiter = field.params.get("csv_delimiter", DEFAULT_LIST_DELIMITER)
+            return lambda value: [_to_number(item) for item in value.split(delimiter)]
+        return _to_number
+    if isinstance(field, (DateField, DateTimeField)):
+        return _date_converter(field)
+    if isinstance(field, ListField):
+        delimiter = field.params.get("csv_delimiter", DEFAULT_LIST_DELIMITER)
+        convert_item = _item_converter(field.item_type)
+        if convert_item is None:
+            return lambda value: value.split(delimiter)
+        return lambda value: [convert_item(item) for item in value.split(delimiter)]
+    return None
+
+
+def _check_columns(model, names):
+    for name in names:
+        field = model.__dataclass_fields__.get(name)
+        if isinstance(field, type) and hasattr(field, '__dataclass_fields__'):
+            raise TypeError(
+                "nested dataclass field '{}' of {} cannot be stored in CSV".format(name, model.__name__)
+            )
+
+
+class ModelReader(object):
+    """
+    按模型读取 CSV，迭代产生实例
+
+    第一行为表头；与字段同名的列按字段类型转换，其它列以原字符串传入模型。
+    """
+
+    def __init__(self, f, model, on_error="raise", empty_as_none=True, trusted=False, **fmtparams):
+        """
+        :param f: 文本文件对象（或任意产生行字符串的可迭代对象）
+        :param model: dataclass 类
+        :param on_error: "raise" 遇到校验错误时抛出；"skip" 跳过该行并记录到 errors
+        :param empty_as_none: 空单元格视为未提供该字段
+        :param trusted: 为 True 时使用 Model.from_trusted 构建（跳过校验，仅用于可信数据）
+        :param fmtparams: 传给 csv.reader 的格式参数
+        """
+        if on_error not in ("raise", "skip"):
+            raise ValueError("on_error must be 'raise' or 'skip'")
+        self.model = model
+        self.on_error = on_error
+        self.empty_as_none = empty_as_none
+        self.trusted = trusted
+        # 被跳过的行：[(行号, ValidationError)]
+        self.errors = []
+        self._reader = csv.reader(f, **fmtparams)
+        self._columns = None
+        self.fieldnames = None
+
+    @property
+    def line_num(self):
+        """当前读取到的行号"""
+        return self._reader.line_num
+
+    def _prepare(self):
+        try:
+            header = next(self._reader)
+        except StopIteration:
+            header = []
+        self.fieldnames = header
+        _check_columns(self.model, header)
+        fields = self.model.__dataclass_fields__
+        self._columns = [
+            (i, name, _cell_converter(fields[name]) if name in fields else None)
+            for i, name in enumerate(header)
+        ]
+
+    def _build(self, row):
+        values = {}
+        empty_as_none = self.empty_as_none
+        for i, name, convert in self._columns:
+            if i >= len(row):
+                continue
+            value = row[i]
+            if value == "" and empty_as_none:
+                continue
+            if convert is not None:
+                value = convert(value)
+            values[name] = value
+        if self.trusted:
+            return self.model.from_trusted(values)
+        return self.model(**values)
+
+    def __iter__(self):
+        if self._columns is None:
+            self._prepare()
+        for row in self._reader:
+            if not row:
+                continue
+            try:
+                yield self._build(row)
+            except ValidationError as e:
+                e.line_num = self._reader.line_num
+                if self.on_error == "raise":
+                    raise
+                self.errors.append((e.line_num, e))
+
+
+def _format_cell(value, delimiter):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if hasattr(value, "tolist"):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return delimiter.join(_format_cell(item, delimiter) for item in value)
+    if isinstance(value, string_types):
+        return value
+    return str(value)
+
+
+class ModelWriter(object):
+    """按字段声明顺序写出实例"""
+
+    def __init__(self, f, model, fieldnames=None, **fmtparams):
+        """
+        :param f: 文本文件对象
+        :param model: dataclass 类
+        :param fieldnames: 写出的字段及顺序，默认全部字段
+        :param fmtparams: 传给 csv.writer 的格式参数
+        """
+        fields = model.__dataclass_fields__
+        self.model = model
+        self.fieldnames = list(fieldnames or fields)
+        _check_columns(model, self.fieldnames)
+        self._delimiters = [
+            fields[name].params.get("csv_delimiter", DEFAULT_LIST_DELIMITER)
+            if isinstance(fields.get(name), Field) else DEFAULT_LIST_DELIMITER
+            for name in self.fieldnames
+        ]
+        self._writer = csv.writer(f, **fmtparams)
+
+    def writeheader(self):
+        """写出表头"""
+        self._writer.writerow(self.fieldnames)
+
+    def writerow(self, instance):
+        """写出一个实例"""
+        self.writerows([instance])
+
+    def writerows(self, instances):
+        """写出多个实例"""
+        delimiters = self._delimiters
+        writerow = self._writer.writerow
+        for row in iter_rows(self.model, instances, self.fieldnames):
+            writerow([_format_cell(value, d) for value, d in zip(row, delimiters)])
+
+
+def read_csv(f, model, **kwargs):
+    """按模型读取 CSV，逐行产生实例，参数见 ModelReader"""
+    return iter(ModelReader(f, model, **kwargs))
+
+
+def write_csv(f, model, instances, header=True, **kwargs):
+    """按模型写出 CSV，参数见 ModelWriter"""
+    writer = ModelWriter(f, model, **kwargs)
+    if header:
+        writer.writeheader()
+    writer.writerows(instances)
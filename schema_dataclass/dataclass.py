@@ -1,6 +1,12 @@
 # -*- coding: utf-8 -*-
 import abc
+import copy
+import inspect
+import threading
 from schema_dataclass.fields import Field, ValidationError
+from schema_dataclass.exceptions import FrozenInstanceError
+from schema_dataclass import metrics as _metrics
+from schema_dataclass import profiling as _profiling
 
 
 class DataClassWrap(object):
@@ -11,6 +17,20 @@ class DataClassWrap(object):
         """将对象转换为字典"""
         pass
 
+
+# 正在执行的 getter/setter，按线程记录 (id(instance), 字段名, 是否 setter)，
+# 用于在 getter/setter 内部访问同一字段时直接读写原始值，避免递归
+_accessor_state = threading.local()
+
+
+def _running_accessors():
+    try:
+        return _accessor_state.running
+    except AttributeError:
+        running = _accessor_state.running = set()
+        return running
+
+
 def getter(field_name):
     def decorator(func):
         def attach(cls_dict):
@@ -31,17 +51,35 @@ def setter(field_name):
     return decorator
 
 
+_iscoroutinefunction = getattr(inspect, 'iscoroutinefunction', lambda func: False)
+
+
 def validate(field_name):
     def decorator(func):
         def attach(cls_dict):
-            validators = cls_dict.setdefault('_dataclass_validators', {})
+            # async def 校验函数只在异步构建路径（acreate/avalidate）中执行
+            if _iscoroutinefunction(func):
+                key = '_dataclass_async_validators'
+            else:
+                key = '_dataclass_validators'
+            validators = cls_dict.setdefault(key, {})
             validators.setdefault(field_name, []).append(func)
         func._attach_validator = attach
         return func
     return decorator
 
 
-def dataclass(cls):
+def dataclass(cls=None, frozen=False, lazy=False):
+    """
+    dataclass 装饰器
+
+    :param frozen: 为 True 时实例在 __init__ 之后不可修改，并按字段值计算（缓存）哈希
+    :param lazy: 为 True 时构建只检查必填字段并保存原始输入，
+                 各字段在首次读取时才校验转换（可用 full_validate() 一次性校验全部字段）
+    """
+    if cls is None:
+        return lambda cls: dataclass(cls, frozen=frozen, lazy=lazy)
+
     fields = {}
     seen = set()
     class_attrs = {}
@@ -63,10 +101,9 @@ def dataclass(cls):
             elif isinstance(v, DataClassWrap):
                 fields[k] = v.__class__
 
-    namespace = {
-        '__dataclass_fields__': fields,
+    hooks = {
         '_dataclass_validators': {},
-        '__dataclass_values__': None,
+        '_dataclass_async_validators': {},
         '__getters__': {},
         '__setters__': {},
     }
@@ -74,92 +111,500 @@ def dataclass(cls):
     # 处理getter/setter/validator装饰器
     for attr in class_attrs.values():
         if hasattr(attr, '_attach_getter'):
-            attr._attach_getter(namespace)
+            attr._attach_getter(hooks)
         if hasattr(attr, '_attach_setter'):
-            attr._attach_setter(namespace)
+            attr._attach_setter(hooks)
         if hasattr(attr, '_attach_validator'):
-            attr._attach_validator(namespace)
+            attr._attach_validator(hooks)
 
     # 复制普通属性和方法
+    attrs = {}
     for k, v in class_attrs.items():
         if k in ['__module__', '__doc__', '__annotations__', '__dict__', '__weakref__']:
             continue
-        if k in fields:
+        if k in fields or k in hooks or k.startswith('__dataclass'):
             continue
         if hasattr(v, '_attach_getter') or hasattr(v, '_attach_setter') or hasattr(v, '_attach_validator'):
             continue
-        if k not in namespace:
-            namespace[k] = v
+        attrs[k] = v
+
+    options = {'frozen': frozen, 'lazy': lazy, 'ignore_extra': False}
+    return _build_class(cls.__name__, cls.__module__, cls.__doc__, fields, attrs, hooks, options)
 
+
+def _build_class(name, module, doc, fields, attrs, hooks, options):
+    """
+    根据字段与属性生成 dataclass 类
+
+    :param fields: {字段名: Field 实例或 dataclass 类型}
+    :param attrs: 用户定义的普通属性与方法
+    :param hooks: getter/setter/validator 字典
+    :param options: frozen/lazy/ignore_extra 选项
+    """
+    frozen = options['frozen']
+    lazy = options['lazy']
+    if frozen:
+        _check_frozen_nested(name, fields)
+    namespace = dict(attrs)
+    namespace.update(hooks)
+    namespace.update({
+        '__dataclass_fields__': fields,
+        '__dataclass_values__': None,
+        '__dataclass_field_bits__': dict((k, 1 << i) for i, k in enumerate(fields)),
+        '__dataclass_dirty__': 0,
+        # 定义了 serialize() 的字段（如 NumberArrayField）在 to_dict() 时先转换输出形式
+        '__dataclass_serializers__': dict(
+            (k, f.serialize) for k, f in fields.items() if isinstance(f, Field) and hasattr(f, 'serialize')
+        ),
+        # 定义了 equals() 的字段在 __eq__ 中使用它比较（如 NumPy 数组）
+        '__dataclass_comparers__': dict(
+            (k, f.equals) for k, f in fields.items() if isinstance(f, Field) and hasattr(f, 'equals')
+        ),
+    })
+
+    assign = _make_assign(fields, lazy, frozen)
     namespace.update({
-        '__init__': _make_init(fields),
-        'get': _make_get(),
-        '__getattribute__': _make_getattribute(),
-        '__setattr__': _make_setattr(fields),
+        '__init__': _make_init(fields, assign, lazy, options['ignore_extra'], frozen=frozen),
+        'get': _make_get(lazy),
+        '__getattribute__': _make_getattribute(lazy),
+        '__setattr__': _make_setattr(assign, namespace['__dataclass_field_bits__']),
         '__getitem__': lambda self, k: self.get(k),
         '__setitem__': lambda self, k, v: setattr(self, k, v),
-        'to_dict': _make_to_dict(),
+        'to_dict': _make_to_dict(lazy),
         '__repr__': _make_repr(),
         '__eq__': _make_eq(),
         '__ne__': lambda self, other: not self.__eq__(other) if hasattr(self, '__eq__') else NotImplemented,
+        'construct': classmethod(_construct),
+        'from_trusted': classmethod(_from_trusted),
+        'from_dict': classmethod(_from_dict),
+        'acreate': classmethod(_acreate),
+        'acreate_many': classmethod(_acreate_many),
+        'validate_columns': classmethod(_validate_columns),
+        'to_columns': classmethod(_to_columns),
+        'avalidate': _avalidate,
+        'changed_fields': _changed_fields,
+        'get_changes': _get_changes,
+        'clear_changes': _clear_changes,
+        'revalidate': _revalidate,
+        'update': _update,
+        'replace': classmethod(_replace),
+        'view': classmethod(_view),
+        'project': classmethod(_project),
+        'partial': classmethod(_partial),
+        'pick': classmethod(_pick),
+        'omit': classmethod(_omit),
+        'full_validate': _full_validate,
+        '__dataclass_frozen__': frozen,
+        '__dataclass_lazy__': lazy,
+        '__dataclass_assign__': staticmethod(assign),
+        '__dataclass_attrs__': attrs,
+        '__dataclass_options__': options,
+        '__dataclass_derived__': {},
+        '__dataclass_view_class__': None,
     })
+    if frozen:
+        namespace.update({
+            '__setattr__': _frozen_setattr,
+            '__delattr__': _frozen_delattr,
+            '__hash__': _frozen_hash,
+        })
 
-    new_cls = type(cls.__name__, (DataClassWrap,), namespace)
-    new_cls.__module__ = cls.__module__
-    new_cls.__doc__ = cls.__doc__
+    new_cls = type(name, (DataClassWrap,), namespace)
+    new_cls.__module__ = module
+    new_cls.__doc__ = doc
     return new_cls
 
 
-def _make_init(fields):
-    def __init__(self, **kwargs):
-        object.__setattr__(self, '__dataclass_values__', {})
+def _check_frozen_nested(name, fields):
+    """冻结模型的嵌套 dataclass 字段（包括 ListField 元素）也必须是冻结的，否则哈希不可靠"""
+    for k, field in fields.items():
+        nested = field if isinstance(field, type) else getattr(field, 'item_type', None)
+        if isinstance(nested, type) and hasattr(nested, '__dataclass_fields__') and \
+                not nested.__dataclass_frozen__:
+            raise TypeError(
+                "frozen dataclass {} cannot contain non-frozen dataclass {} (field '{}')".format(
+                    name, nested.__name__, k)
+            )
+
+
+def _derive(cls, name, fields, **options):
+    """
+    复用已有 dataclass 的字段与方法生成派生类，不重新遍历 MRO
+
+    派生类中被去掉的字段读取为 None，保留字段的 @validate 函数读取它们时不会出错。
+    """
+    hooks = {}
+    for key in ('_dataclass_validators', '_dataclass_async_validators', '__getters__', '__setters__'):
+        hooks[key] = dict((k, v) for k, v in cls.__dict__[key].items() if k in fields)
+    attrs = dict(cls.__dataclass_attrs__)
+    for k in cls.__dataclass_fields__:
+        if k not in fields:
+            attrs[k] = None
+    merged = dict(cls.__dataclass_options__)
+    merged.update(options)
+    return _build_class(name, cls.__module__, cls.__doc__, fields, attrs, hooks, merged)
+
+
+def _project(cls, *paths):
+    """
+    生成只包含指定字段路径的派生模型（按路径组合缓存）
+
+    路径用 "." 访问嵌套 dataclass 字段（或元素为 dataclass 的 ListField），
+    如 ``User.project("name", "address.city")``。派生模型只校验这些字段，
+    并忽略输入中的其它键；未包含的字段读取为 None（见 _derive）。
+    """
+    if not paths:
+        raise ValueError("project() requires at least one field path")
+    _check_field_names(cls, [path.partition('.')[0] for path in paths])
+    return _cached_variant(cls, ('project', frozenset(paths)), lambda: _build_projection(cls, paths))
+
+
+def _build_projection(cls, paths):
+    nested = {}
+    whole = set()
+    for path in paths:
+        head, _, rest = path.partition('.')
+        sub = nested.setdefault(head, [])
+        if rest:
+            sub.append(rest)
+        else:
+            whole.add(head)
+
+    fields = {}
+    for k, field in cls.__dataclass_fields__.items():
+        if k not in nested:
+            continue
+        subpaths = nested[k]
+        if subpaths:
+            # 整个字段也被选中时仍校验子路径，再保留完整字段
+            if isinstance(field, type) and hasattr(field, '__dataclass_fields__'):
+                projected = field.project(*subpaths)
+            elif isinstance(field, Field) and isinstance(field.item_type, type) and \
+                    hasattr(field.item_type, '__dataclass_fields__'):
+                projected = copy.copy(field)
+                projected.item_type = field.item_type.project(*subpaths)
+            else:
+                raise ValueError("field '{}' of {} is not a nested dataclass".format(k, cls.__name__))
+        fields[k] = field if k in whole else projected
+
+    return _derive(cls, cls.__name__ + 'Projection', fields, ignore_extra=True)
+
+
+def _cached_variant(cls, key, build):
+    """按 key 缓存派生模型，每个类每种变体只生成一次"""
+    derived = cls.__dict__['__dataclass_derived__']
+    variant = derived.get(key)
+    if variant is None:
+        variant = derived.setdefault(key, build())
+    return variant
+
+
+def _check_field_names(cls, names):
+    for name in names:
+        if name not in cls.__dataclass_fields__:
+            raise ValueError("{} has no field '{}'".format(cls.__name__, name))
+
+
+def _partial(cls):
+    """
+    生成所有字段均可选的派生模型（用于 PATCH 等局部更新）
+
+    字段变为非必填且没有默认值，嵌套 dataclass 字段（包括 ListField 的 dataclass 元素）
+    同样替换为其 partial 版本。
+    """
+    def build():
+        fields = {}
+        for k, field in cls.__dataclass_fields__.items():
+            if isinstance(field, type) and hasattr(field, '__dataclass_fields__'):
+                fields[k] = field.partial()
+            elif isinstance(field, Field):
+                fields[k] = copy.copy(field)
+                fields[k].required = False
+                fields[k].default = None
+                if isinstance(field.item_type, type) and hasattr(field.item_type, '__dataclass_fields__'):
+                    fields[k].item_type = field.item_type.partial()
+            else:
+                fields[k] = field
+        return _derive(cls, cls.__name__ + 'Partial', fields)
+    return _cached_variant(cls, ('partial',), build)
+
+
+def _pick(cls, *names):
+    """生成只包含指定字段的派生模型"""
+    _check_field_names(cls, names)
+
+    def build():
+        fields = dict((k, v) for k, v in cls.__dataclass_fields__.items() if k in names)
+        return _derive(cls, cls.__name__ + 'Pick', fields)
+    return _cached_variant(cls, ('pick', frozenset(names)), build)
+
+
+def _omit(cls, *names):
+    """生成去掉指定字段的派生模型"""
+    _check_field_names(cls, names)
+
+    def build():
+        fields = dict((k, v) for k, v in cls.__dataclass_fields__.items() if k not in names)
+        return _derive(cls, cls.__name__ + 'Omit', fields)
+    return _cached_variant(cls, ('omit', frozenset(names)), build)
+
+
+def _from_dict(cls, data, only=None):
+    """
+    从字典构建实例
+
+    :param only: 字段路径列表，只提取并校验这些字段（见 project）
+    """
+    if only:
+        cls = cls.project(*only)
+    return cls(**data)
+
+
+def _construct(cls, **values):
+    """
+    跳过校验直接构建实例，仅应用默认值
+
+    只能用于已校验过的可信数据（如从自己的数据库/缓存读回的记录），
+    不要用于外部输入。
+    """
+    return _from_trusted(cls, values)
+
+
+def _from_trusted(cls, mapping):
+    """从可信字典跳过校验构建实例，参见 construct"""
+    fields = cls.__dataclass_fields__
+    instance = cls.__new__(cls)
+    values = {}
+    object.__setattr__(instance, '__dataclass_values__', values)
+
+    for k, v in mapping.items():
+        field = fields.get(k)
+        if field is None:
+            object.__setattr__(instance, k, v)
+        else:
+            values[k] = _construct_value(field, v)
+
+    _construct_defaults(cls, fields, values)
+    if cls.__dataclass_frozen__:
+        for k, v in values.items():
+            values[k] = _freeze_value(v)
+    return instance
+
+
+def _construct_defaults(cls, fields, values):
+    """不校验地为未赋值的字段写入默认值，参见 from_trusted"""
+    for k, field in fields.items():
+        if k in values:
+            continue
+        original_default = getattr(cls, k, None)
+        if isinstance(original_default, DataClassWrap):
+            values[k] = original_default
+        elif hasattr(field, '__dataclass_fields__'):
+            values[k] = field.construct()
+        elif isinstance(field, Field) and not field.required:
+            default = field.get_default()
+            if default is not None:
+                values[k] = default
+
+
+def _construct_value(field, value):
+    """不校验地将嵌套 dict 转换为 dataclass 实例"""
+    if isinstance(value, dict):
+        if isinstance(field, type) and hasattr(field, '__dataclass_fields__'):
+            return field.from_trusted(value)
+    elif isinstance(value, list) and isinstance(field, Field):
+        item_type = field.item_type
+        if isinstance(item_type, type) and hasattr(item_type, '__dataclass_fields__'):
+            return [
+                item_type.from_trusted(item) if isinstance(item, dict) else item
+                for item in value
+            ]
+    return value
+
+
+def _acreate(cls, **kwargs):
+    """异步构建实例：先执行同步校验，再并发执行 async 校验函数"""
+    from schema_dataclass import aio
+    return aio.acreate(cls, **kwargs)
+
+
+def _acreate_many(cls, records, concurrency=10, return_exceptions=False):
+    """异步批量构建实例，最多同时执行 concurrency 个"""
+    from schema_dataclass import aio
+    return aio.acreate_many(cls, records, concurrency, return_exceptions)
+
+
+def _validate_columns(cls, columns, use_numpy=None):
+    """按列校验 {字段名: [值, ...]}，返回 (columns, errors)，见 batch.validate_columns"""
+    from schema_dataclass import batch
+    return batch.validate_columns(cls, columns, use_numpy)
+
+
+def _to_columns(cls, instances):
+    """将一批实例序列化为 {字段名: [值, ...]}"""
+    from schema_dataclass import batch
+    return batch.to_columns(cls, instances)
+
+
+def _avalidate(self, *field_names):
+    """执行（指定字段的）async 校验函数"""
+    from schema_dataclass import aio
+    return aio.run_async_validators(self, field_names or None)
+
+
+def _missing_required(instance, name):
+    """缺少必填字段的错误；启用指标时同时记入该字段的 required 错误"""
+    metrics = _metrics.active
+    if metrics is not None:
+        metrics.record_field(type(instance).__name__, name, "required", failed=True)
+    return ValidationError("Missing required field: '{}'".format(name), error_key="required")
+
+
+def _assign_defaults(self, fields, assign):
+    """为未赋值的字段写入默认值（嵌套 dataclass 使用默认实例）"""
+    values = object.__getattribute__(self, '__dataclass_values__')
+    instance_dict = object.__getattribute__(self, '__dict__')
+    for k, field in fields.items():
+        if k in values or k in instance_dict:
+            continue
+        original_default = getattr(self.__class__, k, None)
+        if isinstance(original_default, DataClassWrap):
+            assign(self, k, original_default)
+        elif hasattr(field, '__dataclass_fields__'):
+            assign(self, k, field())
+        elif isinstance(field, Field) and not field.required:
+            default = field.get_default()
+            if default is not None:
+                assign(self, k, default)
+
+
+def _make_init(fields, assign, lazy=False, ignore_extra=False, prefilled=False, frozen=False):
+    """
+    生成 __init__
+
+    :param prefilled: 为 True 时保留调用前已写入的 __dataclass_values__（批量校验按列预先校验的字段）
+    :param frozen: lazy 模式下冻结保存的原始输入中的列表（见 _freeze_value）
+    """
+    def init(self, kwargs):
+        if not prefilled:
+            object.__setattr__(self, '__dataclass_values__', {})
         for k, field in fields.items():
             if isinstance(field, Field) and field.required and k not in kwargs:
-                raise ValidationError("Missing required field: '{}'".format(k))
+                raise _missing_required(self, k)
 
         for k, v in kwargs.items():
-            if k in fields:
-                setattr(self, k, v)
-            else:
+            if ignore_extra and k not in fields:
+                continue
+            assign(self, k, v)
+
+        _assign_defaults(self, fields, assign)
+
+    def lazy_init(self, kwargs):
+        object.__setattr__(self, '__dataclass_values__', {})
+        for k, field in fields.items():
+            if isinstance(field, Field) and field.required and k not in kwargs:
+                raise _missing_required(self, k)
+
+        # kwargs 是本次调用新建的字典，直接作为待校验的原始输入保存
+        raw = kwargs
+        for k in [k for k in raw if k not in fields]:
+            v = raw.pop(k)
+            if not ignore_extra:
                 object.__setattr__(self, k, v)
 
         for k, field in fields.items():
-            if k in getattr(self, '__dataclass_values__', {}):
-                continue
-            if k in self.__dict__:
+            if k in raw:
                 continue
             original_default = getattr(self.__class__, k, None)
             if isinstance(original_default, DataClassWrap):
-                setattr(self, k, original_default)
+                raw[k] = original_default
             elif hasattr(field, '__dataclass_fields__'):
-                setattr(self, k, field())
+                raw[k] = {}
             elif isinstance(field, Field) and not field.required:
                 default = field.get_default()
                 if default is not None:
-                    setattr(self, k, default)
+                    raw[k] = default
+        if frozen:
+            for k, v in raw.items():
+                raw[k] = _freeze_value(v)
+        object.__setattr__(self, '__dataclass_raw__', raw)
+
+    run = lazy_init if lazy else init
+
+    def __init__(self, **kwargs):
+        metrics = _metrics.active
+        if metrics is None:
+            return run(self, kwargs)
+        try:
+            run(self, kwargs)
+        except ValidationError:
+            metrics.record_instance(type(self).__name__, failed=True)
+            raise
+        metrics.record_instance(type(self).__name__)
     return __init__
 
 
-def _make_get():
+def _make_get(lazy=False):
     def get(self, key, default=None):
         values = object.__getattribute__(self, '__dataclass_values__')
         if key in values:
             return values[key]
         fields = object.__getattribute__(self, '__dataclass_fields__')
         if key in fields:
-            field = fields[key]
-            original_default = getattr(self.__class__, key, None)
-            if isinstance(original_default, DataClassWrap):
-                return original_default
-            if isinstance(field, Field):
-                return field.get_default()
-            if hasattr(field, '__dataclass_fields__'):
-                return field()
+            if lazy and _load_pending(self, key):
+                return values[key]
+            return _unset_value(self, key, fields[key], values)
         return default
     return get
 
 
-def _make_getattribute():
+def _load_pending(self, name):
+    """lazy 模式下校验并缓存尚未读取过的原始输入，返回该字段是否已载入"""
+    raw = object.__getattribute__(self, '__dict__').get('__dataclass_raw__')
+    if not raw or name not in raw:
+        return False
+    object.__getattribute__(self, '__dataclass_assign__')(self, name, raw[name])
+    return True
+
+
+def _full_validate(self):
+    """
+    校验 lazy 模式下所有尚未读取过的字段
+
+    非 lazy 模式下字段在赋值时即已校验，本方法不做任何事。
+
+    :return: self
+    """
+    raw = object.__getattribute__(self, '__dict__').get('__dataclass_raw__')
+    if raw:
+        for name in list(raw):
+            _load_pending(self, name)
+    return self
+
+
+def _unset_value(self, name, field, values):
+    """
+    读取未赋值字段
+
+    常量默认值直接共享；可调用默认值与嵌套 dataclass 在首次读取时生成一次并缓存到实例，
+    之后的读取返回同一个对象。
+    """
+    original_default = getattr(self.__class__, name, None)
+    if isinstance(original_default, DataClassWrap):
+        return original_default
+    if isinstance(field, Field):
+        if not callable(field.default):
+            return field.default
+        default = field.get_default()
+        if default is None:
+            return None
+        return values.setdefault(name, default)
+    if hasattr(field, '__dataclass_fields__'):
+        return values.setdefault(name, field())
+    return None
+
+
+def _make_getattribute(lazy=False):
     def __getattribute__(self, name):
         try:
             fields = object.__getattribute__(self, '__dataclass_fields__')
@@ -168,34 +613,35 @@ def _make_getattribute():
         except AttributeError:
             return object.__getattribute__(self, name)
 
-        if name in getters and callable(getters[name]):
-            current_getter = getters.pop(name)
-            try:
-                return current_getter(self)
-            finally:
-                getters[name] = current_getter
+        current_getter = getters.get(name)
+        if current_getter is not None and callable(current_getter):
+            running = _running_accessors()
+            key = (id(self), name, False)
+            if key not in running:
+                running.add(key)
+                try:
+                    return current_getter(self)
+                finally:
+                    running.discard(key)
 
         if name in fields:
             if name in values:
                 return values[name]
-            original_default = getattr(self.__class__, name, None)
-            if isinstance(original_default, DataClassWrap):
-                return original_default
-            field = fields[name]
-            if isinstance(field, Field):
-                return field.get_default()
-            elif hasattr(field, '__dataclass_fields__'):
-                instance = field()
-                values[name] = instance
-                return instance
-            return None
+            if lazy and _load_pending(self, name):
+                return values[name]
+            return _unset_value(self, name, fields[name], values)
 
         return object.__getattribute__(self, name)
     return __getattribute__
 
 
-def _make_setattr(fields):
-    def __setattr__(self, name, value):
+def _make_assign(fields, lazy=False, frozen=False):
+    """
+    校验并写入字段值；name 是字段时返回 True，否则按普通属性写入并返回 False
+
+    :param frozen: 为 True 时列表值以 _FrozenList 副本保存
+    """
+    def assign(self, name, value):
         try:
             setters = object.__getattribute__(self, '__setters__')
             values = object.__getattribute__(self, '__dataclass_values__')
@@ -203,27 +649,448 @@ def _make_setattr(fields):
             validators = object.__getattribute__(self, '_dataclass_validators')
         except AttributeError:
             object.__setattr__(self, name, value)
-            return
+            return False
 
         if field is None:
             object.__setattr__(self, name, value)
-            return
+            return False
 
         validated_value = _validate_and_convert_value(self, field, name, value, validators)
-
         if name in setters:
-            current_setter = setters.pop(name)
+            validated_value = _apply_setter(self, name, validated_value, setters[name])
+        if frozen:
+            validated_value = _freeze_value(validated_value)
+        values[name] = validated_value
+        if lazy:
+            raw = object.__getattribute__(self, '__dict__').get('__dataclass_raw__')
+            if raw:
+                raw.pop(name, None)
+        return True
+    return assign
+
+
+def _apply_setter(self, name, value, current_setter):
+    running = _running_accessors()
+    key = (id(self), name, True)
+    if key in running:
+        return value
+    running.add(key)
+    try:
+        result = current_setter(self, value)
+        return value if result is None else result
+    finally:
+        running.discard(key)
+
+
+_missing = object()
+
+
+def _apply_changes(self, changes):
+    """先校验全部新值，再一次性提交；任一步失败时恢复原值"""
+    fields = object.__getattribute__(self, '__dataclass_fields__')
+    values = object.__getattribute__(self, '__dataclass_values__')
+    validators = object.__getattribute__(self, '_dataclass_validators')
+    setters = object.__getattribute__(self, '__setters__')
+    frozen = object.__getattribute__(self, '__dataclass_frozen__')
+
+    staged = {}
+    extras = {}
+    for name, value in changes.items():
+        field = fields.get(name)
+        if field is None:
+            extras[name] = value
+        else:
+            staged[name] = _validate_and_convert_value(self, field, name, value, {})
+
+    previous = dict((name, values.get(name, _missing)) for name in staged)
+    values.update(staged)
+    try:
+        for name in staged:
+            if name in validators:
+                try:
+                    _run_validators(self, name, values[name], validators[name])
+                except ValidationError as e:
+                    _add_error_path(e, name)
+                    raise
+            if name in setters:
+                values[name] = _apply_setter(self, name, values[name], setters[name])
+            if frozen:
+                values[name] = _freeze_value(values[name])
+    except BaseException:
+        for name, value in previous.items():
+            if value is _missing:
+                values.pop(name, None)
+            else:
+                values[name] = value
+        raise
+
+    raw = object.__getattribute__(self, '__dict__').get('__dataclass_raw__')
+    if raw:
+        for name in staged:
+            raw.pop(name, None)
+
+    field_bits = object.__getattribute__(self, '__dataclass_field_bits__')
+    bits = 0
+    for name in staged:
+        bits |= field_bits[name]
+    if bits:
+        _mark_dirty(self, bits, dict((name, changes[name]) for name in staged))
+    for name, value in extras.items():
+        object.__setattr__(self, name, value)
+
+
+def _replace(cls, instance, **changes):
+    """
+    基于已有实例创建修改后的副本
+
+    未修改字段直接共享已校验的值（不重新校验、不深拷贝），只校验 changes 中的字段。
+    """
+    if not isinstance(instance, cls):
+        raise TypeError("replace() expects a {} instance, got {}".format(
+            cls.__name__, type(instance).__name__))
+    if '__dataclass_source__' in object.__getattribute__(instance, '__dict__'):
+        instance = _view_to_instance(instance)
+    new = cls.__new__(cls)
+    for k, v in object.__getattribute__(instance, '__dict__').items():
+        if k in ('__dataclass_values__', '__dataclass_raw__'):
+            object.__setattr__(new, k, dict(v))
+        elif not k.startswith('__dataclass'):
+            object.__setattr__(new, k, v)
+    if changes:
+        _apply_changes(new, changes)
+        _clear_changes(new)
+    return new
+
+
+def _update(self, **changes):
+    """
+    原子地更新多个字段
+
+    先校验所有新值，再写入并对每个被修改的字段执行一次 @validate 函数
+    （此时实例上已是全部新值，便于跨字段校验）；任一校验失败时实例保持不变。
+    """
+    if object.__getattribute__(self, '__dataclass_frozen__'):
+        raise FrozenInstanceError(
+            "cannot update frozen {} instance".format(type(self).__name__))
+    _apply_changes(self, changes)
+
+
+def _frozen_setattr(self, name, value):
+    raise FrozenInstanceError("cannot assign to field '{}'".format(name))
+
+
+def _frozen_delattr(self, name):
+    raise FrozenInstanceError("cannot delete field '{}'".format(name))
+
+
+def _frozen_hash(self):
+    instance_dict = object.__getattribute__(self, '__dict__')
+    result = instance_dict.get('__dataclass_hash__')
+    if result is None:
+        fields = object.__getattribute__(self, '__dataclass_fields__')
+        result = hash((type(self).__name__,) + tuple(_hashable(self.get(k)) for k in fields))
+        instance_dict['__dataclass_hash__'] = result
+    return result
+
+
+class _FrozenList(list):
+    """冻结实例中保存的列表副本，禁止原地修改（仍是 list，可直接用于校验与序列化）"""
+
+    def _immutable(self, *args, **kwargs):
+        raise FrozenInstanceError("cannot modify list of a frozen instance")
+
+    __setitem__ = __delitem__ = __setslice__ = __delslice__ = _immutable
+    __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = reverse = sort = clear = _immutable
+
+    def __reduce__(self):
+        return _FrozenList, (list(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def _freeze_value(value):
+    """冻结实例写入列表值时复制为 _FrozenList，调用方之后修改原列表不影响实例"""
+    if isinstance(value, list) and not isinstance(value, _FrozenList):
+        return _FrozenList(_freeze_value(item) for item in value)
+    return value
+
+
+def _hashable(value):
+    """将列表/字典/集合转换为可哈希的等价形式"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return frozenset((k, _hashable(v)) for k, v in value.items())
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _view(cls, mapping, trusted=False, eager=False):
+    """
+    创建包装已有字典的只读视图，不复制字段值
+
+    视图与普通实例提供相同的属性访问、get()、to_dict() 接口。字段在首次读取时校验，
+    只有校验过程中发生了转换（如嵌套 dict 转为 dataclass）的值才会额外缓存；
+    原始字典中的值不会被修改。
+
+    :param mapping: 原始数据字典
+    :param trusted: 为 True 时跳过校验（只做嵌套 dataclass 转换），仅用于可信数据
+    :param eager: 为 True 时在创建时即校验全部字段（仍不复制未转换的值）
+    """
+    view_cls = cls.__dict__.get('__dataclass_view_class__')
+    if view_cls is None:
+        view_cls = _make_view_class(cls)
+        setattr(cls, '__dataclass_view_class__', view_cls)
+
+    if not trusted:
+        for k, field in cls.__dataclass_fields__.items():
+            if isinstance(field, Field) and field.required and k not in mapping:
+                raise ValidationError(
+                    "Missing required field: '{}'".format(k), error_key="required"
+                )
+
+    view = view_cls.__new__(view_cls)
+    object.__setattr__(view, '__dataclass_values__', {})
+    object.__setattr__(view, '__dataclass_source__', mapping)
+    object.__setattr__(view, '__dataclass_checked__', 0)
+    if trusted:
+        object.__setattr__(view, '__dataclass_trusted__', True)
+    if eager:
+        _view_full_validate(view)
+    return view
+
+
+def _make_view_class(cls):
+    namespace = {
+        '__init__': _view_init,
+        '__getattribute__': _view_getattribute,
+        '__getattr__': _view_getattr,
+        '__setattr__': _view_setattr,
+        '__delattr__': _view_setattr,
+        'get': _view_get,
+        'to_dict': _view_to_dict,
+        'to_instance': _view_to_instance,
+        'full_validate': _view_full_validate,
+        '__eq__': _view_eq,
+        '__dataclass_frozen__': True,
+        '__dataclass_trusted__': False,
+    }
+    view_cls = type(cls.__name__ + 'View', (cls,), namespace)
+    view_cls.__module__ = cls.__module__
+    view_cls.__doc__ = cls.__doc__
+    return view_cls
+
+
+def _view_eq(self, other):
+    # 视图与同一模型的普通实例按字段值比较
+    if not isinstance(other, type(self).__bases__[0]):
+        return False
+    return _fields_equal(self, other)
+
+
+def _view_init(self, *args, **kwargs):
+    raise TypeError("views are created with {}.view(mapping)".format(
+        type(self).__name__[:-len('View')]))
+
+
+def _view_setattr(self, name, value=None):
+    raise FrozenInstanceError("view is read-only, cannot modify '{}'".format(name))
+
+
+def _view_value(self, name, field):
+    values = object.__getattribute__(self, '__dataclass_values__')
+    if name in values:
+        return values[name]
+    source = object.__getattribute__(self, '__dataclass_source__')
+    if name not in source:
+        return _unset_value(self, name, field, values)
+
+    raw = source[name]
+    bit = object.__getattribute__(self, '__dataclass_field_bits__')[name]
+    checked = object.__getattribute__(self, '__dataclass_checked__')
+    if checked & bit:
+        return raw
+    if object.__getattribute__(self, '__dataclass_trusted__'):
+        value = _construct_value(field, raw)
+    else:
+        validators = object.__getattribute__(self, '_dataclass_validators')
+        value = _validate_and_convert_value(self, field, name, raw, validators)
+    # 只缓存发生了转换的值，未转换的值直接从原始字典读取
+    if value is raw:
+        object.__setattr__(self, '__dataclass_checked__', checked | bit)
+    else:
+        values[name] = value
+    return value
+
+
+def _view_getattribute(self, name):
+    fields = object.__getattribute__(self, '__dataclass_fields__')
+    getters = object.__getattribute__(self, '__getters__')
+
+    current_getter = getters.get(name)
+    if current_getter is not None and callable(current_getter):
+        running = _running_accessors()
+        key = (id(self), name, False)
+        if key not in running:
+            running.add(key)
             try:
-                result = current_setter(self, validated_value)
-                if result is not None:
-                    validated_value = result
+                return current_getter(self)
             finally:
-                setters[name] = current_setter
+                running.discard(key)
 
-        values[name] = validated_value
+    if name in fields:
+        return _view_value(self, name, fields[name])
+    return object.__getattribute__(self, name)
+
+
+def _view_getattr(self, name):
+    # 原始字典中的非字段键与普通实例上的额外属性对应
+    source = object.__getattribute__(self, '__dataclass_source__')
+    if not name.startswith('_') and name in source:
+        return source[name]
+    raise AttributeError("'{}' object has no attribute '{}'".format(
+        type(self).__name__, name))
+
+
+def _view_get(self, key, default=None):
+    fields = object.__getattribute__(self, '__dataclass_fields__')
+    if key in fields:
+        return _view_value(self, key, fields[key])
+    return default
+
+
+def _view_full_validate(self):
+    """校验视图的全部字段"""
+    for name, field in object.__getattribute__(self, '__dataclass_fields__').items():
+        _view_value(self, name, field)
+    return self
+
+
+def _is_plain(value):
+    if hasattr(value, 'to_dict'):
+        return False
+    if isinstance(value, (list, tuple)):
+        return all(_is_plain(item) for item in value)
+    return True
+
+
+def _view_to_dict(self):
+    """
+    序列化视图
+
+    原始数据是 dict、且所有字段都无需转换或填充默认值时，直接返回原始字典本身（不复制）。
+    """
+    _view_full_validate(self)
+    fields = object.__getattribute__(self, '__dataclass_fields__')
+    values = object.__getattribute__(self, '__dataclass_values__')
+    source = object.__getattribute__(self, '__dataclass_source__')
+    serializers = object.__getattribute__(self, '__dataclass_serializers__')
+
+    if not values and not serializers and isinstance(source, dict) and all(
+        (k in source and _is_plain(source[k])) or (k not in source and self.get(k) is None)
+        for k in fields
+    ) and not any(isinstance(k, str) and k.startswith('_') for k in source):
+        return source
+
+    result = {}
+    for k in fields:
+        value = self.get(k)
+        if k in serializers:
+            value = serializers[k](value)
+        if k in source or value is not None:
+            result[k] = _serialize_value(value)
+    for k, v in source.items():
+        if k not in fields and not k.startswith('_'):
+            result[k] = _serialize_value(v)
+    return result
+
+
+def _view_to_instance(self):
+    """将视图转换为普通（可修改的）实例，复用已校验的值"""
+    _view_full_validate(self)
+    fields = object.__getattribute__(self, '__dataclass_fields__')
+    source = object.__getattribute__(self, '__dataclass_source__')
+    data = dict((k, self.get(k)) for k in fields if k in source or self.get(k) is not None)
+    for k, v in source.items():
+        if k not in fields:
+            data[k] = v
+    return type(self).__bases__[0].from_trusted(data)
+
+
+def _make_setattr(assign, field_bits):
+    def __setattr__(self, name, value):
+        if assign(self, name, value):
+            _mark_dirty(self, field_bits[name], {name: value})
     return __setattr__
 
 
+def _mark_dirty(self, bits, inputs):
+    """
+    标记字段已修改，并记录赋值时的原始输入
+
+    :param inputs: {字段名: 赋值的原始值}，revalidate() 从原始值重新校验，避免对已转换的值再次转换
+    """
+    dirty = object.__getattribute__(self, '__dataclass_dirty__')
+    object.__setattr__(self, '__dataclass_dirty__', dirty | bits)
+    instance_dict = object.__getattribute__(self, '__dict__')
+    stored = instance_dict.get('__dataclass_inputs__')
+    if stored is None:
+        stored = instance_dict['__dataclass_inputs__'] = {}
+    stored.update(inputs)
+
+
+def _changed_fields(self):
+    """返回自构建（或上次 clear_changes）以来被赋值过的字段名，按字段声明顺序"""
+    dirty = object.__getattribute__(self, '__dataclass_dirty__')
+    if not dirty:
+        return []
+    field_bits = object.__getattribute__(self, '__dataclass_field_bits__')
+    return [k for k, bit in field_bits.items() if dirty & bit]
+
+
+def _get_changes(self):
+    """返回被修改字段的 {字段名: 当前值}"""
+    return dict((k, self.get(k)) for k in _changed_fields(self))
+
+
+def _clear_changes(self):
+    """清除修改标记"""
+    instance_dict = object.__getattribute__(self, '__dict__')
+    instance_dict.pop('__dataclass_dirty__', None)
+    instance_dict.pop('__dataclass_inputs__', None)
+
+
+def _revalidate(self):
+    """
+    只对被修改过的字段重新执行字段校验与 @validate 函数
+
+    从赋值时的原始输入重新校验（与赋值时一样执行 setter），不会对已转换的值再次转换；
+    原地修改过的可变值（如列表）同样会被检查。全部字段校验通过后才写回。
+
+    :return: 重新校验的字段名列表
+    """
+    names = _changed_fields(self)
+    fields = object.__getattribute__(self, '__dataclass_fields__')
+    values = object.__getattribute__(self, '__dataclass_values__')
+    validators = object.__getattribute__(self, '_dataclass_validators')
+    setters = object.__getattribute__(self, '__setters__')
+    inputs = object.__getattribute__(self, '__dict__').get('__dataclass_inputs__', {})
+    staged = {}
+    for name in names:
+        value = _validate_and_convert_value(self, fields[name], name, inputs[name], validators)
+        if name in setters:
+            value = _apply_setter(self, name, value, setters[name])
+        staged[name] = value
+    values.update(staged)
+    return names
+
+
 def _serialize_value(value):
     if hasattr(value, "to_dict") and callable(value.to_dict):
         return value.to_dict()
@@ -235,27 +1102,26 @@ def _serialize_value(value):
         return value
 
 
-def _make_to_dict():
+def _make_to_dict(lazy=False):
     def to_dict(self):
+        if lazy:
+            _full_validate(self)
         result = {}
         fields = object.__getattribute__(self, '__dataclass_fields__')
         values = object.__getattribute__(self, '__dataclass_values__')
 
+        serializers = object.__getattribute__(self, '__dataclass_serializers__')
+
         for k in fields:
             if k in values:
-                result[k] = _serialize_value(values[k])
+                value = values[k]
             else:
-                original_default = getattr(self.__class__, k, None)
-                if isinstance(original_default, DataClassWrap):
-                    result[k] = _serialize_value(original_default)
-                else:
-                    field = fields[k]
-                    if isinstance(field, Field):
-                        default = field.get_default()
-                        if default is not None:
-                            result[k] = _serialize_value(default)
-                    elif hasattr(field, '__dataclass_fields__'):
-                        result[k] = _serialize_value(field())
+                value = _unset_value(self, k, fields[k], values)
+                if value is None:
+                    continue
+            if k in serializers:
+                value = serializers[k](value)
+            result[k] = _serialize_value(value)
 
         for k, v in self.__dict__.items():
             if not k.startswith("_") and k not in fields:
@@ -277,37 +1143,68 @@ def _make_eq():
     def __eq__(self, other):
         if not isinstance(other, type(self)):
             return False
-        fields = object.__getattribute__(self, '__dataclass_fields__')
-        return all(self.get(k) == other.get(k) for k in fields)
+        return _fields_equal(self, other)
     return __eq__
 
 
+def _fields_equal(self, other):
+    fields = object.__getattribute__(self, '__dataclass_fields__')
+    comparers = object.__getattribute__(self, '__dataclass_comparers__')
+    return all(
+        comparers[k](self.get(k), other.get(k)) if k in comparers else self.get(k) == other.get(k)
+        for k in fields
+    )
+
+
 def _validate_and_convert_value(instance, field, field_name, value, validators):
+    if _profiling.active is None and _metrics.active is None:
+        return _convert_value(instance, field, field_name, value, validators)
+
+    model = type(instance).__name__
+    metrics = _metrics.active
+    previous = _profiling.set_current_model(model)
+    try:
+        validated_value = _convert_value(instance, field, field_name, value, validators)
+    except ValidationError as e:
+        if metrics is not None:
+            metrics.record_field(model, field_name, e.error_key, failed=True)
+        raise
+    finally:
+        _profiling.set_current_model(previous)
+    if metrics is not None:
+        metrics.record_field(model, field_name)
+    return validated_value
+
+
+def _convert_value(instance, field, field_name, value, validators):
     try:
         validated_value = None
 
         if isinstance(field, type) and hasattr(field, '__dataclass_fields__'):
             if isinstance(value, dict):
+                # 嵌套 __init__ 已完成全部字段的校验（并计入指标/分析），不再重复检查
                 validated_value = field(**value)
+                _full_validate(validated_value)
             elif isinstance(value, DataClassWrap):
                 validated_value = value
             else:
                 raise ValidationError("Expected dict or {} instance for field '{}'".format(
-                    field.__name__, field_name))
-            if hasattr(validated_value, '__dataclass_fields__'):
+                    field.__name__, field_name), error_key="invalid_type")
+            if validated_value is value and hasattr(validated_value, '__dataclass_fields__'):
+                # 传入的已有实例：重新检查其字段值，这不是一次新的字段校验，不计入指标
+                _full_validate(validated_value)
                 for k, f in validated_value.__dataclass_fields__.items():
-                    if k in validated_value.__dataclass_values__:
-                        v = validated_value.__dataclass_values__[k]
+                    sub_values = validated_value.__dataclass_values__
+                    if k in sub_values:
+                        v = sub_values[k]
+                    elif isinstance(f, Field) or isinstance(
+                        getattr(validated_value.__class__, k, None), DataClassWrap
+                    ):
+                        v = _unset_value(validated_value, k, f, sub_values)
                     else:
-                        original_default = getattr(validated_value.__class__, k, None)
-                        if isinstance(original_default, DataClassWrap):
-                            v = original_default
-                        elif isinstance(f, Field):
-                            v = f.get_default()
-                        else:
-                            continue
+                        continue
                     sub_validators = getattr(validated_value, '_dataclass_validators', {}).get(k, [])
-                    _validate_and_convert_value(validated_value, f, k, v, sub_validators)
+                    _convert_value(validated_value, f, k, v, sub_validators)
 
         elif isinstance(field, Field):
             validated_value = field.validate(value)
@@ -316,12 +1213,28 @@ def _validate_and_convert_value(instance, field, field_name, value, validators):
             validated_value = value
 
         if field_name in validators:
-            for validator in validators[field_name]:
-                validator(instance, validated_value)
+            _run_validators(instance, field_name, validated_value, validators[field_name])
 
         return validated_value
 
     except ValidationError as e:
-        if field_name not in str(e):
-            e.path = [field_name] + getattr(e, "path", [])
+        _add_error_path(e, field_name)
         raise
+
+
+def _run_validators(instance, field_name, value, funcs):
+    profiler = _profiling.active
+    for validator in funcs:
+        if profiler is None:
+            validator(instance, value)
+        else:
+            profiler.call(
+                type(instance).__name__, field_name,
+                "@" + getattr(validator, "__name__", "validator"),
+                validator, instance, value
+            )
+
+
+def _add_error_path(error, field_name):
+    if field_name not in str(error):
+        error.path = [field_name] + getattr(error, "path", [])
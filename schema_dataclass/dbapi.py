@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+DB-API（PEP 249）辅助工具
+
+``row_factory(Model)`` 生成 ``factory(cursor, row)``，按 ``cursor.description``
+把列位置直接映射到字段并写入实例（不经过中间字典），可用作 sqlite3 的
+``connection.row_factory``；
+``fetch_instances`` 适用于任意 DB-API 游标。``insert_many`` 按字段顺序从实例中
+提取参数元组并调用 ``executemany``，不构建中间字典。
+
+示例::
+
+    import sqlite3
+    from schema_dataclass.dbapi import row_factory, insert_many
+
+    conn = sqlite3.connect("app.db")
+    insert_many(conn, "users", User, users)
+    conn.row_factory = row_factory(User, trusted=True)
+    users = conn.execute("SELECT * FROM users").fetchall()
+"""
+import re
+
+from schema_dataclass import metrics as _metrics
+from schema_dataclass.batch import iter_rows
+from schema_dataclass.dataclass import (
+    _assign_defaults,
+    _construct_defaults,
+    _construct_value,
+    _missing_required,
+)
+from schema_dataclass.exceptions import ValidationError
+from schema_dataclass.fields import Field
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+
+_PLACEHOLDERS = {
+    "qmark": lambda i: "?",
+    "format": lambda i: "%s",
+    "numeric": lambda i: ":{}".format(i + 1),
+}
+
+
+def _row_plan(model, description):
+    """
+    按结果集的列生成 (字段列 [(位置, 字段名, 字段)], 额外列 [(位置, 列名)], 缺少的必填字段)
+    """
+    fields = model.__dataclass_fields__
+    names = [column[0] for column in description]
+    columns = [(i, name, fields[name]) for i, name in enumerate(names) if name in fields]
+    extras = []
+    if not model.__dataclass_options__['ignore_extra']:
+        extras = [(i, name) for i, name in enumerate(names) if name not in fields]
+    present = set(names)
+    required = [name for name, field in fields.items()
+                if isinstance(field, Field) and field.required and name not in present]
+    return columns, extras, required
+
+
+def _build_trusted(model, plan, row):
+    columns, extras, _ = plan
+    instance = model.__new__(model)
+    values = {}
+    object.__setattr__(instance, '__dataclass_values__', values)
+    for i, name, field in columns:
+        values[name] = _construct_value(field, row[i])
+    for i, name in extras:
+        object.__setattr__(instance, name, row[i])
+    _construct_defaults(model, model.__dataclass_fields__, values)
+    return instance
+
+
+def _build_validated(model, plan, row):
+    columns, extras, required = plan
+    instance = model.__new__(model)
+    object.__setattr__(instance, '__dataclass_values__', {})
+    if required:
+        raise _missing_required(instance, required[0])
+    assign = model.__dataclass_assign__
+    for i, name, _ in columns:
+        assign(instance, name, row[i])
+    for i, name in extras:
+        object.__setattr__(instance, name, row[i])
+    _assign_defaults(instance, model.__dataclass_fields__, assign)
+    return instance
+
+
+def _build_checked(model, plan, row):
+    # 与 Model(**row) 一样记录实例构建指标
+    metrics = _metrics.active
+    if metrics is None:
+        return _build_validated(model, plan, row)
+    try:
+        instance = _build_validated(model, plan, row)
+    except ValidationError:
+        metrics.record_instance(model.__name__, failed=True)
+        raise
+    metrics.record_instance(model.__name__)
+    return instance
+
+
+def _build_lazy(model, plan, row):
+    # 延迟校验模式需要保存原始输入字典，按关键字参数构建
+    columns, extras, _ = plan
+    values = dict((name, row[i]) for i, name, _ in columns)
+    values.update((name, row[i]) for i, name in extras)
+    return model(**values)
+
+
+def row_factory(model, trusted=False):
+    """
+    生成把数据库行转换为实例的函数 ``factory(cursor, row)``
+
+    列位置到字段的映射按 ``cursor.description`` 每个结果集只生成一次，之后按位置
+    直接写入新实例，不构建中间字典。与字段同名的列写入字段，其它列作为普通属性
+    （与 ``Model(**row)`` 一致）。
+
+    :param model: dataclass 类
+    :param trusted: 为 True 时跳过校验（同 Model.from_trusted），仅用于自己写入的表
+    """
+    if trusted:
+        build = _build_trusted
+    elif model.__dataclass_lazy__:
+        build = _build_lazy
+    else:
+        build = _build_checked
+    # 上一个结果集的 (description, plan)，整体替换，多个游标或线程共用时不会错配
+    cache = [(None, None)]
+
+    def factory(cursor, row):
+        description = cursor.description
+        cached_description, plan = cache[0]
+        if description is not cached_description:
+            plan = _row_plan(model, description)
+            cache[0] = (description, plan)
+        return build(model, plan, row)
+
+    return factory
+
+
+def fetch_instances(cursor, model, trusted=False, size=None):
+    """
+    逐行产生已执行查询的结果实例，按 ``fetchmany`` 分批读取
+
+    :param cursor: 已执行查询的 DB-API 游标
+    :param model: dataclass 类
+    :param trusted: 见 row_factory
+    :param size: 每批读取的行数，默认使用 cursor.arraysize
+    """
+    factory = row_factory(model, trusted)
+    size = size or getattr(cursor, "arraysize", 1) or 1
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        for row in rows:
+            yield factory(cursor, row)
+
+
+def _check_identifier(name):
+    if not _IDENTIFIER.match(name):
+        raise ValueError("invalid SQL identifier: {!r}".format(name))
+    return name
+
+
+def insert_sql(table, names, paramstyle="qmark"):
+    """
+    生成 INSERT 语句
+
+    :param table: 表名（只允许字母、数字、下划线，可带一个 schema 前缀）
+    :param names: 列名
+    :param paramstyle: 占位符风格，qmark（sqlite3）、format（psycopg2、MySQLdb）或 numeric
+    """
+    placeholder = _PLACEHOLDERS.get(paramstyle)
+    if placeholder is None:
+        raise ValueError("unsupported paramstyle: {!r}".format(paramstyle))
+    return "INSERT INTO {} ({}) VALUES ({})".format(
+        _check_identifier(table),
+        ", ".join(_check_identifier(name) for name in names),
+        ", ".join(placeholder(i) for i in range(len(names))),
+    )
+
+
+def insert_many(target, table, model, instances, names=None, paramstyle="qmark"):
+    """
+    批量插入实例
+
+    参数元组按字段顺序直接从实例提取（序列化规则同 to_dict()），逐个交给
+    ``executemany``，不会一次性生成全部参数。
+
+    :param target: DB-API 连接或游标（需提供 executemany）
+    :param table: 表名
+    :param model: dataclass 类
+    :param instances: 实例序列
+    :param names: 插入的字段及顺序，默认全部字段
+    :param paramstyle: 占位符风格，见 insert_sql
+    :return: executemany 的返回值
+    """
+    names = list(names or model.__dataclass_fields__)
+    sql = insert_sql(table, names, paramstyle)
+    return target.executemany(sql, iter_rows(model, instances, names))
@@ -4,10 +4,15 @@
 class ValidationError(Exception):
     """Validation error exception"""
 
-    def __init__(self, message, field_name=None, path=None):
+    def __init__(self, message, field_name=None, path=None, error_key=None):
         self.message = message
         self.field_name = field_name
         self.path = path or []
+        self.error_key = error_key
         super(ValidationError, self).__init__(
             ": ".join(self.path + [message]) if self.path else message
         )
+
+
+class FrozenInstanceError(AttributeError):
+    """Assignment to a frozen dataclass instance"""
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 import abc
+import array
 import re
 import sys
 import datetime
 import os
 import time
 from schema_dataclass.exceptions import ValidationError
+from schema_dataclass import profiling as _profiling
 
 # Python 2/3 兼容性
 if sys.version_info[0] >= 3:
@@ -14,6 +16,16 @@ if sys.version_info[0] >= 3:
 else:
     string_types = (str, unicode)
 
+
+def _import_numpy():
+    """按需导入 NumPy，未安装时返回 None"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
 class ValidationStrategy(object):
     __metaclass__ = abc.ABCMeta
     """验证策略基类"""
@@ -29,7 +41,7 @@ class RequiredValidationStrategy(ValidationStrategy):
         if value is None or (field.required and isinstance(value, string_types) and value == ""):
             if field.required:
                 error_msg = field.get_error_message("required")
-                raise ValidationError(error_msg)
+                raise ValidationError(error_msg, error_key="required")
             return field.get_default()
         return value
 
@@ -41,10 +53,10 @@ class LengthValidationStrategy(ValidationStrategy):
             length = len(value)
             if field.min_length is not None and length < field.min_length:
                 error_msg = field.get_error_message("min_length", min_length=field.min_length)
-                raise ValidationError(error_msg)
+                raise ValidationError(error_msg, error_key="min_length")
             if field.max_length is not None and length > field.max_length:
                 error_msg = field.get_error_message("max_length", max_length=field.max_length)
-                raise ValidationError(error_msg)
+                raise ValidationError(error_msg, error_key="max_length")
         return value
 
 
@@ -54,10 +66,10 @@ class RangeValidationStrategy(ValidationStrategy):
         if isinstance(value, (int, float)):
             if field.minvalue is not None and value < field.minvalue:
                 error_msg = field.get_error_message("minvalue", minvalue=field.minvalue)
-                raise ValidationError(error_msg)
+                raise ValidationError(error_msg, error_key="minvalue")
             if field.maxvalue is not None and value > field.maxvalue:
                 error_msg = field.get_error_message("maxvalue", maxvalue=field.maxvalue)
-                raise ValidationError(error_msg)
+                raise ValidationError(error_msg, error_key="maxvalue")
         return value
 
 
@@ -66,7 +78,7 @@ class ChoicesValidationStrategy(ValidationStrategy):
     def validate(self, value, field):
         if field.choices is not None and value not in field.choices:
             error_msg = field.get_error_message("choices", choices=field.choices)
-            raise ValidationError(error_msg)
+            raise ValidationError(error_msg, error_key="choices")
         return value
 
 
@@ -76,53 +88,153 @@ class RegexValidationStrategy(ValidationStrategy):
         if field.regex is not None and isinstance(value, string_types):
             if not re.match(field.regex, value):
                 error_msg = field.get_error_message("regex", regex=field.regex)
-                raise ValidationError(error_msg)
+                raise ValidationError(error_msg, error_key="regex")
         return value
 
 
 class ListItemsValidationStrategy(ValidationStrategy):
-    """列表项验证策略"""
+    """列表项验证策略
+
+    列表项的处理方式（dataclass / Field 实例 / 普通类型）按字段只判断一次并缓存在
+    字段上（item_type 被替换时重新判断），逐项循环内不再做类型分派。
+
+    没有元素被转换时直接返回传入的列表对象，只有元素被转换时才分配新列表。
+    """
     def validate(self, value, field):
         if not isinstance(value, list) or not field.item_type:
             error_msg = field.get_error_message("invalid_type", expected_type="list")
-            raise ValidationError(error_msg)
+            raise ValidationError(error_msg, error_key="invalid_type")
+        return self._item_loop(field)(value, field)
+
+    def _item_loop(self, field):
+        item_type = field.item_type
+        plan = field.__dict__.get("_item_plan")
+        if plan is None or plan[0] is not item_type:
+            if isinstance(item_type, type) and hasattr(item_type, "__dataclass_fields__"):
+                loop = self._dataclass_items
+            elif isinstance(item_type, Field):
+                loop = self._field_items
+            else:
+                loop = self._typed_items
+            plan = field._item_plan = (item_type, loop)
+        return plan[1]
+
+    def _invalid_item(self, field, index):
+        expected = getattr(field.item_type, "__name__", str(field.item_type))
+        error_msg = field.get_error_message(
+            "invalid_list_item", index=index, expected_type=expected
+        )
+        return ValidationError(
+            error_msg, field_name=field.name, error_key="invalid_list_item"
+        )
+
+    def _dataclass_items(self, value, field):
+        # 情况1: item_type 是 dataclass 类型，字典项构建为实例，已有实例直接接受
+        item_type = field.item_type
+        results = None
+        i = 0
+        try:
+            for i, item in enumerate(value):
+                if isinstance(item, dict):
+                    item = item_type(**item)
+                    if results is None:
+                        results = value[:i]
+                elif not isinstance(item, item_type):
+                    raise self._invalid_item(field, i)
+                if results is not None:
+                    results.append(item)
+        except ValidationError:
+            raise
+        except Exception:
+            raise self._invalid_item(field, i)
+        return value if results is None else results
+
+    def _field_items(self, value, field):
+        # 情况2: item_type 是 Field 实例，只有元素被转换时才复制列表
+        validate = field.item_type.validate
+        results = None
+        i = 0
+        try:
+            for i, item in enumerate(value):
+                validated = validate(item)
+                if results is None:
+                    if validated is item:
+                        continue
+                    results = value[:i]
+                results.append(validated)
+        except ValidationError:
+            raise
+        except Exception:
+            raise self._invalid_item(field, i)
+        return value if results is None else results
+
+    def _typed_items(self, value, field):
+        # 情况3: item_type 是普通类型（如 int, str）
+        item_type = field.item_type
+        try:
+            # 快速路径：按列表中出现的不同类型整体检查一次
+            if all(issubclass(t, item_type) for t in set(map(type, value))):
+                return value
+            for i, item in enumerate(value):
+                if not isinstance(item, item_type):
+                    raise self._invalid_item(field, i)
+        except ValidationError:
+            raise
+        except Exception:
+            raise self._invalid_item(field, 0)
+        return value
 
-        results = []
-        for i, item in enumerate(value):
-            try:
-                # 情况1: item_type 是 dataclass 类型
-                if (
-                    isinstance(field.item_type, type) and 
-                    hasattr(field.item_type, '__dataclass_fields__') and
-                    isinstance(item, dict)
-                ):
-                    results.append(field.item_type(**item))
-                    continue
-
-                # 情况2: item_type 是 Field 实例
-                if isinstance(field.item_type, Field):
-                    validated_item = field.item_type.validate(item)
-                    results.append(validated_item)
-                    continue
-
-                # 情况3: item_type 是普通类型（如 int, str）
-                if not isinstance(item, field.item_type):
-                    expected = getattr(field.item_type, "__name__", str(field.item_type))
-                    error_msg = field.get_error_message(
-                        "invalid_list_item", index=i, expected_type=expected
-                    )
-                    raise ValidationError(error_msg, field_name=field.name)
-                results.append(item)
 
-            except ValidationError:
-                raise
-            except Exception:
-                expected = getattr(field.item_type, "__name__", str(field.item_type))
-                error_msg = field.get_error_message(
-                    "invalid_list_item", index=i, expected_type=expected
-                )
-                raise ValidationError(error_msg, field_name=field.name)
-        return results
+class NumberArrayValidationStrategy(ValidationStrategy):
+    """数值数组验证策略：转换为紧凑数组后整体检查长度与元素范围"""
+    def validate(self, value, field):
+        if value is None:
+            return value
+        if isinstance(value, string_types + (dict,)) or not hasattr(value, "__len__"):
+            error_msg = field.get_error_message("invalid_type", expected_type="number array")
+            raise ValidationError(error_msg, error_key="invalid_type")
+
+        try:
+            if field.backend == "numpy":
+                value = field._to_ndarray(value)
+            elif not (isinstance(value, array.array) and value.typecode == field.typecode):
+                if hasattr(value, "tolist"):
+                    value = value.tolist()
+                value = array.array(field.typecode, value)
+        except (TypeError, ValueError, OverflowError) as e:
+            error_msg = field.get_error_message("invalid_type", expected_type="number array")
+            raise ValidationError("{0}: {1}".format(error_msg, str(e)), error_key="invalid_type")
+
+        length = len(value)
+        if field.min_length is not None and length < field.min_length:
+            error_msg = field.get_error_message("min_length", min_length=field.min_length)
+            raise ValidationError(error_msg, error_key="min_length")
+        if field.max_length is not None and length > field.max_length:
+            error_msg = field.get_error_message("max_length", max_length=field.max_length)
+            raise ValidationError(error_msg, error_key="max_length")
+
+        if length:
+            minvalue, maxvalue = field.item_bounds()
+            if minvalue is not None and _any_below(value, minvalue):
+                error_msg = field.get_error_message("minvalue", minvalue=minvalue)
+                raise ValidationError(error_msg, error_key="minvalue")
+            if maxvalue is not None and _any_above(value, maxvalue):
+                error_msg = field.get_error_message("maxvalue", maxvalue=maxvalue)
+                raise ValidationError(error_msg, error_key="maxvalue")
+        return value
+
+
+# 逐个元素与边界比较，而不是比较 min()/max()：含 NaN 时 min()/max() 的结果不可靠
+def _any_below(value, bound):
+    if hasattr(value, "any"):
+        return bool((value < bound).any())
+    return any(v < bound for v in value)
+
+
+def _any_above(value, bound):
+    if hasattr(value, "any"):
+        return bool((value > bound).any())
+    return any(v > bound for v in value)
 
 
 class DateValidationStrategy(ValidationStrategy):
@@ -137,7 +249,7 @@ class DateValidationStrategy(ValidationStrategy):
                 "min_date", 
                 min_date=field.min_date.strftime(field.output_format or "%Y-%m-%d")
             )
-            raise ValidationError(error_msg)
+            raise ValidationError(error_msg, error_key="min_date")
             
         # 检查最大日期
         if field.max_date is not None and value > field.max_date:
@@ -145,7 +257,7 @@ class DateValidationStrategy(ValidationStrategy):
                 "max_date", 
                 max_date=field.max_date.strftime(field.output_format or "%Y-%m-%d")
             )
-            raise ValidationError(error_msg)
+            raise ValidationError(error_msg, error_key="max_date")
             
         return value
 
@@ -162,7 +274,7 @@ class DateTimeValidationStrategy(ValidationStrategy):
                 "min_datetime", 
                 min_datetime=field.min_datetime.strftime(field.output_format or "%Y-%m-%d %H:%M:%S")
             )
-            raise ValidationError(error_msg)
+            raise ValidationError(error_msg, error_key="min_datetime")
             
         # 检查最大日期时间
         if field.max_datetime is not None and value > field.max_datetime:
@@ -170,7 +282,7 @@ class DateTimeValidationStrategy(ValidationStrategy):
                 "max_datetime", 
                 max_datetime=field.max_datetime.strftime(field.output_format or "%Y-%m-%d %H:%M:%S")
             )
-            raise ValidationError(error_msg)
+            raise ValidationError(error_msg, error_key="max_datetime")
             
         return value
 
@@ -280,14 +392,21 @@ class Field(object):
 
     def validate(self, value):
         """执行所有验证策略"""
+        profiler = _profiling.active
         for strategy in self.validation_strategies:
             try:
-                value = strategy.validate(value, self)
+                if profiler is None:
+                    value = strategy.validate(value, self)
+                else:
+                    value = profiler.call(
+                        _profiling.current_model(), self.name,
+                        type(strategy).__name__, strategy.validate, value, self
+                    )
             except ValidationError:
                 raise
             except Exception as e:
                 error_msg = self.get_error_message("invalid_type", expected_type=self.__class__.__name__)
-                raise ValidationError("{0}: {1}".format(error_msg, str(e)))
+                raise ValidationError("{0}: {1}".format(error_msg, str(e)), error_key="invalid_type")
         return value
 
 
@@ -303,7 +422,7 @@ class StringField(Field):
         # 先执行自己的类型检查
         if value is not None and not isinstance(value, string_types):
             error_msg = self.get_error_message("invalid_type", expected_type="string")
-            raise ValidationError(error_msg)
+            raise ValidationError(error_msg, error_key="invalid_type")
             
         # 再调用父类验证
         return Field.validate(self, value)
@@ -330,12 +449,91 @@ class NumberField(Field):
             value, (int, float, long if sys.version_info[0] < 3 else int)
         ):
             error_msg = self.get_error_message("invalid_type", expected_type="number")
-            raise ValidationError(error_msg)
+            raise ValidationError(error_msg, error_key="invalid_type")
             
         # 再调用父类验证
         return Field.validate(self, value)
 
 
+class NumberArrayField(Field):
+    """
+    数值数组字段
+
+    输入的数字列表校验后以 array.array（或 NumPy 数组）紧凑存储，
+    元素范围（minvalue/maxvalue）在转换后整体检查一次。
+    """
+    DEFAULT_VALIDATION_STRATEGIES = Field.DEFAULT_VALIDATION_STRATEGIES + [
+        NumberArrayValidationStrategy()
+    ]
+    TYPECODES = "bBhHiIlLqQfd"
+    OUTPUTS = ("list", "buffer", "bytes")
+
+    def __init__(self, typecode="d", backend="array", output="list", **kwargs):
+        """
+        :param typecode: array 模块的类型码，如 "d"（float64）、"q"（int64）
+        :param backend: 存储方式，"array" 或 "numpy"（需要安装 NumPy）
+        :param output: to_dict() 输出形式，"list"、"buffer"（数组对象本身）或 "bytes"
+        :param minvalue: 元素最小值，未指定时使用 item_type（NumberField）的 minvalue
+        :param maxvalue: 元素最大值，未指定时使用 item_type（NumberField）的 maxvalue
+        """
+        super(NumberArrayField, self).__init__(**kwargs)
+        if typecode not in self.TYPECODES:
+            raise ValueError("unsupported typecode: {0!r}".format(typecode))
+        if output not in self.OUTPUTS:
+            raise ValueError("output must be one of: {0}".format(", ".join(self.OUTPUTS)))
+        if backend == "numpy":
+            self._numpy = _import_numpy()
+            if self._numpy is None:
+                raise ImportError("NumberArrayField(backend='numpy') requires numpy")
+        elif backend != "array":
+            raise ValueError("backend must be 'array' or 'numpy'")
+        self.typecode = typecode
+        self.backend = backend
+        self.output = output
+
+    def item_bounds(self):
+        """元素取值范围 (minvalue, maxvalue)"""
+        minvalue, maxvalue = self.minvalue, self.maxvalue
+        if isinstance(self.item_type, NumberField):
+            if minvalue is None:
+                minvalue = self.item_type.minvalue
+            if maxvalue is None:
+                maxvalue = self.item_type.maxvalue
+        return minvalue, maxvalue
+
+    def _to_ndarray(self, value):
+        numpy = self._numpy
+        dtype = numpy.dtype(self.typecode)
+        result = numpy.asarray(value)
+        if result.ndim != 1 or result.dtype.kind not in "biuf":
+            raise TypeError("expected a one-dimensional sequence of numbers")
+        if not numpy.can_cast(result.dtype, dtype, casting="same_kind"):
+            raise TypeError("cannot store {0} values as {1}".format(result.dtype, dtype))
+        if dtype.kind in "iu" and result.size and result.dtype != dtype:
+            info = numpy.iinfo(dtype)
+            if result.min() < info.min or result.max() > info.max:
+                raise OverflowError("value out of range for {0}".format(dtype))
+        return result.astype(dtype, copy=False)
+
+    def equals(self, value, other):
+        """比较两个字段值（NumPy 数组的 == 逐元素比较，不能直接用于 __eq__）"""
+        if value is None or other is None:
+            return value is other
+        if self.backend == "numpy":
+            return bool(self._numpy.array_equal(value, other))
+        if type(value) is type(other):
+            return value == other
+        return list(value) == list(other)
+
+    def serialize(self, value):
+        """按 output 参数转换 to_dict() 输出"""
+        if value is None or self.output == "buffer":
+            return value
+        if self.output == "bytes":
+            return value.tobytes() if hasattr(value, "tobytes") else value.tostring()
+        return value.tolist()
+
+
 class DateField(Field):
     """日期字段"""
     DEFAULT_VALIDATION_STRATEGIES = Field.DEFAULT_VALIDATION_STRATEGIES + [
@@ -381,7 +579,7 @@ class DateField(Field):
                 value = dt.date()
             except (ValueError, TypeError) as e:
                 error_msg = self.get_error_message("invalid_type", expected_type="date")
-                raise ValidationError("{0}: {1}".format(error_msg, str(e)))
+                raise ValidationError("{0}: {1}".format(error_msg, str(e)), error_key="invalid_type")
         
         # 处理字符串输入
         if isinstance(value, string_types):
@@ -412,7 +610,7 @@ class DateField(Field):
                         raise ValueError("Invalid date format")
             except (ValueError, TypeError) as e:
                 error_msg = self.get_error_message("invalid_type", expected_type="date")
-                raise ValidationError("{0}: {1}".format(error_msg, str(e)))
+                raise ValidationError("{0}: {1}".format(error_msg, str(e)), error_key="invalid_type")
 
         # 处理datetime对象
         elif isinstance(value, datetime.datetime):
@@ -421,7 +619,7 @@ class DateField(Field):
         # 检查是否为date对象
         elif not isinstance(value, datetime.date) and value is not None:
             error_msg = self.get_error_message("invalid_type", expected_type="date")
-            raise ValidationError(error_msg)
+            raise ValidationError(error_msg, error_key="invalid_type")
 
         # 根据参数决定返回格式
         if value is not None and self.return_timestamp:
@@ -485,7 +683,7 @@ class DateTimeField(Field):
                 return datetime.datetime.fromtimestamp(value)
             except (ValueError, TypeError) as e:
                 error_msg = self.get_error_message("invalid_type", expected_type="datetime")
-                raise ValidationError("{0}: {1}".format(error_msg, str(e)))
+                raise ValidationError("{0}: {1}".format(error_msg, str(e)), error_key="invalid_type")
         
         # 处理字符串输入
         if isinstance(value, string_types):
@@ -509,12 +707,12 @@ class DateTimeField(Field):
                         raise ValueError("Invalid datetime format")
             except (ValueError, TypeError) as e:
                 error_msg = self.get_error_message("invalid_type", expected_type="datetime")
-                raise ValidationError("{0}: {1}".format(error_msg, str(e)))
+                raise ValidationError("{0}: {1}".format(error_msg, str(e)), error_key="invalid_type")
 
         # 检查是否为datetime对象
         elif not isinstance(value, datetime.datetime) and value is not None:
             error_msg = self.get_error_message("invalid_type", expected_type="datetime")
-            raise ValidationError(error_msg)
+            raise ValidationError(error_msg, error_key="invalid_type")
 
         # 再调用父类验证
         result = Field.validate(self, value)
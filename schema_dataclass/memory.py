@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+实例内存占用基准工具
+
+基于 tracemalloc 统计批量构建 dataclass 实例时每个实例占用的字节数，
+并拆分为容器开销（实例对象本身、``__dict__``、``__dataclass_values__`` 等内部容器）
+与字段值开销两部分，便于在不同库版本、不同构建方式之间对比。
+"""
+import gc
+import sys
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+
+def _default_builder(cls, kwargs):
+    return cls(**kwargs)
+
+
+def _container_sizes(instance):
+    """统计单个实例的容器开销（不含字段值本身）"""
+    sizes = {"object": sys.getsizeof(instance)}
+    instance_dict = getattr(instance, "__dict__", None)
+    if instance_dict is not None:
+        sizes["__dict__"] = sys.getsizeof(instance_dict)
+        # 内部状态容器（如 __dataclass_values__）都挂在实例 __dict__ 上
+        for k, v in instance_dict.items():
+            if k.startswith("__dataclass") and isinstance(v, (dict, set, list)):
+                sizes[k] = sys.getsizeof(v)
+    return sizes
+
+
+def measure_memory(cls, factory, count=1000, builder=None, label=None):
+    """
+    统计 ``count`` 个实例的平均内存占用
+
+    输入数据在开始追踪前全部生成，因此只统计构建实例时新分配的内存：
+    与输入共享的值（如同一个字符串对象）不会计入字段值开销。
+
+    :param cls: dataclass 类
+    :param factory: 输入数据，可为字典（所有实例共用）或 ``factory(i) -> dict`` 的可调用对象
+    :param count: 构建的实例数量
+    :param builder: 构建方式 ``builder(cls, kwargs) -> instance``，默认 ``cls(**kwargs)``
+    :param label: 报告标签，用于区分不同构建方式
+    :return: 可 JSON 序列化的报告字典
+    """
+    if tracemalloc is None:
+        raise RuntimeError("tracemalloc is not available on this Python version")
+    if count <= 0:
+        raise ValueError("count must be a positive integer")
+
+    builder = builder or _default_builder
+    if callable(factory):
+        inputs = [factory(i) for i in range(count)]
+    else:
+        inputs = [dict(factory) for _ in range(count)]
+
+    instances = [None] * count
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        for i, kwargs in enumerate(inputs):
+            instances[i] = builder(cls, kwargs)
+        gc.collect()
+        total = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+    breakdown = {}
+    for instance in instances:
+        for k, size in _container_sizes(instance).items():
+            breakdown[k] = breakdown.get(k, 0) + size
+    container_total = sum(breakdown.values())
+
+    from schema_dataclass import __version__
+
+    return {
+        "model": cls.__name__,
+        "label": label or "default",
+        "version": __version__,
+        "python": "{}.{}.{}".format(*sys.version_info[:3]),
+        "count": count,
+        "total_bytes": total,
+        "bytes_per_instance": float(total) / count,
+        "container_bytes_per_instance": float(container_total) / count,
+        "value_bytes_per_instance": float(max(total - container_total, 0)) / count,
+        "breakdown": dict((k, float(v) / count) for k, v in breakdown.items()),
+    }
+
+
+def format_memory_report(*reports):
+    """
+    将一个或多个报告格式化为文本表格
+
+    :param reports: ``measure_memory`` 返回的报告
+    :return: 文本表格
+    """
+    header = ("model", "label", "version", "count", "bytes/inst", "container", "values")
+    rows = [header]
+    for report in reports:
+        rows.append((
+            report["model"],
+            report["label"],
+            report["version"],
+            str(report["count"]),
+            "{:.1f}".format(report["bytes_per_instance"]),
+            "{:.1f}".format(report["container_bytes_per_instance"]),
+            "{:.1f}".format(report["value_bytes_per_instance"]),
+        ))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = []
+    for n, row in enumerate(rows):
+        lines.append("  ".join(cell.ljust(widths[i]) for i, cell in enumerate(row)).rstrip())
+        if n == 0:
+            lines.append("  ".join("-" * w for w in widths))
+    return "\n".join(lines)
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+校验指标计数
+
+按模型、字段与错误键（``min_length``、``regex``、``invalid_list_item`` 等）
+统计校验次数与失败次数，供生产环境的监控系统定期采集。
+
+计数写入每个线程私有的分片，热路径上不加锁；只有 ``snapshot()`` / ``reset()``
+以及线程首次计数时才需要获取锁。
+
+示例::
+
+    from schema_dataclass.metrics import enable_metrics
+
+    metrics = enable_metrics()
+    ...
+    print(metrics.snapshot())
+"""
+import threading
+
+# 当前启用的指标注册表，None 表示关闭
+active = None
+
+# 校验函数抛出的 ValidationError 未指定 error_key 时使用的错误键
+CUSTOM_ERROR_KEY = "custom"
+
+
+class ValidationMetrics(object):
+    """线程安全的校验计数注册表"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def record_instance(self, model, failed=False):
+        """记录一次实例构建"""
+        shard = self._shard()
+        key = ("records", model, failed)
+        shard[key] = shard.get(key, 0) + 1
+
+    def record_field(self, model, field, error_key=None, failed=False):
+        """记录一次字段校验，失败时同时记录错误键"""
+        shard = self._shard()
+        key = ("fields", model, field, failed)
+        shard[key] = shard.get(key, 0) + 1
+        if failed:
+            key = ("errors", model, field, error_key or CUSTOM_ERROR_KEY)
+            shard[key] = shard.get(key, 0) + 1
+
+    def _merged(self):
+        with self._lock:
+            shards = list(self._shards)
+        merged = {}
+        for shard in shards:
+            for key, count in shard.copy().items():
+                merged[key] = merged.get(key, 0) + count
+        return merged
+
+    def snapshot(self):
+        """
+        返回当前计数快照::
+
+            {
+                "records": {model: {"validated": n, "failed": n}},
+                "fields": {model: {field: {"validated": n, "failed": n, "errors": {key: n}}}},
+            }
+        """
+        records = {}
+        fields = {}
+        for key, count in self._merged().items():
+            if key[0] == "records":
+                stat = records.setdefault(key[1], {"validated": 0, "failed": 0})
+                stat["validated"] += count
+                if key[2]:
+                    stat["failed"] += count
+                continue
+            stat = fields.setdefault(key[1], {}).setdefault(
+                key[2], {"validated": 0, "failed": 0, "errors": {}}
+            )
+            if key[0] == "errors":
+                stat["errors"][key[3]] = count
+            else:
+                stat["validated"] += count
+                if key[3]:
+                    stat["failed"] += count
+        return {"records": records, "fields": fields}
+
+    def reset(self):
+        """清空计数；与其它线程并发写入的少量计数可能丢失"""
+        with self._lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+def enable_metrics(metrics=None):
+    """启用校验计数，返回正在使用的注册表"""
+    global active
+    active = metrics or ValidationMetrics()
+    return active
+
+
+def disable_metrics():
+    """关闭校验计数，返回之前使用的注册表"""
+    global active
+    metrics, active = active, None
+    return metrics
+
+
+def get_metrics():
+    """获取当前启用的注册表，未启用时返回 None"""
+    return active
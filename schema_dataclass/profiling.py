@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+校验性能分析
+
+按 (模型, 字段, 验证策略/@validate 函数) 统计调用次数、累计耗时与失败次数。
+默认关闭；关闭时字段校验路径上只多一次模块属性判断。
+
+示例::
+
+    from schema_dataclass.profiling import profile_validation
+
+    with profile_validation() as profiler:
+        User(name="Alice", age=20)
+    print(profiler.format_table())
+"""
+import contextlib
+import threading
+import time
+
+# 当前启用的分析器，None 表示关闭
+active = None
+
+_timer = getattr(time, "perf_counter", time.time)
+_context = threading.local()
+
+
+class ValidationProfiler(object):
+    """校验耗时统计器"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def call(self, model, field, target, func, *args):
+        """调用 func 并记录耗时；func 抛出的异常计为失败并原样抛出"""
+        start = _timer()
+        failed = True
+        try:
+            result = func(*args)
+            failed = False
+            return result
+        finally:
+            self.record(model, field, target, _timer() - start, failed)
+
+    def record(self, model, field, target, elapsed, failed=False):
+        """记录一次调用"""
+        key = (model, field, target)
+        with self._lock:
+            stat = self._stats.get(key)
+            if stat is None:
+                stat = self._stats[key] = [0, 0.0, 0]
+            stat[0] += 1
+            stat[1] += elapsed
+            if failed:
+                stat[2] += 1
+
+    def reset(self):
+        """清空统计数据"""
+        with self._lock:
+            self._stats.clear()
+
+    def rows(self):
+        """以列表形式返回统计数据，按累计耗时降序"""
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._stats.items()]
+        rows = [
+            {
+                "model": model,
+                "field": field,
+                "target": target,
+                "calls": calls,
+                "total_time": total,
+                "failures": failures,
+            }
+            for (model, field, target), (calls, total, failures) in items
+        ]
+        rows.sort(key=lambda row: row["total_time"], reverse=True)
+        return rows
+
+    def as_dict(self):
+        """以 {model: {field: {target: stats}}} 形式导出统计数据"""
+        result = {}
+        for row in self.rows():
+            targets = result.setdefault(row["model"], {}).setdefault(row["field"], {})
+            targets[row["target"]] = {
+                "calls": row["calls"],
+                "total_time": row["total_time"],
+                "failures": row["failures"],
+            }
+        return result
+
+    def format_table(self, limit=None):
+        """
+        格式化为文本表格
+
+        :param limit: 只显示耗时最多的前 limit 行
+        :return: 文本表格
+        """
+        header = ("model", "field", "target", "calls", "total_ms", "avg_us", "failures")
+        rows = [header]
+        for row in self.rows()[:limit]:
+            rows.append((
+                str(row["model"]),
+                str(row["field"]),
+                str(row["target"]),
+                str(row["calls"]),
+                "{:.3f}".format(row["total_time"] * 1e3),
+                "{:.2f}".format(row["total_time"] * 1e6 / row["calls"]),
+                str(row["failures"]),
+            ))
+        widths = [max(len(r[i]) for r in rows) for i in range(len(header))]
+        lines = []
+        for n, r in enumerate(rows):
+            lines.append("  ".join(cell.ljust(widths[i]) for i, cell in enumerate(r)).rstrip())
+            if n == 0:
+                lines.append("  ".join("-" * w for w in widths))
+        return "\n".join(lines)
+
+
+def enable_profiling(profiler=None):
+    """启用校验分析，返回正在使用的分析器"""
+    global active
+    active = profiler or ValidationProfiler()
+    return active
+
+
+def disable_profiling():
+    """关闭校验分析，返回之前使用的分析器"""
+    global active
+    profiler, active = active, None
+    return profiler
+
+
+def get_profiler():
+    """获取当前启用的分析器，未启用时返回 None"""
+    return active
+
+
+@contextlib.contextmanager
+def profile_validation(profiler=None):
+    """在 with 块内启用校验分析"""
+    previous = active
+    profiler = enable_profiling(profiler)
+    try:
+        yield profiler
+    finally:
+        if previous is None:
+            disable_profiling()
+        else:
+            enable_profiling(previous)
+
+
+def current_model():
+    """当前线程正在校验的模型名"""
+    return getattr(_context, "model", None)
+
+
+def set_current_model(model):
+    """设置当前线程正在校验的模型名，返回之前的值"""
+    previous = getattr(_context, "model", None)
+    _context.model = model
+    return previous
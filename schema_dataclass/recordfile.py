@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+内存映射的定长记录文件
+
+``write_records`` 用 ``RecordCodec`` 把实例写成首尾相接的定长记录；
+``RecordFile`` 以只读方式 mmap 该文件，支持 len()、下标和切片访问，
+返回按需解码字段的只读视图，不会把文件读入内存。
+
+示例::
+
+    from schema_dataclass.recordfile import RecordFile, write_records
+
+    write_records("readings.bin", Reading, readings)
+
+    with RecordFile("readings.bin", Reading) as records:
+        print(len(records), records[123456].value)
+        for reading in records[-10:]:
+            ...
+
+文件不含头部信息，读取时必须使用与写入时相同的模型（及 byteorder、encoding）。
+关闭文件后，从中得到的视图和切片都不能再读取。
+"""
+import itertools
+import mmap
+import os
+
+from schema_dataclass.codec import RecordCodec, RecordSequence
+
+# write_records 每次编码写出的实例数
+WRITE_CHUNK_SIZE = 4096
+
+
+def write_records(path, model, instances, append=False, **codec_options):
+    """
+    把实例写成定长记录文件
+
+    :param path: 文件路径
+    :param model: dataclass 类
+    :param instances: 实例的可迭代对象，分块编码写出
+    :param append: 为 True 时追加到已有文件末尾
+    :param codec_options: 传给 RecordCodec 的参数（byteorder、encoding）
+    :return: 写出的记录数
+    """
+    codec = RecordCodec(model, **codec_options)
+    iterator = iter(instances)
+    count = 0
+    with open(path, "ab" if append else "wb") as f:
+        while True:
+            chunk = list(itertools.islice(iterator, WRITE_CHUNK_SIZE))
+            if not chunk:
+                return count
+            f.write(codec.encode_many(chunk))
+            count += len(chunk)
+
+
+class RecordFile(RecordSequence):
+    """只读 mmap 的定长记录文件，可作为上下文管理器使用"""
+
+    def __init__(self, path, model, **codec_options):
+        """
+        :param path: write_records 写出的文件
+        :param model: dataclass 类
+        :param codec_options: 传给 RecordCodec 的参数（byteorder、encoding）
+        """
+        codec = RecordCodec(model, **codec_options)
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = None
+        try:
+            # 空文件不能 mmap
+            if os.fstat(self._file.fileno()).st_size:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            super(RecordFile, self).__init__(codec, self._mmap if self._mmap is not None else b"")
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def close(self):
+        """关闭映射与文件"""
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __repr__(self):
+        return "<{} {!r} of {} ({} records)>".format(
+            type(self).__name__, self.path, self.model.__name__, len(self))
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+共享内存中的实例批次（需要 Python 3.8+ 的 multiprocessing.shared_memory）
+
+``SharedRecordBatch.create`` 用 ``RecordCodec`` 把一批实例编码到一块共享内存；
+批次（及其切片）pickle 时只传递共享内存名称、模型和记录下标，工作进程中
+反序列化后直接映射同一块内存，返回按需解码字段的只读视图，不复制、不重新校验。
+
+示例::
+
+    from multiprocessing import Pool
+    from schema_dataclass.sharedbatch import SharedRecordBatch
+
+    def total(batch):
+        return sum(reading.value for reading in batch)
+
+    with SharedRecordBatch.create(Reading, readings) as batch:
+        with Pool(4) as pool:
+            parts = pool.map(total, [batch[i:i + 1000] for i in range(0, len(batch), 1000)])
+
+模型需定义在模块顶层（可被 pickle 按名称导入）。创建者负责 ``unlink()``
+（使用 with 语句时自动执行）。工作进程中的批次不需要显式关闭，最后一个引用
+（包括从中得到的视图）消失时自动释放映射；显式 ``close()`` 后从该批次得到的
+视图都不能再读取。
+"""
+import weakref
+
+from schema_dataclass.codec import RecordCodec, RecordSequence
+
+
+def _shared_memory():
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        raise ImportError("SharedRecordBatch requires multiprocessing.shared_memory (Python 3.8+)")
+    return shared_memory
+
+
+def _attach_memory(name):
+    shared_memory = _shared_memory()
+    try:
+        # 只附加的进程不登记到 resource_tracker，避免退出时误删或告警（Python 3.13+）
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _attach(name, model, count, codec_options, indexes):
+    batch = SharedRecordBatch.attach(name, model, count, **codec_options)
+    return SharedRecordBatch(batch._segment, batch.codec, count, indexes)
+
+
+def _release(buf, data, shm):
+    data.release()
+    buf.release()
+    shm.close()
+
+
+class _Segment(object):
+    """
+    共享内存块及其只读缓冲区，由批次、切片和视图共用
+
+    最后一个引用消失时（或进程退出时）自动释放缓冲区并关闭映射；必须先于
+    SharedMemory.__del__ 释放缓冲区，否则关闭映射时会报告 BufferError。
+    """
+
+    def __init__(self, shm, size, owner):
+        self.shm = shm
+        self.owner = owner
+        buf = shm.buf[:size]
+        self.data = buf.toreadonly()
+        self._finalizer = weakref.finalize(self, _release, buf, self.data, shm)
+
+    def close(self):
+        self._finalizer()
+
+
+class SharedRecordBatch(RecordSequence):
+    """
+    共享内存中的定长记录批次
+
+    通过 create() 或 attach() 创建；下标访问返回只读视图，切片返回共享同一内存的批次。
+    """
+
+    def __init__(self, segment, codec, count, indexes=None):
+        self._segment = segment
+        self._count = count
+        super(SharedRecordBatch, self).__init__(codec, segment.data, indexes, owner=segment)
+
+    @classmethod
+    def create(cls, model, instances, name=None, **codec_options):
+        """
+        把实例编码到新建的共享内存中
+
+        :param model: dataclass 类（需定义在模块顶层）
+        :param instances: 实例序列
+        :param name: 共享内存名称，默认自动生成
+        :param codec_options: 传给 RecordCodec 的参数（byteorder、encoding）
+        """
+        codec = RecordCodec(model, **codec_options)
+        if not isinstance(instances, (list, tuple)):
+            instances = list(instances)
+        size = codec.size * len(instances)
+        # 共享内存大小不能为 0
+        shm = _shared_memory().SharedMemory(name=name, create=True, size=max(size, 1))
+        try:
+            codec.encode_into(shm.buf, instances)
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+        return cls(_Segment(shm, size, owner=True), codec, len(instances))
+
+    @classmethod
+    def attach(cls, name, model, count, **codec_options):
+        """
+        附加到已存在的共享内存批次
+
+        :param name: 共享内存名称（见 name 属性）
+        :param model: 创建时使用的 dataclass 类
+        :param count: 记录数（共享内存大小可能按页向上取整，不能从大小推算）
+        :param codec_options: 创建时使用的 RecordCodec 参数
+        """
+        codec = RecordCodec(model, **codec_options)
+        shm = _attach_memory(name)
+        size = codec.size * count
+        if shm.size < size:
+            shm.close()
+            raise ValueError("shared memory '{}' is smaller than {} records".format(name, count))
+        return cls(_Segment(shm, size, owner=False), codec, count)
+
+    @property
+    def name(self):
+        """共享内存名称"""
+        return self._segment.shm.name
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return SharedRecordBatch(self._segment, self.codec, self._count, self._indexes[index])
+        return super(SharedRecordBatch, self).__getitem__(index)
+
+    def __reduce__(self):
+        codec_options = {"byteorder": self.codec.byteorder, "encoding": self.codec.encoding}
+        return _attach, (self.name, self.model, self._count, codec_options, self._indexes)
+
+    def close(self):
+        """关闭当前进程对共享内存的映射（批次的所有切片同时失效）"""
+        self._segment.close()
+
+    def unlink(self):
+        """释放共享内存，由创建者在所有进程用完后调用"""
+        self._segment.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if self._segment.owner:
+            self.unlink()
+
+    def __repr__(self):
+        return "<{} {!r} of {} ({} records)>".format(
+            type(self).__name__, self.name, self.model.__name__, len(self))
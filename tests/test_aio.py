@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+异步校验测试
+"""
+
+import asyncio
+
+import pytest
+from schema_dataclass import (
+    StringField,
+    NumberField,
+    ValidationError,
+    dataclass,
+    validate,
+)
+
+
+@pytest.fixture
+def account_class():
+    taken = {"root", "admin"}
+    calls = []
+
+    @dataclass
+    class Account(object):
+        username = StringField(min_length=2, required=True)
+        email = StringField()
+        age = NumberField(minvalue=0)
+
+        @validate("username")
+        async def check_unique(self, username):
+            calls.append(username)
+            await asyncio.sleep(0)
+            if username in taken:
+                raise ValidationError("already taken")
+
+        @validate("email")
+        async def check_email(self, email):
+            await asyncio.sleep(0)
+            if email is not None and email.endswith("@blocked.com"):
+                raise ValidationError("domain blocked")
+
+        @validate("age")
+        def check_age(self, age):
+            if age == 13:
+                raise ValidationError("unlucky")
+
+    Account.calls = calls
+    return Account
+
+
+class TestAsyncValidators:
+    """async 校验函数测试"""
+
+    def test_sync_path_skips_async_validators(self, account_class):
+        account = account_class(username="root")
+        assert account.username == "root"
+        assert account_class.calls == []
+        assert "username" not in account_class._dataclass_validators
+        assert "age" in account_class._dataclass_validators
+
+    def test_acreate(self, account_class):
+        account = asyncio.run(account_class.acreate(username="alice", age=20))
+        assert account.username == "alice"
+        assert account_class.calls == ["alice"]
+
+    def test_acreate_async_failure(self, account_class):
+        with pytest.raises(ValidationError) as exc_info:
+            asyncio.run(account_class.acreate(username="admin"))
+        assert exc_info.value.path == ["username"]
+        assert "already taken" in str(exc_info.value)
+
+    def test_acreate_sync_failure(self, account_class):
+        with pytest.raises(ValidationError):
+            asyncio.run(account_class.acreate(username="alice", age=13))
+        assert account_class.calls == []
+
+    def test_avalidate_selected_fields(self, account_class):
+        account = account_class(username="root", email="a@blocked.com")
+        with pytest.raises(ValidationError) as exc_info:
+            asyncio.run(account.avalidate("email"))
+        assert exc_info.value.path == ["email"]
+        assert account_class.calls == []
+
+    def test_acreate_many(self, account_class):
+        records = [{"username": "user%d" % i} for i in range(20)]
+        accounts = asyncio.run(account_class.acreate_many(records, concurrency=3))
+        assert [a.username for a in accounts] == ["user%d" % i for i in range(20)]
+
+    def test_acreate_many_collects_errors(self, account_class):
+        records = [{"username": "alice"}, {"username": "root"}, {"username": "x"}]
+        results = asyncio.run(
+            account_class.acreate_many(records, return_exceptions=True)
+        )
+        assert results[0].username == "alice"
+        assert isinstance(results[1], ValidationError)
+        assert isinstance(results[2], ValidationError)
+
+        with pytest.raises(ValidationError):
+            asyncio.run(account_class.acreate_many(records))
+
+    def test_nested_async_validators(self, account_class):
+        from schema_dataclass import ListField
+
+        @dataclass
+        class Team(object):
+            name = StringField()
+            owner = account_class
+            members = ListField(item_type=account_class)
+
+        team = asyncio.run(Team.acreate(
+            name="core", owner={"username": "alice"}, members=[{"username": "bob"}]
+        ))
+        assert team.owner.username == "alice"
+        assert sorted(account_class.calls) == ["alice", "bob"]
+
+        with pytest.raises(ValidationError) as exc_info:
+            asyncio.run(Team.acreate(owner={"username": "root"}, members=[]))
+        assert exc_info.value.path == ["owner", "username"]
+
+        with pytest.raises(ValidationError) as exc_info:
+            asyncio.run(Team.acreate(
+                owner={"username": "alice"},
+                members=[{"username": "bob"}, {"username": "admin"}],
+            ))
+        assert exc_info.value.path == ["members", "1", "username"]
+
+        team = Team(owner={"username": "alice"}, members=[{"username": "root"}])
+        asyncio.run(team.avalidate("owner"))
+        with pytest.raises(ValidationError):
+            asyncio.run(team.avalidate("members"))
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+批量（按列）校验测试
+"""
+
+import pytest
+from schema_dataclass import (
+    StringField,
+    NumberField,
+    ValidationError,
+    dataclass,
+    validate,
+)
+from schema_dataclass.batch import check_column, validate_batch
+from schema_dataclass.metrics import enable_metrics, disable_metrics
+
+
+@pytest.fixture
+def reading_class():
+    @dataclass
+    class Reading(object):
+        sensor = StringField(required=True, min_length=2, max_length=8)
+        status = StringField(choices=["ok", "fault"], default="ok")
+        value = NumberField(minvalue=0, maxvalue=100)
+        level = NumberField(choices=[1, 2, 3], default=1)
+
+        @validate("sensor")
+        def check_sensor(self, value):
+            if value == "xx":
+                raise ValidationError("sensor retired")
+
+    return Reading
+
+
+@pytest.fixture(params=[False, None], ids=["python", "auto"])
+def use_numpy(request):
+    return request.param
+
+
+class TestCheckColumn:
+    """check_column 测试"""
+
+    @pytest.mark.unit
+    def test_number_column(self, use_numpy):
+        field = NumberField(minvalue=0, maxvalue=10, choices=[0, 5, 10, 20, -1])
+        errors = check_column(field, [5, -1, None, "x", 20, 10.0, 3], use_numpy)
+        assert sorted(errors) == [1, 4, 6]
+        assert errors[1].error_key == "minvalue"
+        assert errors[4].error_key == "maxvalue"
+        assert errors[6].error_key == "choices"
+        assert str(errors[1]) == "Value must be at least 0"
+
+    @pytest.mark.unit
+    def test_string_column(self):
+        field = StringField(min_length=2, max_length=3, choices=["ab", "abc", "abcd"])
+        errors = check_column(field, ["ab", "a", "abcd", "zz", None, 5])
+        assert dict((i, e.error_key) for i, e in errors.items()) == {
+            1: "min_length", 2: "max_length", 3: "choices",
+        }
+
+    @pytest.mark.unit
+    def test_numpy_column(self):
+        pytest.importorskip("numpy")
+        field = NumberField(minvalue=0, choices=[1, 2])
+        errors = check_column(field, [1, 2, -1, 3, None, 2 ** 70], use_numpy=True)
+        assert dict((i, e.error_key) for i, e in errors.items()) == {
+            2: "minvalue", 3: "choices", 5: "choices",
+        }
+
+
+class TestValidateBatch:
+    """validate_batch 测试"""
+
+    @pytest.mark.unit
+    def test_valid_batch(self, reading_class, use_numpy):
+        records = [{"sensor": "t{}".format(i), "value": i} for i in range(50)]
+        instances, errors = validate_batch(reading_class, records, use_numpy=use_numpy)
+        assert errors == {}
+        assert all(type(x) is reading_class for x in instances)
+        assert instances[7].to_dict() == {"sensor": "t7", "status": "ok", "value": 7, "level": 1}
+
+    @pytest.mark.unit
+    def test_errors_map_to_record_index(self, reading_class, use_numpy):
+        records = [
+            {"sensor": "ok1", "value": 1},
+            {"sensor": "ok2", "value": 101},
+            {"sensor": "ok3", "value": 1, "status": "bad"},
+            {"value": 1},
+            {"sensor": "xx", "value": 1},
+            {"sensor": "ok4", "value": "1"},
+            {"sensor": "ok5", "level": 7},
+            {"sensor": "ok6", "value": 2},
+        ]
+        instances, errors = validate_batch(reading_class, records, use_numpy=use_numpy)
+        assert sorted(errors) == [1, 2, 3, 4, 5, 6]
+        assert instances[0].sensor == "ok1"
+        assert instances[7].value == 2
+        assert all(instances[i] is None for i in errors)
+
+        assert errors[1].error_key == "maxvalue"
+        assert errors[1].path == ["value"]
+        assert errors[2].error_key == "choices"
+        assert errors[3].error_key == "required"
+        assert "sensor retired" in str(errors[4])
+        assert errors[5].error_key == "invalid_type"
+        assert errors[6].error_key == "choices"
+
+    @pytest.mark.unit
+    def test_nan_values(self, reading_class, use_numpy):
+        nan = float("nan")
+        records = [
+            {"sensor": "ab", "level": nan},
+            {"sensor": "ab", "value": nan},
+            {"sensor": "ab", "level": 2, "value": None},
+            {"sensor": "ab", "value": -1, "level": nan},
+        ]
+        instances, errors = validate_batch(reading_class, records, use_numpy=use_numpy)
+        assert dict((i, e.error_key) for i, e in errors.items()) == {0: "choices", 3: "minvalue"}
+        with pytest.raises(ValidationError):
+            reading_class(**records[0])
+        assert instances[2].level == 2
+
+        errors = check_column(NumberField(choices=[1, 2]), [nan, 1.0, 2.0], use_numpy)
+        assert list(errors) == [0]
+
+    @pytest.mark.unit
+    def test_sequences_in_number_column(self, reading_class, use_numpy):
+        records = [
+            {"sensor": "ab", "value": 1},
+            {"sensor": "ab", "value": [1, 2]},
+            {"sensor": "ab", "value": (3,)},
+        ]
+        instances, errors = validate_batch(reading_class, records, use_numpy=use_numpy)
+        assert sorted(errors) == [1, 2]
+        assert errors[1].error_key == "invalid_type"
+        assert instances[0].value == 1
+
+        columns = {"sensor": ["ab", "ab"], "value": [1, [1, 2]]}
+        _, errors = reading_class.validate_columns(columns, use_numpy=use_numpy)
+        assert str(errors[1]) == "Value must be a number"
+
+    @pytest.mark.unit
+    def test_same_errors_as_row_validation(self, reading_class):
+        records = [
+            {"sensor": "s", "value": 5},
+            {"sensor": "abcdefghij"},
+            {"sensor": "ok", "value": -3},
+        ]
+        _, errors = validate_batch(reading_class, records, use_numpy=False)
+        for i, record in enumerate(records):
+            with pytest.raises(ValidationError) as exc_info:
+                reading_class(**record)
+            assert errors[i].error_key == exc_info.value.error_key
+            assert errors[i].message == exc_info.value.message
+
+    @pytest.mark.unit
+    def test_matches_row_construction(self, reading_class, use_numpy):
+        records = [
+            {"sensor": "ab"},
+            {"sensor": "ab", "value": None, "status": None},
+            {"sensor": "ab", "value": 3.5, "level": 2, "note": "extra"},
+        ]
+        instances, errors = validate_batch(reading_class, records, use_numpy=use_numpy)
+        assert errors == {}
+        for instance, record in zip(instances, records):
+            expected = reading_class(**record)
+            assert instance == expected
+            assert instance.to_dict() == expected.to_dict()
+            assert instance.changed_fields() == expected.changed_fields()
+
+    @pytest.mark.unit
+    def test_explicit_none_with_choices(self, use_numpy):
+        @dataclass
+        class Flag(object):
+            color = StringField(choices=["red", "blue"])
+            size = NumberField(choices=[1, 2])
+            shade = StringField(choices=["dark", None])
+
+        records = [
+            {"color": None},
+            {"size": None},
+            {},
+            {"color": "red", "size": 2, "shade": None},
+        ]
+        instances, errors = validate_batch(Flag, records, use_numpy=use_numpy)
+        for i, record in enumerate(records):
+            if i in errors:
+                with pytest.raises(ValidationError) as exc_info:
+                    Flag(**record)
+                assert errors[i].error_key == exc_info.value.error_key == "choices"
+                assert str(errors[i]) == str(exc_info.value)
+            else:
+                assert instances[i] == Flag(**record)
+        assert sorted(errors) == [0, 1]
+
+        columns = {"color": [None, "red"], "size": [1, None]}
+        _, errors = Flag.validate_columns(columns, use_numpy=use_numpy)
+        assert dict((i, e.path) for i, e in errors.items()) == {0: ["color"], 1: ["size"]}
+
+    @pytest.mark.unit
+    def test_regex_and_lazy_models(self):
+        @dataclass(lazy=True)
+        class Code(object):
+            code = StringField(regex=r"^[A-Z]{3}$")
+
+        instances, errors = validate_batch(Code, [{"code": "ABC"}, {"code": "abc"}])
+        assert instances[0].code == "ABC"
+        assert errors[1].error_key == "regex"
+
+    @pytest.mark.unit
+    def test_instances_keep_full_validation(self, reading_class):
+        instances, _ = validate_batch(reading_class, [{"sensor": "ab", "value": 1}])
+        with pytest.raises(ValidationError):
+            instances[0].value = 500
+
+    @pytest.mark.unit
+    def test_metrics_count_column_failures(self, reading_class):
+        metrics = enable_metrics()
+        try:
+            validate_batch(reading_class, [{"sensor": "ab", "value": -1}, {"sensor": "ab"}])
+        finally:
+            disable_metrics()
+        snapshot = metrics.snapshot()
+        assert snapshot["records"]["Reading"] == {"validated": 2, "failed": 1}
+        assert snapshot["fields"]["Reading"]["value"]["errors"] == {"minvalue": 1}
+
+    @pytest.mark.unit
+    def test_metrics_match_row_construction(self, reading_class):
+        records = [{"sensor": "ab", "value": 1}, {"value": 2}, {"sensor": "cd", "value": -1}]
+
+        def collect(run):
+            metrics = enable_metrics()
+            try:
+                run()
+            finally:
+                disable_metrics()
+            return metrics.snapshot()
+
+        def build_rows():
+            for record in records:
+                try:
+                    reading_class(**record)
+                except ValidationError:
+                    pass
+
+        expected = collect(build_rows)
+        columns = dict((k, [r.get(k) for r in records]) for k in ("sensor", "value"))
+        for run in (lambda: validate_batch(reading_class, records),
+                    lambda: reading_class.validate_columns(columns)):
+            snapshot = collect(run)
+            assert snapshot["records"] == expected["records"]
+            for name in ("sensor", "value", "level"):
+                assert snapshot["fields"]["Reading"][name]["errors"] == \
+                    expected["fields"]["Reading"][name]["errors"]
+            assert snapshot["fields"]["Reading"]["sensor"]["validated"] >= 1
+
+    @pytest.mark.unit
+    def test_requires_dataclass(self):
+        with pytest.raises(TypeError):
+            validate_batch(dict, [])
+
+
+class TestColumns:
+    """Model.validate_columns() / Model.to_columns() 测试"""
+
+    @pytest.mark.unit
+    def test_validate_columns(self, reading_class, use_numpy):
+        columns = {
+            "sensor": ["ab", "s", "cd", "xx", "ef"],
+            "value": [1, 2, 500, 3, None],
+            "level": [1, 2, 3, 1, 9],
+        }
+        result, errors = reading_class.validate_columns(columns, use_numpy=use_numpy)
+        assert dict((i, e.error_key) for i, e in errors.items()) == {
+            1: "min_length", 2: "maxvalue", 3: None, 4: "choices",
+        }
+        assert "sensor retired" in str(errors[3])
+        assert result == {
+            "sensor": ["ab", None, None, None, None],
+            "status": ["ok", None, None, None, None],
+            "value": [1, None, None, None, None],
+            "level": [1, None, None, None, None],
+        }
+        assert columns["value"] == [1, 2, 500, 3, None]
+
+    @pytest.mark.unit
+    def test_validate_columns_converts_nested(self):
+        from schema_dataclass import DateField
+        import datetime
+
+        @dataclass
+        class Point(object):
+            x = NumberField(required=True)
+
+        @dataclass
+        class Track(object):
+            name = StringField(required=True)
+            day = DateField()
+            start = Point
+            tags = StringField()
+
+            @validate("tags")
+            def check_tags(self, value):
+                if value and self.name not in value:
+                    raise ValidationError("must mention name")
+
+        result, errors = Track.validate_columns({
+            "name": ["a", "b", "c"],
+            "day": ["2024-01-02", "bad", None],
+            "start": [{"x": 1}, {"x": 2}, {}],
+            "tags": ["a1", None, "zz"],
+            "source": ["x", "y", "z"],
+        })
+        assert sorted(errors) == [1, 2]
+        assert errors[1].path == ["day"]
+        assert errors[2].error_key == "required"
+        assert result["day"][0] == datetime.date(2024, 1, 2)
+        assert isinstance(result["start"][0], Point)
+        assert result["source"] == ["x", "y", "z"]
+
+        _, errors = Track.validate_columns({"name": ["a"], "tags": ["zz"], "start": [{"x": 0}]})
+        assert errors[0].path == ["tags"]
+        with pytest.raises(ValidationError):
+            Track(name="a", tags="zz", start={"x": 0})
+
+    @pytest.mark.unit
+    def test_validate_columns_errors(self, reading_class):
+        with pytest.raises(ValueError):
+            reading_class.validate_columns({"sensor": ["a", "b"], "value": [1]})
+        result, errors = reading_class.validate_columns({"value": [1, 2]})
+        assert [e.error_key for e in errors.values()] == ["required", "required"]
+        assert result["value"] == [None, None]
+
+    @pytest.mark.unit
+    def test_to_columns(self, reading_class):
+        import array
+        from schema_dataclass import NumberArrayField
+
+        @dataclass
+        class Series(object):
+            reading = reading_class
+            samples = NumberArrayField()
+
+        instances = [
+            Series(reading={"sensor": "ab", "value": 1}, samples=[1]),
+            Series(reading={"sensor": "cd"}),
+            Series.view({"reading": {"sensor": "ef"}, "samples": array.array("d", [2.0])}),
+        ]
+        columns = Series.to_columns(instances)
+        assert columns == {
+            "reading": [
+                {"sensor": "ab", "status": "ok", "value": 1, "level": 1},
+                {"sensor": "cd", "status": "ok", "level": 1},
+                {"sensor": "ef", "status": "ok", "level": 1},
+            ],
+            "samples": [[1.0], None, [2.0]],
+        }
+        assert [dict(zip(columns, row)) for row in zip(*columns.values())] == \
+            [x.to_dict() if x.samples is not None else dict(x.to_dict(), samples=None)
+             for x in instances]
+        with pytest.raises(TypeError):
+            Series.to_columns([instances[0].reading])
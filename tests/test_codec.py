@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+定长二进制记录编解码测试
+"""
+
+import datetime
+import json
+import struct
+
+import pytest
+from schema_dataclass import (
+    DateField,
+    DateTimeField,
+    ListField,
+    NumberField,
+    StringField,
+    dataclass,
+)
+from schema_dataclass.codec import RecordCodec, RecordSequence
+
+
+@pytest.fixture
+def reading_class():
+    @dataclass
+    class Reading(object):
+        sensor = StringField(required=True, max_length=8)
+        status = StringField(max_length=5, default="ok")
+        value = NumberField()
+        count = NumberField(struct_format="q")
+        day = DateField()
+        at = DateTimeField()
+
+    return Reading
+
+
+class TestRecordCodec:
+    """RecordCodec 测试"""
+
+    @pytest.mark.unit
+    def test_layout(self, reading_class):
+        codec = RecordCodec(reading_class)
+        # 1 字节位图 + 32s + 20s + d + q + i + q（UTF-8 每个字符最多 4 字节）
+        assert codec.size == 1 + 32 + 20 + 8 + 8 + 4 + 8
+        assert RecordCodec(reading_class, encoding="latin-1").size == 1 + 8 + 5 + 8 + 8 + 4 + 8
+        assert codec.names == ["sensor", "status", "value", "count", "day", "at"]
+
+    @pytest.mark.unit
+    def test_round_trip(self, reading_class):
+        codec = RecordCodec(reading_class)
+        reading = reading_class(
+            sensor=u"té1", value=1.5, count=2 ** 40,
+            day=datetime.date(2024, 2, 29),
+            at=datetime.datetime(1969, 12, 31, 23, 59, 59, 999999),
+        )
+        data = codec.encode(reading)
+        assert len(data) == codec.size
+        decoded = codec.decode(data)
+        assert type(decoded) is reading_class
+        assert decoded == reading
+        assert decoded.to_dict() == reading.to_dict()
+
+    @pytest.mark.unit
+    def test_string_width(self):
+        @dataclass
+        class City(object):
+            name = StringField(max_length=4)
+            code = StringField(max_length=8, struct_size=3)
+
+        codec = RecordCodec(City)
+        city = City(name=u"北京\U0001F600x", code="abc")
+        assert codec.decode(codec.encode(city)) == city
+        # 末尾的 \0 在解码时去除
+        assert codec.decode(codec.encode(City(name=u"a\0"))).name == "a"
+        with pytest.raises(ValueError):
+            codec.encode(City(code="abcd"))
+        with pytest.raises(TypeError):
+            RecordCodec(City.omit("code"), encoding="gbk")
+        assert RecordCodec(City.omit("name"), encoding="gbk").size == 1 + 3
+        with pytest.raises(ValueError):
+            RecordCodec(City, encoding="utf-16")
+
+    @pytest.mark.unit
+    def test_none_values(self, reading_class):
+        codec = RecordCodec(reading_class)
+        reading = reading_class(sensor="ab")
+        decoded = codec.decode(codec.encode(reading))
+        assert decoded.to_dict() == reading.to_dict()
+        assert decoded.value is None
+        data = codec.encode(reading)
+        assert codec.is_null(data, "value")
+        assert codec.unpack_field(data, "value") is None
+        assert codec.unpack_field(data, "sensor") == "ab"
+
+    @pytest.mark.unit
+    def test_batches(self, reading_class):
+        codec = RecordCodec(reading_class)
+        readings = [reading_class(sensor="s{}".format(i), value=i, count=i) for i in range(20)]
+        data = codec.encode_many(readings)
+        assert len(data) == 20 * codec.size
+        assert codec.count(data) == 20
+        assert codec.decode_many(data) == readings
+        assert codec.decode(data, 5 * codec.size).sensor == "s5"
+        assert codec.unpack_field(data, "count", 7 * codec.size) == 7
+        assert next(codec.iter_decode(data)) == readings[0]
+        assert codec.decode_many(b"") == []
+        with pytest.raises(ValueError):
+            codec.count(data[:-1])
+
+        # 定长记录比 JSON 小（ASCII 字符串按 max_length 字节存储）
+        as_json = json.dumps([r.to_dict() for r in readings]).encode("utf-8")
+        assert len(RecordCodec(reading_class, encoding="ascii").encode_many(readings)) < len(as_json)
+
+    @pytest.mark.unit
+    def test_encode_errors(self, reading_class):
+        codec = RecordCodec(reading_class)
+        with pytest.raises(ValueError):
+            codec.encode(reading_class.from_trusted({"sensor": "x" * 33}))
+        with pytest.raises(ValueError):
+            codec.encode(reading_class(sensor="ab", count=1.5))
+        with pytest.raises(ValueError):
+            codec.encode(reading_class(
+                sensor="ab", at=datetime.datetime(2024, 1, 1, tzinfo=_UTC())))
+
+    @pytest.mark.unit
+    def test_byteorder(self, reading_class):
+        big = RecordCodec(reading_class, byteorder=">")
+        data = big.encode(reading_class(sensor="ab", count=1))
+        assert struct.unpack_from(">q", data, big._fields["count"][1])[0] == 1
+        assert big.decode(data).count == 1
+        with pytest.raises(ValueError):
+            RecordCodec(reading_class, byteorder="@")
+
+    @pytest.mark.unit
+    def test_unsupported_fields(self):
+        @dataclass
+        class Tagged(object):
+            tags = ListField(item_type=str)
+
+        @dataclass
+        class Note(object):
+            text = StringField()
+
+        @dataclass
+        class Stamp(object):
+            day = DateField(output_format="%Y")
+
+        @dataclass
+        class Outer(object):
+            day = DateField()
+            inner = Stamp
+
+        for model in (Tagged, Note, Stamp, Outer):
+            with pytest.raises(TypeError):
+                RecordCodec(model)
+
+        @dataclass
+        class Counter(object):
+            n = NumberField(struct_format="x")
+
+        with pytest.raises(ValueError):
+            RecordCodec(Counter)
+
+
+class TestRecordViews:
+    """RecordCodec.view / RecordSequence 测试"""
+
+    @pytest.mark.unit
+    def test_view_decodes_on_read(self, reading_class):
+        codec = RecordCodec(reading_class)
+        reading = reading_class(sensor="ab", value=2.5, day=datetime.date(2024, 1, 2))
+        data = bytearray(codec.encode(reading))
+        view = codec.view(data)
+        assert isinstance(view, reading_class)
+        assert view.value == 2.5
+        assert view.count is None
+        assert view.status == "ok"
+        assert view == reading
+        assert view.to_dict() == reading.to_dict()
+        assert view.to_instance() == reading
+
+        # 已读取的字段被缓存，未读取的字段按需从数据中解码
+        struct.pack_into("<d", data, codec._fields["value"][1], 9.0)
+        data[0] = 0
+        assert view.value == 2.5
+        assert view.count == 0
+
+    @pytest.mark.unit
+    def test_sequence(self, reading_class):
+        codec = RecordCodec(reading_class)
+        readings = [reading_class(sensor="s{}".format(i), count=i) for i in range(10)]
+        records = RecordSequence(codec, memoryview(codec.encode_many(readings)))
+        assert len(records) == 10
+        assert records[3].sensor == "s3"
+        assert records[-1].count == 9
+        assert [r.count for r in records[2:8:3]] == [2, 5]
+        assert [r.count for r in records[::-1][:3]] == [9, 8, 7]
+        assert len(records[20:]) == 0
+        assert records.decode(4) == readings[4]
+        assert list(records) == readings
+        with pytest.raises(IndexError):
+            records[10]
+
+
+class _UTC(datetime.tzinfo):
+    def utcoffset(self, dt):
+        return datetime.timedelta(0)
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+CSV 读写测试
+"""
+
+import datetime
+import io
+
+import pytest
+from schema_dataclass import (
+    DateField,
+    DateTimeField,
+    ListField,
+    NumberArrayField,
+    NumberField,
+    StringField,
+    ValidationError,
+    dataclass,
+)
+from schema_dataclass.csvio import ModelReader, ModelWriter, read_csv, write_csv
+
+
+@pytest.fixture
+def event_class():
+    @dataclass
+    class Event(object):
+        name = StringField(required=True)
+        count = NumberField(minvalue=0)
+        ratio = NumberField()
+        day = DateField()
+        at = DateTimeField()
+        tags = ListField(item_type=str)
+        scores = ListField(item_type=int, csv_delimiter=";")
+        samples = NumberArrayField()
+
+    return Event
+
+
+CSV_TEXT = (
+    "name,count,ratio,day,at,tags,scores,samples,note\n"
+    "a,1,0.5,2024-01-02,2024-01-02T03:04:05,x|y,1;2,1.5|2,hello\n"
+    "b,,,01/02/2024,,,,,\n"
+)
+
+
+class TestModelReader:
+    """ModelReader 测试"""
+
+    @pytest.mark.unit
+    def test_converts_columns(self, event_class):
+        first, second = list(ModelReader(io.StringIO(CSV_TEXT), event_class))
+        assert first.count == 1
+        assert first.ratio == 0.5
+        assert first.day == datetime.date(2024, 1, 2)
+        assert first.at == datetime.datetime(2024, 1, 2, 3, 4, 5)
+        assert first.tags == ["x", "y"]
+        assert first.scores == [1, 2]
+        assert first.samples.tolist() == [1.5, 2.0]
+        assert first.note == "hello"
+
+        # 空单元格视为未提供；其它日期格式交给字段解析
+        assert second.count is None
+        assert second.tags is None
+        assert second.day == datetime.date(2024, 1, 2)
+
+    @pytest.mark.unit
+    def test_errors(self, event_class):
+        text = "name,count\na,1\n,2\nc,-1\nd,x\ne,5\n"
+        with pytest.raises(ValidationError) as exc_info:
+            list(read_csv(io.StringIO(text), event_class))
+        assert exc_info.value.line_num == 3
+
+        reader = ModelReader(io.StringIO(text), event_class, on_error="skip")
+        assert [e.name for e in reader] == ["a", "e"]
+        assert [(line, e.error_key) for line, e in reader.errors] == [
+            (3, "required"), (4, "minvalue"), (5, "invalid_type"),
+        ]
+
+    @pytest.mark.unit
+    def test_trusted(self, event_class):
+        rows = list(read_csv(io.StringIO("name,count\na,-1\n"), event_class, trusted=True))
+        assert rows[0].count == -1
+
+    @pytest.mark.unit
+    def test_nested_fields_rejected(self):
+        @dataclass
+        class Point(object):
+            x = NumberField()
+
+        @dataclass
+        class Wrapper(object):
+            event = Point
+            label = StringField()
+
+        assert [w.label for w in read_csv(io.StringIO("label\nx\n"), Wrapper)] == ["x"]
+        with pytest.raises(TypeError):
+            list(read_csv(io.StringIO("event\nx\n"), Wrapper))
+        with pytest.raises(TypeError):
+            ModelWriter(io.StringIO(), Wrapper)
+
+
+class TestModelWriter:
+    """ModelWriter 测试"""
+
+    @pytest.mark.unit
+    def test_round_trip(self, event_class):
+        events = list(read_csv(io.StringIO(CSV_TEXT), event_class))
+        out = io.StringIO()
+        write_csv(out, event_class, events, lineterminator="\n")
+        assert out.getvalue() == (
+            "name,count,ratio,day,at,tags,scores,samples\n"
+            "a,1,0.5,2024-01-02,2024-01-02T03:04:05,x|y,1;2,1.5|2.0\n"
+            "b,,,2024-01-02,,,,\n"
+        )
+        again = list(read_csv(io.StringIO(out.getvalue()), event_class))
+        assert [e.to_dict() for e in again] == [
+            dict((k, v) for k, v in e.to_dict().items() if k != "note") for e in events
+        ]
+
+    @pytest.mark.unit
+    def test_round_trip_formatted_dates(self):
+        @dataclass
+        class Stamp(object):
+            day_ts = DateField(return_timestamp=True)
+            at_ts = DateTimeField(return_timestamp=True)
+            day_fmt = DateField(output_format="%d/%m/%Y")
+            at_fmt = DateTimeField(output_format="%d/%m/%Y %H:%M")
+
+        stamps = [
+            Stamp(day_ts="2024-03-05", at_ts="2024-03-05 06:07:08",
+                  day_fmt="2024-03-05", at_fmt="2024-03-05 06:07:00"),
+            Stamp(day_fmt="2024-12-31"),
+        ]
+        assert stamps[0].day_fmt == "05/03/2024"
+        out = io.StringIO()
+        write_csv(out, Stamp, stamps)
+        again = list(read_csv(io.StringIO(out.getvalue()), Stamp))
+        assert [s.to_dict() for s in again] == [s.to_dict() for s in stamps]
+
+    @pytest.mark.unit
+    def test_fieldnames(self, event_class):
+        out = io.StringIO()
+        writer = ModelWriter(out, event_class, fieldnames=["count", "name"], lineterminator="\n")
+        writer.writeheader()
+        writer.writerow(event_class(name="z", count=3))
+        assert out.getvalue() == "count,name\n3,z\n"
+        with pytest.raises(ValueError):
+            ModelWriter(out, event_class, fieldnames=["missing"]).writerow(event_class(name="z"))
@@ -553,3 +553,955 @@ class TestCustomGetters:
         demo = Demo(name="world")
         assert demo.name == "hello, world"
         
+
+class TestAccessorThreadSafety:
+    """getter/setter 并发调用测试"""
+
+    @pytest.mark.dataclass
+    def test_getter_does_not_mutate_class_dict(self):
+        @dataclass
+        class Demo(object):
+            name = StringField()
+
+            @getter("name")
+            def get_name(self):
+                # getter 执行期间类级别的 __getters__ 保持不变
+                assert "name" in type(self).__getters__
+                return "<{0}>".format(self.name)
+
+        demo = Demo(name="x")
+        assert demo.name == "<x>"
+        assert "name" in Demo.__getters__
+
+    @pytest.mark.dataclass
+    def test_concurrent_getter_and_setter(self):
+        import threading
+
+        @dataclass
+        class Demo(object):
+            name = StringField()
+
+            @getter("name")
+            def get_name(self):
+                return self.name.upper()
+
+            @setter("name")
+            def set_name(self, value):
+                return value.strip()
+
+        errors = []
+
+        def work(i):
+            obj = Demo(name=" worker%d " % i)
+            for _ in range(500):
+                if obj.name != "WORKER%d" % i:
+                    errors.append(obj.name)
+                obj.name = " worker%d " % i
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+
+
+class TestTrustedConstruct:
+    """construct / from_trusted 测试"""
+
+    @pytest.fixture
+    def models(self):
+        @dataclass
+        class Item(object):
+            sku = StringField(min_length=3, required=True)
+            qty = NumberField(minvalue=1, default=1)
+
+        @dataclass
+        class Order(object):
+            code = StringField(regex=r"^O\d+$", required=True)
+            status = StringField(default="new")
+            items = ListField(item_type=Item)
+            shipping = Item
+
+            @validate("code")
+            def check_code(self, code):
+                raise AssertionError("validators must not run")
+
+        return Item, Order
+
+    @pytest.mark.dataclass
+    def test_construct_skips_validation(self, models):
+        Item, Order = models
+        order = Order.construct(code="bad", items=[{"sku": "x", "qty": 0}])
+
+        assert order.code == "bad"
+        assert order.status == "new"
+        assert isinstance(order.items[0], Item)
+        assert order.items[0].sku == "x"
+        assert order.items[0].qty == 0
+
+    @pytest.mark.dataclass
+    def test_from_trusted_nested_and_defaults(self, models):
+        Item, Order = models
+        order = Order.from_trusted(
+            {"code": "O1", "shipping": {"sku": "abc"}, "note": "extra"}
+        )
+
+        assert isinstance(order.shipping, Item)
+        assert order.shipping.qty == 1
+        assert order.items is None
+        assert order.note == "extra"
+        assert order.to_dict() == {
+            "code": "O1",
+            "status": "new",
+            "shipping": {"sku": "abc", "qty": 1},
+            "note": "extra",
+        }
+
+    @pytest.mark.dataclass
+    def test_constructed_instance_validates_on_assignment(self, models):
+        Item, _ = models
+        item = Item.construct(sku="abc")
+        assert item == Item(sku="abc")
+
+        with pytest.raises(ValidationError):
+            item.sku = "x"
+
+
+class TestDirtyTracking:
+    """修改跟踪与增量校验测试"""
+
+    @pytest.fixture
+    def account_class(self):
+        checked = []
+
+        @dataclass
+        class Account(object):
+            name = StringField(min_length=2)
+            age = NumberField(minvalue=0)
+            tags = ListField(item_type=str, max_length=2)
+
+            @validate("name")
+            def check_name(self, name):
+                checked.append(name)
+
+        Account.checked = checked
+        return Account
+
+    @pytest.mark.dataclass
+    def test_new_instance_has_no_changes(self, account_class):
+        account = account_class(name="Alice", age=1)
+        assert account.changed_fields() == []
+        assert account.get_changes() == {}
+        assert account_class.construct(name="Bob").changed_fields() == []
+
+    @pytest.mark.dataclass
+    def test_assignment_marks_field_dirty(self, account_class):
+        account = account_class(name="Alice", age=1)
+        account.age = 2
+        account["name"] = "Bob"
+        account.extra = "not a field"
+
+        assert account.changed_fields() == ["name", "age"]
+        assert account.get_changes() == {"name": "Bob", "age": 2}
+
+        account.clear_changes()
+        assert account.changed_fields() == []
+
+    @pytest.mark.dataclass
+    def test_failed_assignment_is_not_dirty(self, account_class):
+        account = account_class(name="Alice")
+        with pytest.raises(ValidationError):
+            account.age = -1
+        assert account.changed_fields() == []
+
+    @pytest.mark.dataclass
+    def test_revalidate_only_dirty_fields(self, account_class):
+        account = account_class(name="Alice", tags=["a"])
+        account.tags = ["a", "b"]
+        del account_class.checked[:]
+
+        # 原地修改列表后重新校验
+        account.tags.append("c")
+        with pytest.raises(ValidationError):
+            account.revalidate()
+        assert account_class.checked == []
+
+        account.tags.pop()
+        account.name = "Carol"
+        assert account.revalidate() == ["name", "tags"]
+        assert account_class.checked == ["Carol", "Carol"]
+
+    @pytest.mark.dataclass
+    def test_revalidate_converting_fields(self):
+        import datetime
+        from schema_dataclass import DateField, DateTimeField
+
+        @dataclass
+        class Event(object):
+            at = DateTimeField(return_timestamp=True)
+            day = DateField(output_format="%d/%m/%Y")
+
+        event = Event()
+        event.at = "2024-01-02 03:04:05"
+        event.day = "2024-03-05"
+        at, day = event.at, event.day
+        assert day == "05/03/2024"
+
+        assert event.revalidate() == ["at", "day"]
+        assert (event.at, event.day) == (at, day)
+        assert event.revalidate() == ["at", "day"]
+        assert (event.at, event.day) == (at, day)
+
+        event.update(day=datetime.date(2024, 12, 31))
+        event.revalidate()
+        assert event.day == "31/12/2024"
+
+
+class TestAtomicUpdate:
+    """update() 原子更新测试"""
+
+    @pytest.fixture
+    def range_class(self):
+        calls = []
+
+        @dataclass
+        class Range(object):
+            low = NumberField(minvalue=0)
+            high = NumberField(minvalue=0)
+            label = StringField()
+
+            @validate("high")
+            def check_order(self, high):
+                calls.append(high)
+                if self.low is not None and high is not None and high < self.low:
+                    raise ValidationError("must not be below low")
+
+            @setter("label")
+            def set_label(self, value):
+                return value.strip()
+
+        Range.calls = calls
+        return Range
+
+    @pytest.mark.dataclass
+    def test_update_validates_against_new_state(self, range_class):
+        r = range_class(low=1, high=2)
+        # 逐个赋值时 low=10 本身合法，但 update 中 high 的校验会看到新的 low
+        r.update(low=10, high=20, label="  wide ")
+        assert (r.low, r.high, r.label) == (10, 20, "wide")
+        assert range_class.calls[-1] == 20
+        assert r.changed_fields() == ["low", "high", "label"]
+
+    @pytest.mark.dataclass
+    def test_update_field_failure_leaves_instance_unchanged(self, range_class):
+        r = range_class(low=1, high=2)
+        with pytest.raises(ValidationError):
+            r.update(low=5, high=-1)
+        assert (r.low, r.high) == (1, 2)
+        assert r.changed_fields() == []
+
+    @pytest.mark.dataclass
+    def test_update_validator_failure_rolls_back(self, range_class):
+        r = range_class(low=1)
+        with pytest.raises(ValidationError) as exc_info:
+            r.update(low=10, high=5)
+        assert exc_info.value.path == ["high"]
+        assert r.low == 1
+        assert r.high is None
+        assert r.to_dict() == {"low": 1}
+
+    @pytest.mark.dataclass
+    def test_update_extra_attributes(self, range_class):
+        r = range_class()
+        r.update(low=1, note="x")
+        assert r.note == "x"
+        assert r.get_changes() == {"low": 1}
+
+
+class TestReplace:
+    """Model.replace() 测试"""
+
+    @pytest.fixture
+    def models(self):
+        @dataclass
+        class Address(object):
+            city = StringField(required=True)
+
+        @dataclass
+        class Event(object):
+            name = StringField(min_length=2, required=True)
+            count = NumberField(minvalue=0, default=0)
+            tags = ListField(item_type=str)
+            address = Address
+
+        return Address, Event
+
+    @pytest.mark.dataclass
+    def test_replace_shares_unchanged_values(self, models):
+        _, Event = models
+        old = Event(name="start", tags=["a"], address={"city": "X"})
+        new = Event.replace(old, count=5)
+
+        assert new is not old
+        assert new.count == 5
+        assert old.count == 0
+        assert new.tags is old.tags
+        assert new.address is old.address
+        assert new.changed_fields() == []
+        assert new.to_dict() == dict(old.to_dict(), count=5)
+
+    @pytest.mark.dataclass
+    def test_replace_validates_changes(self, models):
+        _, Event = models
+        old = Event(name="start", address={"city": "X"})
+        with pytest.raises(ValidationError):
+            Event.replace(old, count=-1)
+        with pytest.raises(ValidationError):
+            Event.replace(old, address={"city": None})
+        assert Event.replace(old).to_dict() == old.to_dict()
+
+    @pytest.mark.dataclass
+    def test_replace_rejects_other_types(self, models):
+        Address, Event = models
+        with pytest.raises(TypeError):
+            Event.replace(Address(city="X"), name="ok")
+
+
+class TestFrozenDataClass:
+    """frozen=True 测试"""
+
+    @pytest.fixture
+    def point_class(self):
+        @dataclass(frozen=True)
+        class Point(object):
+            x = NumberField(required=True)
+            y = NumberField(default=0)
+            tags = ListField(item_type=str)
+
+        return Point
+
+    @pytest.mark.dataclass
+    def test_frozen_rejects_assignment(self, point_class):
+        from schema_dataclass import FrozenInstanceError
+
+        p = point_class(x=1)
+        with pytest.raises(FrozenInstanceError):
+            p.x = 2
+        with pytest.raises(FrozenInstanceError):
+            p["y"] = 2
+        with pytest.raises(FrozenInstanceError):
+            p.update(x=2)
+        with pytest.raises(AttributeError):
+            del p.x
+        assert p.x == 1
+
+    @pytest.mark.dataclass
+    def test_frozen_still_validates_on_init(self, point_class):
+        with pytest.raises(ValidationError):
+            point_class(x="a")
+
+    @pytest.mark.dataclass
+    def test_frozen_hash(self, point_class):
+        a = point_class(x=1, tags=["a"])
+        b = point_class(x=1, tags=["a"])
+        c = point_class(x=2)
+
+        assert hash(a) == hash(b)
+        assert len({a, b, c}) == 2
+        cache = {a: "cached"}
+        assert cache[b] == "cached"
+        assert a.__dict__["__dataclass_hash__"] == hash(a)
+
+    @pytest.mark.dataclass
+    def test_frozen_lists_are_copied(self, point_class):
+        import copy
+        import pickle
+
+        from schema_dataclass import FrozenInstanceError
+
+        tags = ["a"]
+        p = point_class(x=1, tags=tags)
+        h = hash(p)
+        tags.append("b")
+        assert p.tags == ["a"]
+        assert hash(p) == h == hash(point_class(x=1, tags=["a"]))
+        assert p != point_class(x=1, tags=["a", "b"])
+        with pytest.raises(FrozenInstanceError):
+            p.tags.append("c")
+        with pytest.raises(FrozenInstanceError):
+            p.tags[0] = "c"
+        assert p.tags == ["a"]
+
+        # 仍可作为输入重新构建、序列化与复制
+        assert point_class(**p.to_dict()) == p
+        assert point_class.replace(p, tags=tags).tags == ["a", "b"]
+        assert point_class.construct(x=1, tags=tags) == point_class(x=1, tags=["a", "b"])
+        assert pickle.loads(pickle.dumps(p.tags)) == ["a"]
+        assert copy.deepcopy(p.tags) == ["a"]
+
+        @dataclass(frozen=True, lazy=True)
+        class LazyPoint(object):
+            tags = ListField(item_type=str)
+
+        tags = ["a"]
+        lazy_point = LazyPoint(tags=tags)
+        tags.append("b")
+        assert lazy_point.tags == ["a"]
+        from schema_dataclass.batch import validate_batch
+        instances, _ = validate_batch(point_class, [{"x": 1, "tags": tags}])
+        with pytest.raises(FrozenInstanceError):
+            instances[0].tags.append("c")
+
+    @pytest.mark.dataclass
+    def test_frozen_nested_models(self, point_class):
+        from schema_dataclass import FrozenInstanceError
+
+        @dataclass(frozen=True)
+        class Segment(object):
+            start = point_class
+            points = ListField(item_type=point_class)
+
+        a = Segment(start={"x": 1, "tags": []}, points=[{"x": 2, "tags": ["b"]}])
+        b = Segment(start={"x": 1, "tags": []}, points=[{"x": 2, "tags": ["b"]}])
+        assert hash(a) == hash(b)
+        assert a == b
+        with pytest.raises(FrozenInstanceError):
+            a.start.x = 5
+
+        @dataclass
+        class Mutable(object):
+            x = NumberField()
+
+        with pytest.raises(TypeError):
+            @dataclass(frozen=True)
+            class Holder(object):
+                inner = Mutable
+
+        with pytest.raises(TypeError):
+            @dataclass(frozen=True)
+            class ListHolder(object):
+                items = ListField(item_type=Mutable)
+
+    @pytest.mark.dataclass
+    def test_frozen_replace(self, point_class):
+        a = point_class(x=1)
+        b = point_class.replace(a, y=5)
+        assert (b.x, b.y) == (1, 5)
+        assert a.y == 0
+        assert hash(b) != hash(a)
+
+    @pytest.mark.dataclass
+    def test_regular_dataclass_is_unhashable(self, sample_dataclass):
+        user = sample_dataclass(name="Alice", email="alice@example.com")
+        with pytest.raises(TypeError):
+            hash(user)
+        user.age = 3
+
+
+class TestMemoizedDefaults:
+    """未赋值字段默认值缓存测试"""
+
+    @pytest.mark.dataclass
+    def test_callable_default_materialized_once(self):
+        calls = []
+
+        def make_tags():
+            calls.append(1)
+            return ["default"]
+
+        @dataclass
+        class Doc(object):
+            title = StringField()
+            tags = ListField(item_type=str, required=True, default=make_tags)
+
+        # construct 不为必填字段填充默认值，tags 保持未赋值
+        doc = Doc.construct(title="t")
+        first = doc.tags
+        assert first == ["default"]
+        assert doc.tags is first
+        assert doc.get("tags") is first
+        assert doc.to_dict()["tags"] is not first
+        assert doc.to_dict() == {"title": "t", "tags": ["default"]}
+        assert len(calls) == 1
+
+    @pytest.mark.dataclass
+    def test_constant_default_is_shared(self):
+        @dataclass
+        class Doc(object):
+            status = StringField(required=True, default="draft")
+
+        doc = Doc.construct()
+        assert doc.status == "draft"
+        assert doc.to_dict() == {"status": "draft"}
+        assert "status" not in doc.__dataclass_values__
+
+
+class TestLazyDataClass:
+    """lazy=True 延迟校验测试"""
+
+    @pytest.fixture
+    def event_class(self):
+        checked = []
+
+        @dataclass
+        class Meta(object):
+            source = StringField(default="web")
+
+        @dataclass(lazy=True)
+        class Event(object):
+            kind = StringField(required=True, choices=["click", "view"])
+            value = NumberField(minvalue=0)
+            label = StringField(default="none")
+            meta = Meta
+
+            @validate("value")
+            def check_value(self, value):
+                checked.append(value)
+
+        Event.checked = checked
+        return Event, Meta
+
+    @pytest.mark.dataclass
+    def test_fields_validated_on_first_access(self, event_class):
+        Event, Meta = event_class
+        event = Event(kind="click", value=-1, extra=1)
+
+        # 构建时不校验字段，只检查必填
+        assert Event.checked == []
+        assert event.kind == "click"
+        with pytest.raises(ValidationError):
+            event.value
+        # 失败后原始值保留，再次读取仍然报错
+        with pytest.raises(ValidationError):
+            event.get("value")
+        assert event.extra == 1
+        assert event.label == "none"
+        assert isinstance(event.meta, Meta)
+        assert event.meta.source == "web"
+
+    @pytest.mark.dataclass
+    def test_required_checked_eagerly(self, event_class):
+        Event, _ = event_class
+        with pytest.raises(ValidationError):
+            Event(value=1)
+
+    @pytest.mark.dataclass
+    def test_value_cached_after_first_access(self, event_class):
+        Event, _ = event_class
+        event = Event(kind="view", value=3)
+        assert event.value == 3
+        assert event.value == 3
+        assert Event.checked == [3]
+        assert "value" not in event.__dataclass_raw__
+
+    @pytest.mark.dataclass
+    def test_full_validate_and_to_dict(self, event_class):
+        Event, _ = event_class
+        with pytest.raises(ValidationError):
+            Event(kind="other").full_validate()
+        with pytest.raises(ValidationError):
+            Event(kind="other").to_dict()
+
+        event = Event(kind="view", value=2)
+        assert event.full_validate() is event
+        assert event.__dataclass_raw__ == {}
+        assert event.to_dict() == {
+            "kind": "view",
+            "value": 2,
+            "label": "none",
+            "meta": {"source": "web"},
+        }
+
+    @pytest.mark.dataclass
+    def test_assignment_overrides_pending_input(self, event_class):
+        Event, _ = event_class
+        event = Event(kind="click", value=-1)
+        event.value = 5
+        assert event.value == 5
+        event.update(kind="view")
+        assert event.kind == "view"
+        assert event.changed_fields() == ["kind", "value"]
+
+        copy = Event.replace(Event(kind="click", value=-1), value=1)
+        assert copy.value == 1
+        assert copy == Event(kind="click", value=1)
+
+
+class TestDataClassView:
+    """Model.view() 只读视图测试"""
+
+    @pytest.fixture
+    def models(self):
+        @dataclass
+        class Geo(object):
+            lat = NumberField(minvalue=-90, maxvalue=90)
+            lng = NumberField()
+
+        @dataclass
+        class Place(object):
+            name = StringField(required=True, min_length=2)
+            rank = NumberField(minvalue=0)
+            tags = ListField(item_type=str)
+            geo = Geo
+
+            @getter("name")
+            def get_name(self):
+                return self.name.title()
+
+        return Geo, Place
+
+    @pytest.mark.dataclass
+    def test_view_reads_without_copying(self, models):
+        _, Place = models
+        tags = ["a", "b"]
+        data = {"name": "paris", "rank": 1, "tags": tags, "extra": "x"}
+        view = Place.view(data)
+
+        assert isinstance(view, Place)
+        assert view.name == "Paris"
+        assert view.rank == 1
+        assert view["rank"] == 1
+        assert view.get("tags") is tags
+        assert view.extra == "x"
+        assert "name" not in view.__dataclass_values__
+        assert "rank" not in view.__dataclass_values__
+        assert "tags" not in view.__dataclass_values__
+        assert data == {"name": "paris", "rank": 1, "tags": tags, "extra": "x"}
+
+    @pytest.mark.dataclass
+    def test_view_validates_on_access(self, models):
+        _, Place = models
+        view = Place.view({"name": "paris", "rank": -1})
+        with pytest.raises(ValidationError):
+            view.rank
+        with pytest.raises(ValidationError):
+            Place.view({"name": "paris", "rank": -1}, eager=True)
+        with pytest.raises(ValidationError):
+            Place.view({"rank": 1})
+
+    @pytest.mark.dataclass
+    def test_view_to_dict_returns_mapping_when_unchanged(self, models):
+        _, Place = models
+        data = {"name": "paris", "rank": 1, "geo": None}
+        data.pop("geo")
+        # geo 未提供时需要填充默认的嵌套实例，因此需要构建新字典
+        view = Place.view(data)
+        assert view.to_dict() is not data
+        assert view.to_dict() == {"name": "paris", "rank": 1, "geo": {}}
+
+        data = {"name": "paris", "rank": 1, "geo": {"lat": 1, "lng": 2}}
+        view = Place.view(data)
+        result = view.to_dict()
+        assert result == data
+        assert isinstance(view.geo, models[0])
+        assert "geo" in view.__dataclass_values__
+
+    @pytest.mark.dataclass
+    def test_view_to_dict_identity(self):
+        @dataclass
+        class Flat(object):
+            a = NumberField()
+            b = StringField()
+
+        data = {"a": 1, "b": "x"}
+        assert Flat.view(data).to_dict() is data
+        assert Flat.view({"a": 1}).to_dict() == {"a": 1}
+
+    @pytest.mark.dataclass
+    def test_view_is_read_only(self, models):
+        from schema_dataclass import FrozenInstanceError
+
+        _, Place = models
+        view = Place.view({"name": "paris"})
+        with pytest.raises(FrozenInstanceError):
+            view.rank = 2
+        with pytest.raises(FrozenInstanceError):
+            view.update(rank=2)
+
+        copy = Place.replace(view, rank=2)
+        assert type(copy) is Place
+        assert copy.rank == 2
+        assert copy.name == "Paris"
+
+    @pytest.mark.dataclass
+    def test_trusted_view(self, models):
+        Geo, Place = models
+        view = Place.view({"name": "p", "rank": -5, "geo": {"lat": 500}}, trusted=True)
+        assert view.rank == -5
+        assert isinstance(view.geo, Geo)
+        assert view.geo.lat == 500
+        assert view == Place.construct(name="p", rank=-5, geo={"lat": 500})
+        assert Place.construct(name="p", rank=-5, geo={"lat": 500}) == view
+
+
+class TestProjection:
+    """Model.project() / from_dict(only=...) 投影校验测试"""
+
+    @pytest.fixture
+    def models(self):
+        @dataclass
+        class Address(object):
+            city = StringField(required=True, min_length=2)
+            zip_code = StringField(regex=r"^\d{5}$")
+
+        @dataclass
+        class Item(object):
+            sku = StringField(required=True)
+            qty = NumberField(minvalue=1)
+
+        @dataclass
+        class Order(object):
+            id = NumberField(required=True)
+            note = StringField(max_length=3)
+            address = Address
+            items = ListField(item_type=Item)
+
+            @validate("note")
+            def check_note(self, value):
+                if value == "bad":
+                    raise ValidationError("note rejected")
+
+            @getter("id")
+            def get_id(self):
+                return self.__dataclass_values__["id"] * 10
+
+            def describe(self):
+                return "order"
+
+        return Address, Item, Order
+
+    @pytest.mark.dataclass
+    def test_project_validates_only_selected_fields(self, models):
+        _, _, Order = models
+        Light = Order.project("id")
+        order = Light(id=1, note="far too long", address={"zip_code": "x"})
+        assert order.id == 10
+        assert order.describe() == "order"
+        assert order.to_dict() == {"id": 1}
+        assert order.note is None
+        assert list(Light.__dataclass_fields__) == ["id"]
+        with pytest.raises(ValidationError):
+            Light()
+
+    @pytest.mark.dataclass
+    def test_project_nested_paths(self, models):
+        Address, Item, Order = models
+        Light = Order.project("address.city", "items.sku")
+        order = Light(
+            address={"city": "Paris", "zip_code": "bad"},
+            items=[{"sku": "a", "qty": 0}],
+        )
+        assert order.to_dict() == {"address": {"city": "Paris"}, "items": [{"sku": "a"}]}
+        assert list(type(order.address).__dataclass_fields__) == ["city"]
+        assert Order.__dataclass_fields__["items"].item_type is Item
+        with pytest.raises(ValidationError) as exc_info:
+            Light(address={"city": "P"})
+        assert exc_info.value.path == ["address", "city"]
+
+    @pytest.mark.dataclass
+    def test_project_keeps_validators_of_selected_fields(self, models):
+        _, _, Order = models
+        with pytest.raises(ValidationError):
+            Order.project("note")(note="bad")
+        assert Order.project("id")(id=1, note="bad").id == 10
+
+    @pytest.mark.dataclass
+    def test_project_is_cached(self, models):
+        _, _, Order = models
+        Light = Order.project("id", "address.city")
+        assert Order.project("address.city", "id") is Light
+        assert Order.project("id") is not Light
+        assert Light.__name__ == "OrderProjection"
+
+    @pytest.mark.dataclass
+    def test_project_unknown_path(self, models):
+        _, _, Order = models
+        with pytest.raises(ValueError):
+            Order.project("missing")
+        with pytest.raises(ValueError):
+            Order.project("note.length")
+        with pytest.raises(ValueError):
+            Order.project("note", "note.length")
+        with pytest.raises(ValueError):
+            Order.project("note.length", "note")
+        with pytest.raises(ValueError):
+            Order.project("address", "address.missing")
+        with pytest.raises(ValueError):
+            Order.project()
+
+    @pytest.mark.dataclass
+    def test_project_whole_and_nested_path(self, models):
+        Address, _, Order = models
+        order = Order.project("address", "address.city")(address={"city": "Rome", "zip_code": "12345"})
+        assert type(order.address) is Address
+
+    @pytest.mark.dataclass
+    def test_from_dict_only(self, models):
+        _, _, Order = models
+        data = {"id": 2, "note": "far too long", "address": {"city": "Rome"}}
+        order = Order.from_dict(data, only=["id", "address.city"])
+        assert order.to_dict() == {"id": 2, "address": {"city": "Rome"}}
+        with pytest.raises(ValidationError):
+            Order.from_dict(data)
+
+
+class TestDerivedVariants:
+    """Model.partial() / pick() / omit() 派生模型测试"""
+
+    @pytest.fixture
+    def models(self):
+        @dataclass
+        class Profile(object):
+            bio = StringField(required=True, max_length=5)
+
+        @dataclass
+        class User(object):
+            name = StringField(required=True, min_length=2)
+            age = NumberField(minvalue=0, default=18)
+            profile = Profile
+
+            @validate("name")
+            def check_name(self, value):
+                if value == "root":
+                    raise ValidationError("reserved")
+
+            @validate("age")
+            def check_age(self, value):
+                if self.name == "minor" and value >= 18:
+                    raise ValidationError("too old")
+
+        return Profile, User
+
+    @pytest.mark.dataclass
+    def test_partial_makes_fields_optional(self, models):
+        _, User = models
+        Patch = User.partial()
+        patch = Patch(age=30)
+        assert patch.age == 30
+        assert patch.name is None
+        assert Patch().age is None
+        with pytest.raises(ValidationError):
+            Patch(name="x")
+        with pytest.raises(ValidationError):
+            Patch(name="root")
+        with pytest.raises(ValidationError):
+            User(age=30)
+        assert User.__dataclass_fields__["name"].required
+
+    @pytest.mark.dataclass
+    def test_partial_nested(self, models):
+        Profile, User = models
+        patch = User.partial()(profile={})
+        assert type(patch.profile) is Profile.partial()
+        with pytest.raises(ValidationError):
+            User.partial()(profile={"bio": "too long"})
+
+    @pytest.mark.dataclass
+    def test_partial_list_items(self, models):
+        Profile, _ = models
+
+        @dataclass
+        class Team(object):
+            name = StringField(required=True)
+            members = ListField(item_type=Profile)
+
+        patch = Team.partial()(members=[{}])
+        assert type(patch.members[0]) is Profile.partial()
+        with pytest.raises(ValidationError):
+            Team.partial()(members=[{"bio": "too long"}])
+        assert Team.__dataclass_fields__["members"].item_type is Profile
+        with pytest.raises(ValidationError):
+            Team(name="a", members=[{}])
+
+    @pytest.mark.dataclass
+    def test_pick_and_omit(self, models):
+        _, User = models
+        Name = User.pick("name")
+        assert list(Name.__dataclass_fields__) == ["name"]
+        assert Name(name="Bob").to_dict() == {"name": "Bob"}
+        with pytest.raises(ValidationError):
+            Name()
+
+        NoProfile = User.omit("profile")
+        assert list(NoProfile.__dataclass_fields__) == ["name", "age"]
+        assert NoProfile(name="Bob").to_dict() == {"name": "Bob", "age": 18}
+        assert NoProfile.__dataclass_fields__["name"] is User.__dataclass_fields__["name"]
+
+        with pytest.raises(ValueError):
+            User.pick("missing")
+        with pytest.raises(ValueError):
+            User.omit("missing")
+
+    @pytest.mark.dataclass
+    def test_validators_reading_dropped_fields(self, models):
+        _, User = models
+        # 派生模型中被去掉的字段读取为 None
+        assert User.omit("name", "profile")(age=1).age == 1
+        assert User.pick("age")(age=1).name is None
+        assert User.project("age")(age=3).to_dict() == {"age": 3}
+        with pytest.raises(ValidationError):
+            User.omit("profile")(name="minor", age=30)
+        assert User.omit("profile").pick("age")(age=40).age == 40
+
+    @pytest.mark.dataclass
+    def test_variants_are_cached(self, models):
+        _, User = models
+        assert User.partial() is User.partial()
+        assert User.pick("name", "age") is User.pick("age", "name")
+        assert User.omit("age") is User.omit("age")
+        assert User.pick("name") is not User.omit("age")
+        assert User.partial().__name__ == "UserPartial"
+        assert User.partial().pick("age") is User.partial().pick("age")
+
+
+class TestNumberArrayDataClass:
+    """NumberArrayField 在 dataclass 中的存储与序列化测试"""
+
+    @pytest.mark.dataclass
+    def test_to_dict_output(self):
+        import array
+        from schema_dataclass import NumberArrayField
+
+        @dataclass
+        class Series(object):
+            samples = NumberArrayField(minvalue=0)
+            raw = NumberArrayField(typecode="q", output="bytes")
+            buf = NumberArrayField(output="buffer")
+
+        series = Series(samples=[1, 2], raw=[3], buf=[4])
+        assert isinstance(series.samples, array.array)
+        assert series.to_dict() == {
+            "samples": [1.0, 2.0],
+            "raw": array.array("q", [3]).tobytes(),
+            "buf": array.array("d", [4.0]),
+        }
+        with pytest.raises(ValidationError):
+            Series(samples=[-1])
+
+        samples = array.array("d", [5.0])
+        view = Series.view({"samples": samples})
+        assert view.samples is samples
+        assert view.to_dict() == {"samples": [5.0]}
+
+    @pytest.mark.dataclass
+    def test_equality(self):
+        from schema_dataclass import NumberArrayField
+
+        backends = ["array"]
+        try:
+            import numpy  # noqa: F401
+            backends.append("numpy")
+        except ImportError:
+            pass
+        for backend in backends:
+            @dataclass
+            class Series(object):
+                samples = NumberArrayField(backend=backend)
+
+            assert Series(samples=[1, 2]) == Series(samples=[1, 2])
+            assert Series(samples=[1, 2]) != Series(samples=[1, 3])
+            assert Series(samples=[1, 2]) != Series(samples=[1, 2, 3])
+            assert Series(samples=[1]) != Series()
+            assert Series.view({"samples": [1.0]}) == Series(samples=[1])
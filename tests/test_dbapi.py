@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+DB-API 辅助工具测试（使用标准库 sqlite3）
+"""
+
+import sqlite3
+
+import pytest
+from schema_dataclass import (
+    NumberField,
+    StringField,
+    ValidationError,
+    dataclass,
+)
+from schema_dataclass.dbapi import fetch_instances, insert_many, insert_sql, row_factory
+
+
+@pytest.fixture
+def user_class():
+    @dataclass
+    class User(object):
+        name = StringField(required=True, min_length=2)
+        age = NumberField(minvalue=0)
+        city = StringField(default="Paris")
+
+    return User
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE users (name TEXT, age INTEGER, city TEXT)")
+    yield conn
+    conn.close()
+
+
+class TestInsertMany:
+    """insert_many 测试"""
+
+    @pytest.mark.unit
+    def test_insert_in_field_order(self, conn, user_class):
+        users = [user_class(name="Al", age=1), user_class(name="Bo", age=2, city="Rome")]
+        insert_many(conn, "users", user_class, users)
+        rows = conn.execute("SELECT name, age, city FROM users ORDER BY name").fetchall()
+        assert rows == [("Al", 1, "Paris"), ("Bo", 2, "Rome")]
+
+    @pytest.mark.unit
+    def test_insert_selected_columns(self, conn, user_class):
+        insert_many(conn.cursor(), "users", user_class, iter([user_class(name="Cy", age=3)]),
+                    names=["age", "name"])
+        assert conn.execute("SELECT * FROM users").fetchall() == [("Cy", 3, None)]
+
+    @pytest.mark.unit
+    def test_insert_sql(self):
+        assert insert_sql("main.users", ["a", "b"]) == "INSERT INTO main.users (a, b) VALUES (?, ?)"
+        assert insert_sql("t", ["a", "b"], "format") == "INSERT INTO t (a, b) VALUES (%s, %s)"
+        assert insert_sql("t", ["a", "b"], "numeric") == "INSERT INTO t (a, b) VALUES (:1, :2)"
+        with pytest.raises(ValueError):
+            insert_sql("users; DROP TABLE users", ["a"])
+        with pytest.raises(ValueError):
+            insert_sql("t", ["a"], "named")
+
+
+class TestRowFactory:
+    """row_factory / fetch_instances 测试"""
+
+    @pytest.mark.unit
+    def test_connection_row_factory(self, conn, user_class):
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?)", [("Al", 1, "Oslo"), ("Bo", None, None)])
+        conn.row_factory = row_factory(user_class)
+        users = conn.execute("SELECT * FROM users ORDER BY name").fetchall()
+        assert [type(u) for u in users] == [user_class, user_class]
+        assert users[0].to_dict() == {"name": "Al", "age": 1, "city": "Oslo"}
+        assert users[1].city == "Paris"
+
+        # 列名按结果集重新解析，额外的列作为普通属性
+        user = conn.execute("SELECT age, name, 7 AS score FROM users WHERE name = 'Al'").fetchone()
+        assert (user.name, user.age, user.score) == ("Al", 1, 7)
+
+    @pytest.mark.unit
+    def test_validation_and_trusted(self, conn, user_class):
+        conn.execute("INSERT INTO users VALUES ('X', -1, NULL)")
+        conn.row_factory = row_factory(user_class)
+        with pytest.raises(ValidationError):
+            conn.execute("SELECT * FROM users").fetchone()
+
+        conn.row_factory = row_factory(user_class, trusted=True)
+        user = conn.execute("SELECT * FROM users").fetchone()
+        assert (user.name, user.age) == ("X", -1)
+
+    @pytest.mark.unit
+    def test_fetch_instances(self, conn, user_class):
+        insert_many(conn, "users", user_class, [user_class(name="u{}".format(i), age=i) for i in range(25)])
+        cursor = conn.execute("SELECT name, age FROM users ORDER BY age")
+        users = list(fetch_instances(cursor, user_class, size=10))
+        assert [u.age for u in users] == list(range(25))
+        assert users[3].to_dict() == {"name": "u3", "age": 3, "city": "Paris"}
+
+    @pytest.mark.unit
+    def test_matches_model_construction(self, conn, user_class):
+        from schema_dataclass import ListField
+
+        @dataclass(lazy=True)
+        class LazyUser(object):
+            name = StringField(required=True)
+            age = NumberField(minvalue=0)
+
+        @dataclass(frozen=True)
+        class FrozenUser(object):
+            name = StringField(required=True)
+            city = StringField(default="Paris")
+            tags = ListField(item_type=str, default=list)
+
+        conn.executemany("INSERT INTO users VALUES (?, ?, ?)", [("Al", 1, "Oslo"), ("Bo", None, None)])
+        for model in (user_class, LazyUser, FrozenUser):
+            for trusted in (False, True):
+                cursor = conn.execute("SELECT name, age, city, 1 AS score FROM users ORDER BY name")
+                columns = [c[0] for c in cursor.description]
+                rows = cursor.fetchall()
+                factory = row_factory(model, trusted=trusted)
+                build = model.from_trusted if trusted else lambda values: model(**values)
+                for row in rows:
+                    instance = factory(cursor, row)
+                    expected = build(dict(zip(columns, row)))
+                    assert type(instance) is model
+                    assert instance == expected
+                    assert instance.to_dict() == expected.to_dict()
+
+    @pytest.mark.unit
+    def test_factory_shared_by_cursors(self, conn, user_class):
+        conn.execute("INSERT INTO users VALUES ('Al', 1, 'Oslo')")
+        factory = row_factory(user_class)
+        first = conn.execute("SELECT name, age FROM users")
+        second = conn.execute("SELECT age, city, name FROM users")
+        row_a, row_b = first.fetchone(), second.fetchone()
+        for _ in range(2):
+            assert factory(first, row_a).to_dict() == {"name": "Al", "age": 1, "city": "Paris"}
+            assert factory(second, row_b).to_dict() == {"name": "Al", "age": 1, "city": "Oslo"}
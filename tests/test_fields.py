@@ -5,7 +5,10 @@
 import datetime
 import pytest
 import sys
-from schema_dataclass import StringField, NumberField, ListField, ValidationError, DateField, EmailField, DateTimeField
+from schema_dataclass import (
+    StringField, NumberField, ListField, ValidationError, DateField, EmailField, DateTimeField,
+    NumberArrayField,
+)
 
 
 class TestStringField:
@@ -259,6 +262,44 @@ class TestListField:
         result = field.validate(["test", "list"])
         assert result == ["test", "list"]
 
+    @pytest.mark.unit
+    def test_large_primitive_list(self):
+        """测试大列表的类型检查与错误下标"""
+        field = ListField(item_type=int)
+        values = list(range(20000))
+        assert field.validate(values) == values
+        # bool 是 int 的子类，与 isinstance 语义一致
+        assert field.validate([True, 1]) == [True, 1]
+
+        values[15000] = "x"
+        with pytest.raises(ValidationError) as exc_info:
+            field.validate(values)
+        assert "index 15000" in str(exc_info.value)
+
+    @pytest.mark.unit
+    def test_unchanged_list_is_not_copied(self):
+        """测试没有元素被转换时返回原列表，转换时才复制"""
+        values = list(range(1000))
+        assert ListField(item_type=int).validate(values) is values
+        assert ListField(item_type=NumberField(maxvalue=1000)).validate(values) is values
+
+        dates = ["2024-01-01", "2024-01-02"]
+        result = ListField(item_type=DateField()).validate(dates)
+        assert result is not dates
+        assert result == [datetime.date(2024, 1, 1), datetime.date(2024, 1, 2)]
+        assert dates == ["2024-01-01", "2024-01-02"]
+
+    @pytest.mark.unit
+    def test_item_dispatch_follows_item_type(self):
+        """测试 item_type 被替换后重新选择列表项处理方式"""
+        field = ListField(item_type=int)
+        assert field.validate([1, 2]) == [1, 2]
+
+        field.item_type = StringField(max_length=1)
+        assert field.validate(["a"]) == ["a"]
+        with pytest.raises(ValidationError):
+            field.validate(["ab"])
+
 class TestDateField:
     """DateField 测试类"""
 
@@ -507,3 +548,99 @@ class TestDateTimeField:
         with pytest.raises(ValidationError) as exc_info:
             field.validate(datetime.datetime(2025, 1, 13, 10, 0, 0))
         assert "must be one of" in str(exc_info.value)
+
+
+class TestNumberArrayField:
+    """NumberArrayField 测试类"""
+
+    @pytest.mark.unit
+    def test_stores_compact_array(self):
+        """测试输入列表转换为 array.array"""
+        import array
+
+        field = NumberArrayField()
+        result = field.validate([1, 2.5, 3])
+        assert isinstance(result, array.array)
+        assert result.typecode == "d"
+        assert result.tolist() == [1.0, 2.5, 3.0]
+
+        ints = array.array("q", [1, 2])
+        assert NumberArrayField(typecode="q").validate(ints) is ints
+        assert NumberArrayField().validate(ints).tolist() == [1.0, 2.0]
+        assert field.validate(None) is None
+
+    @pytest.mark.unit
+    def test_invalid_input(self):
+        """测试非数值输入"""
+        field = NumberArrayField(typecode="b")
+        for value in ("123", {"a": 1}, [1, "x"], [1.5], [300], 5):
+            with pytest.raises(ValidationError) as exc_info:
+                field.validate(value)
+            assert exc_info.value.error_key == "invalid_type"
+
+    @pytest.mark.unit
+    def test_bulk_range_and_length(self):
+        """测试元素范围与长度检查"""
+        field = NumberArrayField(minvalue=0, maxvalue=10, max_length=3)
+        assert field.validate([0, 10]).tolist() == [0.0, 10.0]
+        with pytest.raises(ValidationError) as exc_info:
+            field.validate([1, -1])
+        assert exc_info.value.error_key == "minvalue"
+        with pytest.raises(ValidationError) as exc_info:
+            field.validate([11])
+        assert exc_info.value.error_key == "maxvalue"
+        with pytest.raises(ValidationError) as exc_info:
+            field.validate([1, 2, 3, 4])
+        assert exc_info.value.error_key == "max_length"
+
+        item_field = NumberArrayField(item_type=NumberField(minvalue=5))
+        with pytest.raises(ValidationError):
+            item_field.validate([4])
+
+        # NaN 不影响其它元素的范围检查
+        nan = float("nan")
+        for values, error_key in (([nan, -5, 5], "minvalue"), ([nan, 100], "maxvalue")):
+            with pytest.raises(ValidationError) as exc_info:
+                NumberArrayField(minvalue=0, maxvalue=10).validate(values)
+            assert exc_info.value.error_key == error_key
+
+    @pytest.mark.unit
+    def test_serialize_output(self):
+        """测试 to_dict 输出形式"""
+        import array
+
+        values = array.array("d", [1.0, 2.0])
+        assert NumberArrayField().serialize(values) == [1.0, 2.0]
+        assert NumberArrayField(output="buffer").serialize(values) is values
+        assert NumberArrayField(output="bytes").serialize(values) == values.tobytes()
+
+    @pytest.mark.unit
+    def test_invalid_options(self):
+        """测试无效参数"""
+        with pytest.raises(ValueError):
+            NumberArrayField(typecode="x")
+        with pytest.raises(ValueError):
+            NumberArrayField(output="csv")
+        with pytest.raises(ValueError):
+            NumberArrayField(backend="torch")
+
+    @pytest.mark.unit
+    def test_numpy_backend(self):
+        """测试 NumPy 存储"""
+        numpy = pytest.importorskip("numpy")
+        field = NumberArrayField(backend="numpy", minvalue=0)
+        result = field.validate([1, 2, 3])
+        assert isinstance(result, numpy.ndarray)
+        assert result.dtype == numpy.float64
+        with pytest.raises(ValidationError):
+            field.validate([1, -2])
+        with pytest.raises(ValidationError):
+            field.validate(["1.5"])
+        with pytest.raises(ValidationError):
+            NumberArrayField(typecode="q", backend="numpy").validate([1.5])
+        with pytest.raises(ValidationError):
+            field.validate([float("nan"), -5])
+
+        assert field.equals(result, field.validate([1, 2, 3]))
+        assert not field.equals(result, field.validate([1, 2]))
+        assert not field.equals(result, None)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+实例内存基准工具测试
+"""
+
+import pytest
+from schema_dataclass import StringField, NumberField, ListField, dataclass
+from schema_dataclass.memory import measure_memory, format_memory_report
+
+
+@pytest.fixture
+def record_class():
+    @dataclass
+    class Record(object):
+        name = StringField()
+        score = NumberField()
+        tags = ListField(item_type=str)
+
+    return Record
+
+
+class TestMeasureMemory:
+    """measure_memory 测试"""
+
+    def test_report_fields(self, record_class):
+        report = measure_memory(
+            record_class,
+            lambda i: {"name": "r%d" % i, "score": i, "tags": ["a", "b"]},
+            count=200,
+            label="eager",
+        )
+        assert report["model"] == "Record"
+        assert report["label"] == "eager"
+        assert report["count"] == 200
+        assert report["bytes_per_instance"] > 0
+        assert report["container_bytes_per_instance"] > 0
+        assert "__dataclass_values__" in report["breakdown"]
+        assert report["bytes_per_instance"] == pytest.approx(
+            float(report["total_bytes"]) / 200
+        )
+
+    def test_custom_builder_and_static_input(self, record_class):
+        calls = []
+
+        def builder(cls, kwargs):
+            calls.append(kwargs)
+            return cls(**kwargs)
+
+        report = measure_memory(record_class, {"name": "x"}, count=10, builder=builder)
+        assert len(calls) == 10
+        assert report["label"] == "default"
+
+    def test_invalid_count(self, record_class):
+        with pytest.raises(ValueError):
+            measure_memory(record_class, {}, count=0)
+
+    def test_format_report(self, record_class):
+        a = measure_memory(record_class, {"name": "x"}, count=10, label="a")
+        b = measure_memory(record_class, {"name": "y", "tags": ["t"]}, count=10, label="b")
+        text = format_memory_report(a, b)
+        lines = text.splitlines()
+        assert lines[0].startswith("model")
+        assert len(lines) == 4
+        assert "Record" in lines[2] and "b" in lines[3]
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+校验指标计数测试
+"""
+
+import threading
+
+import pytest
+from schema_dataclass import (
+    StringField,
+    NumberField,
+    ListField,
+    ValidationError,
+    dataclass,
+    validate,
+)
+from schema_dataclass.metrics import (
+    ValidationMetrics,
+    enable_metrics,
+    disable_metrics,
+    get_metrics,
+)
+
+
+@pytest.fixture
+def metrics():
+    registry = enable_metrics()
+    yield registry
+    disable_metrics()
+
+
+@pytest.fixture
+def user_class():
+    @dataclass
+    class User(object):
+        name = StringField(min_length=2, required=True)
+        tags = ListField(item_type=str)
+
+        @validate("name")
+        def check_name(self, name):
+            if name == "root":
+                raise ValidationError("reserved name")
+
+    return User
+
+
+class TestErrorKey:
+    """ValidationError.error_key 测试"""
+
+    def test_field_error_keys(self):
+        with pytest.raises(ValidationError) as exc_info:
+            StringField(min_length=3).validate("ab")
+        assert exc_info.value.error_key == "min_length"
+
+        with pytest.raises(ValidationError) as exc_info:
+            NumberField().validate("x")
+        assert exc_info.value.error_key == "invalid_type"
+
+        with pytest.raises(ValidationError) as exc_info:
+            ListField(item_type=int).validate([1, "2"])
+        assert exc_info.value.error_key == "invalid_list_item"
+
+    def test_missing_required_error_key(self, user_class):
+        with pytest.raises(ValidationError) as exc_info:
+            user_class()
+        assert exc_info.value.error_key == "required"
+
+
+class TestValidationMetrics:
+    """ValidationMetrics 测试"""
+
+    def test_disabled_by_default(self, user_class):
+        assert get_metrics() is None
+        user_class(name="Alice")
+
+    def test_counts_records_fields_and_errors(self, metrics, user_class):
+        user_class(name="Alice", tags=["a"])
+        with pytest.raises(ValidationError):
+            user_class(name="A")
+        with pytest.raises(ValidationError):
+            user_class(name="Bob", tags=[1])
+        with pytest.raises(ValidationError):
+            user_class(name="root")
+        with pytest.raises(ValidationError):
+            user_class()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["records"]["User"] == {"validated": 5, "failed": 4}
+
+        name_stats = snapshot["fields"]["User"]["name"]
+        assert name_stats["validated"] == 5
+        assert name_stats["failed"] == 3
+        assert name_stats["errors"] == {"min_length": 1, "custom": 1, "required": 1}
+
+        tags_stats = snapshot["fields"]["User"]["tags"]
+        assert tags_stats["errors"] == {"invalid_list_item": 1}
+
+    def test_nested_models_counted_once(self, metrics):
+        @dataclass
+        class Addr(object):
+            city = StringField(required=True)
+            zip = StringField()
+
+        @dataclass
+        class Person(object):
+            addr = Addr
+            homes = ListField(item_type=Addr)
+
+        Person(addr={"city": "x"}, homes=[{"city": "y"}])
+        Person(addr=Addr(city="z"))
+
+        snapshot = metrics.snapshot()
+        # 嵌套字典、列表元素与直接构建的 Addr 各计一次，重新检查已有实例不计入
+        assert snapshot["records"]["Addr"] == {"validated": 3, "failed": 0}
+        assert snapshot["fields"]["Addr"]["city"]["validated"] == 3
+        assert "zip" not in snapshot["fields"]["Addr"]
+        assert snapshot["records"]["Person"] == {"validated": 2, "failed": 0}
+        assert snapshot["fields"]["Person"]["addr"]["validated"] == 2
+
+    def test_reset(self, metrics, user_class):
+        user_class(name="Alice")
+        metrics.reset()
+        assert metrics.snapshot() == {"records": {}, "fields": {}}
+
+    def test_thread_safety(self, user_class):
+        registry = ValidationMetrics()
+        enable_metrics(registry)
+        try:
+            def work():
+                for _ in range(200):
+                    user_class(name="Alice")
+
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            disable_metrics()
+
+        snapshot = registry.snapshot()
+        assert snapshot["records"]["User"]["validated"] == 800
+        assert snapshot["fields"]["User"]["name"]["validated"] == 800
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+校验性能分析测试
+"""
+
+import pytest
+from schema_dataclass import (
+    StringField,
+    NumberField,
+    ValidationError,
+    dataclass,
+    validate,
+)
+from schema_dataclass import profiling
+from schema_dataclass.profiling import (
+    ValidationProfiler,
+    enable_profiling,
+    disable_profiling,
+    profile_validation,
+)
+
+
+@pytest.fixture
+def user_class():
+    @dataclass
+    class User(object):
+        name = StringField(min_length=2)
+        age = NumberField(minvalue=0)
+
+        @validate("name")
+        def check_name(self, name):
+            if name == "root":
+                raise ValidationError("reserved name")
+
+    return User
+
+
+class TestValidationProfiler:
+    """ValidationProfiler 测试"""
+
+    def test_disabled_by_default(self, user_class):
+        assert profiling.get_profiler() is None
+        user_class(name="Alice", age=1)
+
+    def test_records_strategies_and_validators(self, user_class):
+        with profile_validation() as profiler:
+            user_class(name="Alice", age=1)
+            user_class(name="Bob", age=2)
+
+        stats = profiler.as_dict()["User"]
+        assert stats["name"]["LengthValidationStrategy"]["calls"] == 2
+        assert stats["name"]["@check_name"]["calls"] == 2
+        assert stats["age"]["RangeValidationStrategy"]["calls"] == 2
+        assert stats["age"]["RangeValidationStrategy"]["total_time"] >= 0
+        assert profiling.get_profiler() is None
+
+    def test_records_failures(self, user_class):
+        with profile_validation() as profiler:
+            with pytest.raises(ValidationError):
+                user_class(name="A")
+            with pytest.raises(ValidationError):
+                user_class(name="root")
+
+        stats = profiler.as_dict()["User"]["name"]
+        assert stats["LengthValidationStrategy"]["failures"] == 1
+        assert stats["@check_name"]["failures"] == 1
+
+    def test_standalone_field_has_no_model(self):
+        profiler = enable_profiling()
+        try:
+            StringField(max_length=3).validate("abc")
+        finally:
+            assert disable_profiling() is profiler
+        assert None in profiler.as_dict()
+
+    def test_format_table_and_reset(self, user_class):
+        profiler = ValidationProfiler()
+        with profile_validation(profiler):
+            user_class(name="Alice", age=1)
+
+        table = profiler.format_table(limit=2)
+        lines = table.splitlines()
+        assert lines[0].split()[:3] == ["model", "field", "target"]
+        assert len(lines) == 4
+
+        profiler.reset()
+        assert profiler.rows() == []
+
+    def test_nested_models_profiled_once(self, user_class):
+        @dataclass
+        class Team(object):
+            lead = user_class
+
+        with profile_validation() as profiler:
+            Team(lead={"name": "Alice"})
+
+        stats = profiler.as_dict()["User"]["name"]
+        assert stats["LengthValidationStrategy"]["calls"] == 1
+        assert stats["@check_name"]["calls"] == 1
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+内存映射记录文件测试
+"""
+
+import datetime
+
+import pytest
+from schema_dataclass import DateField, NumberField, StringField, dataclass
+from schema_dataclass import recordfile
+from schema_dataclass.recordfile import RecordFile, write_records
+
+
+@pytest.fixture
+def item_class():
+    @dataclass
+    class Item(object):
+        code = StringField(required=True, max_length=6)
+        price = NumberField(struct_format="f")
+        added = DateField()
+
+    return Item
+
+
+class TestRecordFile:
+    """RecordFile / write_records 测试"""
+
+    @pytest.mark.unit
+    def test_write_and_read(self, tmp_path, item_class, monkeypatch):
+        monkeypatch.setattr(recordfile, "WRITE_CHUNK_SIZE", 7)
+        path = str(tmp_path / "items.bin")
+        items = [
+            item_class(code="c{}".format(i), price=i / 2.0, added=datetime.date(2024, 1, 1 + i % 28))
+            for i in range(50)
+        ]
+        assert write_records(path, item_class, iter(items)) == 50
+
+        with RecordFile(path, item_class) as records:
+            assert len(records) == 50
+            assert records[12] == items[12]
+            assert records[-1].code == "c49"
+            assert [r.price for r in records[10:13]] == [5.0, 5.5, 6.0]
+            assert records[::10].decode(2) == items[20]
+            assert list(records) == items
+        assert records.closed
+
+    @pytest.mark.unit
+    def test_append_and_empty(self, tmp_path, item_class):
+        path = str(tmp_path / "items.bin")
+        assert write_records(path, item_class, []) == 0
+        with RecordFile(path, item_class) as records:
+            assert len(records) == 0
+            assert list(records) == []
+
+        write_records(path, item_class, [item_class(code="a")], append=True)
+        write_records(path, item_class, [item_class(code="b")], append=True)
+        with RecordFile(path, item_class) as records:
+            assert [r.code for r in records] == ["a", "b"]
+            assert records[0].price is None
+
+    @pytest.mark.unit
+    def test_wrong_size(self, tmp_path, item_class):
+        path = tmp_path / "items.bin"
+        path.write_bytes(b"\0" * 5)
+        with pytest.raises(ValueError):
+            RecordFile(str(path), item_class)
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+共享内存实例批次测试
+"""
+
+import gc
+import multiprocessing
+import pickle
+import sys
+
+import pytest
+from schema_dataclass import NumberField, StringField, dataclass
+
+pytest.importorskip("multiprocessing.shared_memory")
+
+from schema_dataclass.sharedbatch import SharedRecordBatch  # noqa: E402
+
+
+@dataclass
+class Sample(object):
+    label = StringField(required=True, max_length=4)
+    value = NumberField(struct_format="i")
+
+
+def _total(batch):
+    try:
+        return sum(sample.value for sample in batch), [s.label for s in batch[:1]]
+    finally:
+        batch.close()
+
+
+def _sum_values(batch):
+    # 不调用 close()，由批次被回收时释放映射
+    return sum(sample.value for sample in batch)
+
+
+@pytest.fixture
+def samples():
+    return [Sample(label="s{}".format(i), value=i) for i in range(20)]
+
+
+class TestSharedRecordBatch:
+    """SharedRecordBatch 测试"""
+
+    @pytest.mark.unit
+    def test_create_and_read(self, samples):
+        with SharedRecordBatch.create(Sample, iter(samples)) as batch:
+            assert len(batch) == 20
+            assert batch[3] == samples[3]
+            assert batch[-1].value == 19
+            assert list(batch[5:8]) == samples[5:8]
+            assert isinstance(batch[::2], SharedRecordBatch)
+            assert batch.decode(0) == samples[0]
+
+    @pytest.mark.unit
+    def test_views_are_read_only(self, samples):
+        with SharedRecordBatch.create(Sample, samples) as batch:
+            with pytest.raises(Exception):
+                batch[0].value = 5
+            with pytest.raises(TypeError):
+                batch._segment.data[0] = 1
+
+    @pytest.mark.unit
+    def test_pickle_attaches(self, samples):
+        with SharedRecordBatch.create(Sample, samples) as batch:
+            data = pickle.dumps(batch[::-3])
+            assert len(data) < 300
+            copy = pickle.loads(data)
+            try:
+                assert copy.name == batch.name
+                assert [s.value for s in copy] == [19, 16, 13, 10, 7, 4, 1]
+            finally:
+                copy.close()
+            assert batch[0].label == "s0"
+
+    @pytest.mark.unit
+    def test_attach_and_empty(self, samples):
+        with SharedRecordBatch.create(Sample, samples) as batch:
+            attached = SharedRecordBatch.attach(batch.name, Sample, 20)
+            assert attached[19] == samples[19]
+            attached.close()
+            with pytest.raises(ValueError):
+                SharedRecordBatch.attach(batch.name, Sample, 10 ** 6)
+
+        with SharedRecordBatch.create(Sample, []) as batch:
+            assert len(batch) == 0
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(sys.platform != "linux", reason="uses the fork start method")
+    def test_worker_processes(self, samples):
+        context = multiprocessing.get_context("fork")
+        with SharedRecordBatch.create(Sample, samples) as batch:
+            with context.Pool(2) as pool:
+                results = pool.map(_total, [batch[:10], batch[10:]])
+        assert results == [(45, ["s0"]), (145, ["s10"])]
+
+    @pytest.mark.unit
+    def test_worker_without_close(self, samples, capfd):
+        # spawn 启动的工作进程使用默认的 unraisablehook，未释放的缓冲区会输出 BufferError
+        context = multiprocessing.get_context("spawn")
+        with SharedRecordBatch.create(Sample, samples) as batch:
+            with context.Pool(2) as pool:
+                results = pool.map(_sum_values, [batch[i:i + 2] for i in range(0, 20, 2)])
+                pool.close()
+                pool.join()
+        assert results == [4 * i + 1 for i in range(10)]
+        assert "BufferError" not in capfd.readouterr().err
+
+    @pytest.mark.unit
+    def test_released_when_collected(self, samples, monkeypatch):
+        errors = []
+        monkeypatch.setattr(sys, "unraisablehook", errors.append)
+        with SharedRecordBatch.create(Sample, samples) as batch:
+            copy = pickle.loads(pickle.dumps(batch[2:4]))
+            view = copy[1]
+            finalizer = copy._segment._finalizer
+            del copy
+            gc.collect()
+            # 视图保持共享内存映射存活
+            assert view.value == 3
+            del view
+            gc.collect()
+            assert not finalizer.alive
+        assert errors == []